@@ -0,0 +1,93 @@
+import networkx as nx
+
+from .node_connector import Connectionist, Attr
+
+
+def _interval(snapshot):
+    # seconds between two process calls, ie the inverse of the rate the node processes and emits at
+    return snapshot.get('between_process', {}).get('mean', 0)
+
+def _arrival_interval(node, perf):
+    # a saturated node processes back to back, thus its own interval is its processing rate and not the rate its inputs arrive at
+    # a ctr arrives once every parent emitted it, ie at the rate of the slowest parent
+    parents = [_interval(perf.get(str(con._emit_node), {})) for con in node.input_connections]
+    parents = [interval for interval in parents if interval > 0]
+    if len(parents) > 0:
+        return max(parents)
+    # producers (and nodes whose parents are not timed)
+    return _interval(perf.get(str(node), {}))
+
+def _node_stats(snapshot, arrival_interval, utilization, backlog):
+    service_time = snapshot.get('process', {}).get('mean', 0)
+    # inputs waiting for another (slower) input pile up as well, thus only ctrs queued on every input count against the node itself
+    queued = min(snapshot.get('backlog', {}).values(), default=0)
+
+    # the share of the time the node needs to keep up with its arrivals, above one it falls behind
+    util = service_time / arrival_interval if arrival_interval > 0 else 0
+    return {
+        'service_time': service_time,
+        'service_rate': 1 / service_time if service_time > 0 else None,
+        'arrival_rate': 1 / arrival_interval if arrival_interval > 0 else None,
+        'utilization': util,
+        'backlog': snapshot.get('backlog', {}),
+        # a node that cannot keep up receives more than it can process (ie its utilization approaches or exceeds one) and its inputs pile up
+        'saturated': util >= utilization or queued >= backlog,
+    }
+
+def _acyclic(nodes):
+    G = Connectionist.networkx_graph(nodes)
+    G.add_nodes_from(nodes)
+    # safe circles are broken at their circ_breaker node, as its input belongs to the previous ctr
+    while True:
+        try:
+            cycle = nx.find_cycle(G)
+        except nx.NetworkXNoCycle:
+            return G
+        breakers = [(emit, recv) for emit, recv in cycle if Attr.circ_breaker in recv.attrs]
+        G.remove_edge(*(breakers[0] if len(breakers) > 0 else cycle[-1]))
+
+def find_bottlenecks(nodes, perf, utilization=0.9, backlog=10):
+    """
+    Finds the nodes that bound the throughput and latency of a graph.
+
+    nodes: the nodes of the graph
+    perf: {str(node): node.perf_snapshot()}, e.g. from Graph.perf_snapshot()
+    utilization: share of the time between two arrivals spent in process, above which a node is considered saturated
+    backlog: number of received but unprocessed ctrs on every input, above which a node is considered saturated
+
+    The critical path is the path from a producer to a sink with the largest sum of process times, ie the lower bound of the end-to-end latency.
+    Saturated nodes receive data faster than they process it and thus bound the throughput.
+    Arrivals are measured on the emitting side, ie by the call rate of the node's parents, as a saturated node's own call rate only shows how fast it processes.
+
+    returns {
+        'nodes': {str(node): {'service_time', 'service_rate', 'arrival_rate', 'utilization', 'backlog', 'saturated'}},
+        'critical_path': [str(node), ...],
+        'critical_path_time': seconds,
+        'saturated': [str(node), ...]
+    }
+    """
+    stats = {str(n): _node_stats(perf.get(str(n), {}), _arrival_interval(n, perf), utilization, backlog) for n in nodes}
+
+    # longest path by process time, nodes without timing count as zero
+    G = _acyclic(nodes)
+    longest, prev = {}, {}
+    for node in nx.topological_sort(G):
+        parents = [p for p in G.predecessors(node) if p in longest]
+        best = max(parents, key=lambda p: longest[p], default=None)
+        prev[node] = best
+        longest[node] = stats[str(node)]['service_time'] + (longest[best] if best is not None else 0)
+
+    path = []
+    # ties are broken by name for stable results
+    node = max(longest, key=lambda n: (longest[n], str(n)), default=None)
+    total = longest.get(node, 0)
+    while node is not None:
+        path.insert(0, str(node))
+        node = prev[node]
+
+    return {
+        'nodes': stats,
+        'critical_path': path,
+        'critical_path_time': total,
+        'saturated': [n for n, s in stats.items() if s['saturated']],
+    }
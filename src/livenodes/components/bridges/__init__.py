@@ -4,5 +4,7 @@ from .bridge_local import Bridge_local
 from .bridge_thread import Bridge_thread
 from .bridge_process import Bridge_process
 from .bridge_aioprocessing import Bridge_aioprocessing
+from .bridge_sync import Bridge_sync
+from .bridge_replicas import Bridge_round_robin, Bridge_merge
 
 from .mp_data_storage import Multiprocessing_Data_Storage
\ No newline at end of file
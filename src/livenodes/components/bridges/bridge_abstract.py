@@ -15,6 +15,8 @@ class Bridge(Logger):
 
         # _to thread
         self._read = {}
+        # monotonic timestamp of when the producer emitted each ctr (see Node._emit_data)
+        self._origin = {}
 
     def __str__(self) -> str:
         return f"<{self.__class__.__name__}>:{id(self)}"
@@ -42,7 +44,7 @@ class Bridge(Logger):
         raise NotImplementedError()
 
     # _from thread
-    def put(self):
+    def put(self, ctr, item, origin=None):
         raise NotImplementedError()
 
     # _to thread (called by _should_process)
@@ -66,6 +68,10 @@ class Bridge(Logger):
             key: val
             for key, val in self._read.items() if key > ctr
         }
+        self._origin = {
+            key: val
+            for key, val in self._origin.items() if key > ctr
+        }
 
     # _to thread
     def get(self, ctr):
@@ -74,3 +80,12 @@ class Bridge(Logger):
         if ctr in self._read:
             return True, self._read[ctr]
         return False, None
+
+    # _to thread
+    def origin(self, ctr):
+        return self._origin.get(ctr, None)
+
+    # _to thread
+    def backlog(self):
+        # number of received ctrs our node has not processed yet
+        return len(self._read)
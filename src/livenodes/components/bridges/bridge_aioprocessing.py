@@ -1,5 +1,5 @@
 import aioprocessing
-from livenodes.components.computer import parse_location
+from livenodes.components.computer import parse_location, mp_context
 
 from .bridge_abstract import Bridge
 
@@ -13,8 +13,8 @@ class Bridge_aioprocessing(Bridge):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # both threads
-        self.queue = aioprocessing.AioJoinableQueue()
-        self.closed_event = aioprocessing.AioEvent()
+        self.queue = aioprocessing.AioJoinableQueue(context=mp_context())
+        self.closed_event = aioprocessing.AioEvent(context=mp_context())
         
     # _computer thread
     def ready_send(self):
@@ -59,9 +59,9 @@ class Bridge_aioprocessing(Bridge):
         # self.closed_event = None
 
     # _from thread
-    def put(self, ctr, item):
+    def put(self, ctr, item, origin=None):
         # # print('putting value', ctr)
-        self.queue.put_nowait((ctr, item))
+        self.queue.put_nowait((ctr, item, origin))
 
     # _to thread
     def closed(self):
@@ -87,7 +87,8 @@ class Bridge_aioprocessing(Bridge):
     # _to thread
     async def update(self):
         # # print('waiting for asyncio to receive a value')
-        itm_ctr, item = await self.queue.coro_get()
+        itm_ctr, item, origin = await self.queue.coro_get()
         self._read[itm_ctr] = item
+        self._origin[itm_ctr] = origin
         self.queue.task_done()
         return itm_ctr
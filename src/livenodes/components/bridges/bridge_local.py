@@ -38,9 +38,9 @@ class Bridge_local(Bridge):
         self.closed_event.set()
 
     # _from thread
-    def put(self, ctr, item):
+    def put(self, ctr, item, origin=None):
         # # print('putting value', ctr)
-        self.queue.put_nowait((ctr, item))
+        self.queue.put_nowait((ctr, item, origin))
 
     # _to thread
     def closed(self):
@@ -69,8 +69,9 @@ class Bridge_local(Bridge):
     async def update(self):
         # # print('waiting for asyncio to receive a value')
         try:
-            itm_ctr, item = await self.queue.get()
+            itm_ctr, item, origin = await self.queue.get()
             self._read[itm_ctr] = item
+            self._origin[itm_ctr] = origin
             return itm_ctr
         except Exception as err:
             self.logger.exception(f'Could not get value')
@@ -1,6 +1,7 @@
-import multiprocessing as mp
+import asyncio
+import queue
 
-from livenodes.components.computer import parse_location
+from livenodes.components.computer import parse_location, mp_context
 
 from .bridge_thread import Bridge_thread
 
@@ -14,9 +15,42 @@ class Bridge_process(Bridge_thread):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self.queue = mp.Queue()
-        self.closed_event = mp.Event()
-        
+        ctx = mp_context()
+        self.queue = ctx.Queue()
+        self.closed_event = ctx.Event()
+
+    # unlike Bridge_thread, the queue and event are shared across processes and thus must survive pickling
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the receiving loop is not, e.g. if a closed computer is started again (see Graph.apply)
+        state['_loop'] = None
+        state['_changed'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    # the sender lives in another process and cannot wake our loop (see Bridge_thread._wakeup), thus we poll
+    # _to thread
+    async def onclose(self):
+        while True:
+            await asyncio.sleep(0.01)
+            if self.closed_and_empty():
+                self.debug('Closed Event set and queue empty -- telling multiprocessing data storage')
+                break
+
+    # _to thread
+    async def update(self):
+        got_item = False
+        while not got_item:
+            try:
+                itm_ctr, item, origin = self.queue.get_nowait()
+                got_item = True
+            except queue.Empty:
+                await asyncio.sleep(0.001)
+        self._read[itm_ctr] = item
+        self._origin[itm_ctr] = origin
+        return itm_ctr
 
     @staticmethod
     def can_handle(_from, _to, _data_type=None):
@@ -0,0 +1,168 @@
+import asyncio
+from collections import deque
+
+from .bridge_abstract import Bridge
+
+
+class Bridge_round_robin(Bridge):
+    """
+    Sends each ctr to one replica of a node (see Node replicas), namely the one with index ctr % len(bridges).
+    All channels route by the same rule, thus a replica receives every input of the ctrs it is responsible for.
+    Never chosen by the registry, as it is only created by Graph.lock_all for connections into replicated nodes.
+    """
+
+    # _build thread
+    def __init__(self, bridges, **kwargs):
+        super().__init__(**kwargs)
+        # one bridge per replica
+        self.bridges = bridges
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__}>:{id(self)}[{', '.join(map(str, self.bridges))}]"
+
+    # _computer thread
+    def ready_send(self):
+        for b in self.bridges:
+            b.ready_send()
+
+    # _build thread
+    @staticmethod
+    def can_handle(_from, _to, _data_type=None):
+        return False, 10
+
+    # _from thread
+    def close(self):
+        for b in self.bridges:
+            b.close()
+
+    # _from thread
+    def put(self, ctr, item, origin=None):
+        self.bridges[ctr % len(self.bridges)].put(ctr, item, origin)
+
+
+class Bridge_merge(Bridge):
+    """
+    Receives the outputs of all replicas of a node (see Node replicas) and passes them on in ascending ctr order.
+
+    Each replica processes and thus emits its ctrs in ascending order, a ctr is therefore passed on once every replica that could still send an earlier ctr has sent a later one or closed.
+    Never chosen by the registry, as it is only created by Graph.lock_all for connections out of replicated nodes.
+    """
+
+    # _build thread
+    def __init__(self, bridges, **kwargs):
+        super().__init__(**kwargs)
+        # one bridge per replica, in order of the replicas
+        self.bridges = bridges
+
+        # _to thread
+        self._tasks = [None] * len(bridges)
+        # onclose of each replica's bridge, shared by update and onclose
+        self._close_tasks = [None] * len(bridges)
+        self._high = [-1] * len(bridges)
+        self._done = [False] * len(bridges)
+        # ctr: (item, origin) received from a replica but not passed on yet
+        self._held = {}
+        self._released = deque()
+        self._last = -1
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__}>:{id(self)}[{', '.join(map(str, self.bridges))}]"
+
+    # _computer thread
+    def ready_recv(self):
+        for b in self.bridges:
+            b.ready_recv()
+
+    # _build thread
+    @staticmethod
+    def can_handle(_from, _to, _data_type=None):
+        return False, 10
+
+    # _to thread
+    def closed(self):
+        return all([b.closed() for b in self.bridges])
+
+    # _to thread
+    def empty(self):
+        return len(self._held) <= 0 and len(self._released) <= 0 and self._read == {} and all([b.empty() for b in self.bridges])
+
+    # _to thread
+    def closed_and_empty(self):
+        return self.closed() and self.empty()
+
+    # _to thread
+    async def onclose(self):
+        await asyncio.gather(*[self._closing(i) for i in range(len(self.bridges))])
+        # the ctrs still held are passed on by update, which is called until we are empty
+        while not self.closed_and_empty():
+            await asyncio.sleep(0.01)
+        self.debug('All replicas closed and empty -- telling multiprocessing data storage')
+
+    # _to thread
+    def _closing(self, i):
+        if self._close_tasks[i] is None:
+            self._close_tasks[i] = asyncio.ensure_future(self.bridges[i].onclose())
+        return self._close_tasks[i]
+
+    # _to thread
+    def _may_release(self, ctr):
+        n = len(self.bridges)
+        for i in range(n):
+            # the last ctr before this one replica i might still send
+            latest = ctr - 1 - ((ctr - 1 - i) % n)
+            if not self._done[i] and latest > max(self._high[i], self._last):
+                return False
+        return True
+
+    # _to thread
+    def _release(self):
+        while len(self._held) > 0:
+            ctr = min(self._held)
+            if not self._may_release(ctr):
+                return
+            self._read[ctr], self._origin[ctr] = self._held.pop(ctr)
+            self._released.append(ctr)
+            self._last = ctr
+
+    # _to thread
+    def _receive(self, i, ctr):
+        b = self.bridges[i]
+        self._held[ctr] = (b._read.pop(ctr), b._origin.pop(ctr, None))
+        self._high[i] = max(self._high[i], ctr)
+
+    # _to thread
+    async def update(self):
+        try:
+            while len(self._released) <= 0:
+                for i, b in enumerate(self.bridges):
+                    if self._tasks[i] is None and not self._done[i]:
+                        self._tasks[i] = asyncio.ensure_future(b.update())
+
+                # wake once any replica sent a ctr or finished
+                pending = [t for t in self._tasks if t is not None] + [self._closing(i) for i in range(len(self.bridges)) if not self._done[i]]
+                if len(pending) > 0:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    # all replicas finished and everything was passed on, thus nothing will arrive anymore
+                    await asyncio.get_running_loop().create_future()
+
+                for i in range(len(self.bridges)):
+                    task = self._tasks[i]
+                    if task is not None and task.done():
+                        self._tasks[i] = None
+                        self._receive(i, task.result())
+                    elif not self._done[i] and self._closing(i).done():
+                        # the replica finished, thus nothing further will arrive
+                        if task is not None:
+                            task.cancel()
+                            self._tasks[i] = None
+                        self._done[i] = True
+                self._release()
+        except asyncio.CancelledError:
+            # the close tasks are kept, as onclose waits for them as well
+            for task in self._tasks:
+                if task is not None:
+                    task.cancel()
+            self._tasks = [None] * len(self.bridges)
+            raise
+        return self._released.popleft()
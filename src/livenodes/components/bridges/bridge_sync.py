@@ -0,0 +1,70 @@
+import asyncio
+
+from .bridge_abstract import Bridge
+
+class Bridge_sync(Bridge):
+    """
+    Connects two nodes executed by a Processor_sync.
+    Items are stored directly, the computer then hands the arrived ctrs to the receiving node (see arrivals), thus no queue and no listener task is involved.
+    Never chosen by the registry, as it only works if the whole graph is executed synchronously in one thread.
+    """
+
+    # _build thread
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self._arrivals = []
+        self._closed = False
+
+    # _computer thread
+    def ready_send(self):
+        pass
+
+    # _computer thread
+    def ready_recv(self):
+        pass
+
+    # _build thread
+    @staticmethod
+    def can_handle(_from, _to, _data_type=None):
+        return False, 10
+
+    # _from thread
+    def close(self):
+        self._closed = True
+
+    # _from thread
+    def put(self, ctr, item, origin=None):
+        self._read[ctr] = item
+        self._origin[ctr] = origin
+        self._arrivals.append(ctr)
+
+    # _to thread
+    def arrivals(self):
+        """
+        Returns the ctrs that arrived since the last call in order of their arrival
+        """
+        arrived, self._arrivals = self._arrivals, []
+        return arrived
+
+    # _to thread
+    def closed(self):
+        return self._closed
+
+    # _to thread
+    def empty(self):
+        return len(self._arrivals) <= 0 and self._read == {}
+
+    # _to thread
+    def closed_and_empty(self):
+        return self.closed() and self.empty()
+
+    # _to thread
+    async def onclose(self):
+        while not self.closed_and_empty():
+            await asyncio.sleep(0.001)
+
+    # _to thread
+    async def update(self):
+        # arrivals are handed to the receiving node by the computer, thus the listener of the node just waits until it is cancelled
+        await asyncio.get_running_loop().create_future()
@@ -18,6 +18,24 @@ class Bridge_thread(Bridge):
         self.queue = queue.Queue()
         self.closed_event = th.Event()
 
+        # _to thread: instead of polling the queue, the sender wakes the receiving loop (see _wakeup)
+        self._loop = None
+        self._changed = None
+
+    # both ends live in the same process, thus a bridge that is pickled (e.g. into a process computer that is not forked) gets fresh ones
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['queue'] = None
+        state['closed_event'] = None
+        state['_loop'] = None
+        state['_changed'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.queue = queue.Queue()
+        self.closed_event = th.Event()
+
     # _computer thread
     def ready_send(self):
         # self.queue = queue.Queue()
@@ -26,7 +44,8 @@ class Bridge_thread(Bridge):
 
     # _computer thread
     def ready_recv(self):
-        pass
+        self._loop = asyncio.get_event_loop()
+        self._changed = asyncio.Event()
 
     # _build thread
     @staticmethod
@@ -39,18 +58,37 @@ class Bridge_thread(Bridge):
     # _from thread
     def close(self):
         self.closed_event.set()
+        self._wakeup()
+
+    # _from thread
+    def put(self, ctr, item, origin=None):
+        self.queue.put_nowait((ctr, item, origin))
+        self._wakeup()
 
     # _from thread
-    def put(self, ctr, item):
-        self.queue.put_nowait((ctr, item))
+    def _wakeup(self):
+        if self._loop is None:
+            # the receiver is not ready yet, it checks the queue first anyway
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            # the receiving loop is closed already, thus nobody is waiting anymore
+            pass
 
     # _to thread
     async def onclose(self):
-        while True:
-            await asyncio.sleep(0.01)
-            if self.closed_and_empty():
-                self.debug('Closed Event set and queue empty -- telling multiprocessing data storage')
-                break
+        while not self.closed_and_empty():
+            self._changed.clear()
+            await self._changed.wait()
+        self.debug('Closed Event set and queue empty -- telling multiprocessing data storage')
+
+    # _to thread
+    def discard_before(self, ctr):
+        super().discard_before(ctr)
+        # the read items are part of closed_and_empty, thus onclose must check again
+        if self._changed is not None:
+            self._changed.set()
 
     # _to thread
     def closed(self):
@@ -65,15 +103,16 @@ class Bridge_thread(Bridge):
 
     # _to thread
     async def update(self):
-        # # print('waiting for asyncio to receive a value')
-        got_item = False
-        while not got_item:
+        while True:
             try:
-                itm_ctr, item = self.queue.get_nowait()
-                got_item = True
+                itm_ctr, item, origin = self.queue.get_nowait()
+                break
             except queue.Empty:
-                await asyncio.sleep(0.001)
+                # cleared before waiting, a put in the meantime sets it only afterwards, as it is scheduled on this loop
+                self._changed.clear()
+                await self._changed.wait()
         self._read[itm_ctr] = item
+        self._origin[itm_ctr] = origin
         return itm_ctr
 
 
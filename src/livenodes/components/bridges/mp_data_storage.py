@@ -25,10 +25,33 @@ class Multiprocessing_Data_Storage(Logger):
             b.ready_recv()
         
     @staticmethod
-    def resolve_bridge(connection: Connection):
+    def resolve_bridge(connection: Connection, bridge_cls=None):
         emit_loc = connection._emit_node.compute_on
         recv_loc = connection._recv_node.compute_on
 
+        # the computer requires a specific bridge (e.g. Processor_sync)
+        if bridge_cls is not None:
+            bridge = bridge_cls(_from=emit_loc, _to=recv_loc)
+            return bridge, bridge
+
+        bridge = Multiprocessing_Data_Storage.choose_bridge(emit_loc, recv_loc, connection=connection)(_from=emit_loc, _to=recv_loc)
+        endpoint_send, endpoint_receive = bridge, bridge
+        return endpoint_send, endpoint_receive
+
+    @staticmethod
+    def choose_bridge(emit_loc, recv_loc, connection=None):
+        """
+        The cheapest registered bridge class that can handle the two locations
+        """
+        # the connection's bridge was chosen before, thus it is not looked up again
+        hint = None
+        if connection is not None and connection._bridge_hint is not None and connection._bridge_hint[0] == (emit_loc, recv_loc):
+            hint = connection._bridge_hint[1]
+        # the hint might stem from before a package was disabled
+        if hint is not None and hint in get_registry().bridges.values():
+            logger.info(f'Using Bridge: {hint}')
+            return hint
+
         # # print('----')
         # # print(connection)
         # # print('Bridging', emit_loc, recv_loc)
@@ -46,10 +69,7 @@ class Multiprocessing_Data_Storage(Logger):
         possible_bridges = list(zip(*list(sorted(possible_bridges_pair, key=lambda t:t[0]))))[1]
         logger.debug(f'Possible Bridges in order: {possible_bridges}')
         logger.info(f'Using Bridge: {possible_bridges[0]}')
-        
-        bridge = possible_bridges[0](_from=emit_loc, _to=recv_loc)
-        endpoint_send, endpoint_receive = bridge, bridge
-        return endpoint_send, endpoint_receive
+        return possible_bridges[0]
 
     # _to thread
     def all_closed(self):
@@ -77,18 +97,30 @@ class Multiprocessing_Data_Storage(Logger):
                 res[key] = cur_value
         return res 
     
+    # _to thread
+    def origin(self, ctr):
+        """
+        The earliest origin of the inputs of ctr, ie when the oldest of them was emitted by a producer, None if unknown
+        """
+        origins = [o for o in [b.origin(ctr) for b in self.in_bridges.values()] if o is not None]
+        return min(origins, default=None)
+
+    # _to thread
+    def backlog(self):
+        return {key: b.backlog() for key, b in self.in_bridges.items()}
+
     # _to thread
     def discard_before(self, ctr):
         for bridge in self.in_bridges.values():
             bridge.discard_before(ctr) 
 
     # _from thread
-    def put(self, output_channel, ctr, data):
+    def put(self, output_channel, ctr, data, origin=None):
         # # print('data storage putting value', connection._recv_port.key, type(self.bridges[connection._recv_port.key]))
         # we are the emitting part :D
         # for b in self.out_bridges[connection._emit_port.key]:
         for b in self.out_bridges[output_channel]:
-            b.put(ctr, data)
+            b.put(ctr, data, origin)
 
     # _from thread
     def close_bridges(self):
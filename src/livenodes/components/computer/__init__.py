@@ -1,4 +1,6 @@
 
-from .utils import parse_location
+from .utils import parse_location, join_computers
 from .cmp_thread import Processor_threads
-from .cmp_process import Processor_process
\ No newline at end of file
+from .cmp_process import Processor_process
+from .cmp_sync import Processor_sync
+from .worker_pool import start_worker_pool, worker_pool_running, mp_context
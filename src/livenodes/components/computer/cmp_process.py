@@ -2,30 +2,35 @@
 import logging
 from logging.handlers import QueueHandler
 import threading as th
-import multiprocessing as mp
 from itertools import groupby
 from livenodes.components.utils.log import drain_log_queue
 from livenodes.components.node_logger import Logger
 
 from .cmp_thread import Processor_threads
+from .control import Control_Channel
+from .utils import join_computers
+from .worker_pool import mp_context
 
 
 class Processor_process(Logger):
     def __init__(self, nodes, location, bridges, stop_timeout_threads=0.1, close_timeout_threads=0.1) -> None:
         super().__init__()
+        ctx = mp_context()
         # -- both processes
         # indicates that the subprocess is ready
-        self.ready_event = mp.Event() 
+        self.ready_event = ctx.Event() 
         # indicates that the readied nodes should start sending data
-        self.start_lock = mp.Lock() 
+        self.start_lock = ctx.Lock() 
         # indicates that the started nodes should stop sending data
-        self.stop_lock = mp.Lock() 
+        self.stop_lock = ctx.Lock() 
         # indicates that the thread should be closed without waiting on the nodes to finish
-        self.close_lock = mp.Lock() 
+        self.close_lock = ctx.Lock() 
         # used for logging identification
         self.location = location
         # tell log drainer thread that it should return 
         self.worker_log_handler_termi_sig = th.Event()
+        # passes commands to the nodes and their results back
+        self.control = Control_Channel(ctx.Queue)
 
         # -- main process
         self.nodes = nodes
@@ -45,11 +50,25 @@ class Processor_process(Logger):
     def __str__(self) -> str:
         return f"CMP-PR:{self.location}"
 
+    def __getstate__(self):
+        # the log drain and the process handle stay with the parent, required if the worker is not forked (e.g. forkserver or spawn start method)
+        state = self.__dict__.copy()
+        state['worker_log_handler'] = None
+        state['worker_log_handler_termi_sig'] = None
+        state['subprocess'] = None
+        return state
+
     # parent process
     def setup(self):
+        self.spawn()
+        self.wait_ready(timeout=10)
+
+    # parent process
+    def spawn(self):
         self.info('Readying')
 
-        parent_log_queue = mp.Queue()
+        ctx = mp_context()
+        parent_log_queue = ctx.Queue()
         logger_name = 'livenodes'
         
         self.worker_log_handler = th.Thread(target=drain_log_queue, args=(parent_log_queue, logger_name, self.worker_log_handler_termi_sig))
@@ -57,14 +76,17 @@ class Processor_process(Logger):
         self.worker_log_handler.name = f"LogDrain-{self.worker_log_handler.name.split('-')[-1]}"
         self.worker_log_handler.start()
 
-        self.subprocess = mp.Process(
+        self.subprocess = ctx.Process(
                         target=self.start_subprocess,
-                        args=(self.bridges, parent_log_queue, logger_name,), name=str(self))
+                        args=(self.bridges, parent_log_queue, logger_name, logging.getLogger(logger_name).getEffectiveLevel(),), name=str(self))
         self.subprocess.start()
-        
+
+    # parent process
+    def wait_ready(self, timeout=10):
         self.info('Waiting for worker to be ready')
-        self.ready_event.wait(timeout=10)
-        self.info('Worker ready, resuming')
+        ready = self.ready_event.wait(timeout=timeout)
+        self.info('Worker ready, resuming' if ready else 'Worker not ready in time, resuming')
+        return ready
 
     # parent process
     def start(self):
@@ -85,17 +107,29 @@ class Processor_process(Logger):
     # parent process
     def stop(self, timeout=0.3):
         """ used if the processing is nown to be endless"""
+        self.signal_stop()
+        self.subprocess.join(timeout)
+        self.info('Returning; Process finished: ', not self.subprocess.is_alive())
 
+    # parent process
+    def signal_stop(self):
+        # non-blocking, so that all computers can be told to stop at once
         self.info('Stopping')
         self.stop_lock.release()
-        self.subprocess.join(timeout)
-        self.info('Returning; Process finished: ', not self.subprocess.is_alive())
 
     # parent process
     def close(self, timeout=0.5):
+        self.signal_close()
+        self.subprocess.join(timeout)
+        self.terminate()
+
+    # parent process
+    def signal_close(self):
         self.info('Closing')
         self.close_lock.release()
-        self.subprocess.join(timeout)
+
+    # parent process
+    def terminate(self):
         if self.subprocess.is_alive():
             self.subprocess.terminate()
             self.info('Timout reached: killed process')
@@ -112,8 +146,10 @@ class Processor_process(Logger):
         return all([cmp.is_finished() for cmp in computers])
 
     # worker process
-    def start_subprocess(self, bridges, subprocess_log_queue, logger_name):
+    def start_subprocess(self, bridges, subprocess_log_queue, logger_name, log_level=logging.NOTSET):
         logger = logging.getLogger(logger_name)
+        # if the worker is not forked from the main process (e.g. forkserver) it does not inherit the log configuration
+        logger.setLevel(log_level)
         logger.addHandler(QueueHandler(subprocess_log_queue))
         logger.propagate = False # this fixes duplicate log entries. I'm not fully sure why, but i'm assuming that in case of forking the logger propagates to the parent logger and thus the log is duplicated
         # however, we should double check once we moved to spawn everywhere, bc this whole drain queue migh not be necessary after all...
@@ -131,7 +167,11 @@ class Processor_process(Logger):
             self.info(f'Resolving computer group. Location: {loc}; Nodes: {len(loc_nodes)}')
             node_specific_bridges = [bridge_lookup[str(n)] for n in loc_nodes]
             cmp = Processor_threads(nodes=loc_nodes, location=loc, bridges=node_specific_bridges)
+            # the thread computers reply directly to the parent process
+            cmp.control.results = self.control.results
             computers.append(cmp)
+
+        cmp_lookup = {str(node): cmp for cmp in computers for node in cmp.nodes}
         
         self.info('Created computers:', list(map(str, computers)))
         self.info('Setting up computers')
@@ -151,22 +191,44 @@ class Processor_process(Logger):
 
 
         all_computers_finished = False
+        closed = False
         while not self.stop_lock.acquire(timeout=0.1) and not all_computers_finished:
             all_computers_finished = all([cmp.is_finished() for cmp in computers])
+            # forward commands to the thread computer running the node
+            for cmd in self.control.pending():
+                if cmd[1] in cmp_lookup:
+                    cmp_lookup[cmd[1]].control.put(cmd)
+                else:
+                    self.control.reply(cmd[0], KeyError(f'Unknown node: {cmd[1]}'), success=False)
+            # closed without being stopped (see Graph.apply): drop the nodes without closing their bridges
+            if self.close_lock.acquire(block=False):
+                closed = True
+                break
         
         if all_computers_finished:
             self.info('All Computers have finished, returning')
+        elif closed:
+            self.info('Closing Computers without stopping')
+            for cmp in computers:
+                cmp.signal_close()
+            join_computers(computers, timeout=self.close_timeout_threads)
+            for cmp in computers:
+                cmp.terminate()
         else:
             self.info('Stopping Computers')
             for cmp in computers:
-                # the cmps are all returning after the timeout, as they all are Processor_Threads
-                # -> therefore, this cannot block indefinetly and we can soon wait on the close_lock
-                cmp.stop(timeout=self.stop_timeout_threads)
+                cmp.signal_stop()
+            # the cmps are all Processor_Threads, thus joining returns after the timeout
+            # -> therefore, this cannot block indefinetly and we can soon wait on the close_lock
+            join_computers(computers, timeout=self.stop_timeout_threads)
 
             # if not all_computers_finished:
             self.close_lock.acquire()
             self.info('Closing Computers')
             for cmp in computers:
-                cmp.close(timeout=self.close_timeout_threads)
+                cmp.signal_close()
+            join_computers(computers, timeout=self.close_timeout_threads)
+            for cmp in computers:
+                cmp.terminate()
 
         self.info('Finished Process and returning')
@@ -0,0 +1,100 @@
+from .cmp_thread import Processor_threads
+
+
+class Processor_sync(Processor_threads):
+    """
+    Executes all nodes of an acyclic graph synchronously in one thread.
+
+    The graph is compiled into a static topological schedule. Each producer step is pushed through the downstream process calls directly,
+    instead of passing every item through an asyncio queue and a listener task per input (see Bridge_sync).
+    The event loop is only used to wrap up once all producers finished, thus timers (deadline, reorder_timeout) fire only then.
+
+    Only producers that implement _run are supported.
+    """
+    def __init__(self, nodes, location, bridges) -> None:
+        super().__init__(nodes, location, bridges)
+        # -- both threads
+        self.order = self.topological_order(nodes)
+
+    def __str__(self) -> str:
+        return f"CMP-SY:{self.location}"
+
+    # parent thread
+    @staticmethod
+    def topological_order(nodes):
+        """
+        Orders the nodes such that each node comes after all nodes it receives input from, raises a ValueError if this is not possible
+        """
+        # imported here, as the producers depend on the computers module
+        from livenodes.producer import Producer
+        for node in nodes:
+            if isinstance(node, Producer) and (type(node)._onstart is not Producer._onstart or type(node)._async_onstart is not Producer._async_onstart):
+                raise ValueError(f'Synchronous execution only supports producers implementing _run, got: {str(node)}')
+
+        n_inputs = {node: len(set([con._emit_node for con in node.input_connections])) for node in nodes}
+        todo = [node for node in nodes if n_inputs[node] == 0]
+        order = []
+        while len(todo) > 0:
+            node = todo.pop(0)
+            order.append(node)
+            for child in set([con._recv_node for con in node.output_connections]):
+                if child not in n_inputs:
+                    raise ValueError(f'Synchronous execution requires all nodes of the graph, missing: {str(child)}')
+                n_inputs[child] -= 1
+                if n_inputs[child] == 0:
+                    todo.append(child)
+
+        if len(order) < len(nodes):
+            raise ValueError('Synchronous execution requires an acyclic graph, found circles through:', [str(n) for n in nodes if n not in order])
+        return order
+
+    # worker thread
+    def start_subprocess(self, bridges):
+        from livenodes.producer import Producer
+        self.info('Starting Thread')
+        self.setup_loop()
+        futures = self.ready_nodes(bridges)
+
+        recv_bridges = {str(node): list(b['recv'].values()) for node, b in zip(self.nodes, bridges)}
+        producers = [node for node in self.order if isinstance(node, Producer)]
+        schedule = [(node, recv_bridges[str(node)]) for node in self.order if not isinstance(node, Producer)]
+        node_lookup = {str(node): node for node in self.nodes}
+        self.ready_event.set()
+
+        self.start_lock.acquire()
+        for node, _ in schedule:
+            node.start()
+        for node in producers:
+            node._start_sync()
+
+        self.info('Running schedule')
+        running = list(producers)
+        while len(running) > 0:
+            for node in list(running):
+                if not node._produce_next():
+                    running.remove(node)
+                    node._finish_sync()
+                node._report(node=node)
+
+            for node, in_bridges in schedule:
+                for bridge in in_bridges:
+                    for ctr in bridge.arrivals():
+                        node._process(ctr)
+
+            if not self.control.commands.empty():
+                for cmd_id, node_str, command, kwargs in self.control.pending():
+                    self.execute_command(node_lookup, cmd_id, node_str, command, kwargs)
+
+            # stop and close both end the production, the remaining nodes then finish once their inputs are closed
+            if self.stop_lock.acquire(blocking=False):
+                self.info('Stopped called, stopping producers')
+                self.stop_lock.release()
+                break
+            if not self.close_lock.locked():
+                break
+
+        for node in running:
+            node._finish_sync()
+
+        self.run_loop(futures)
+        self.info('Finished subprocess and returning')
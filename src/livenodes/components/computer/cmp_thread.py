@@ -1,8 +1,10 @@
 
 import asyncio
+import queue
 import threading as th
 
 from livenodes.components.node_logger import Logger
+from .control import Control_Channel
 
 # TODO: is this also possibly without creating a new thread, ie inside of main thread? 
 # i'm guessing no, as then the start likely does not return and then cannot be stopped by hand, but only if it returns by itself
@@ -21,6 +23,8 @@ class Processor_threads(Logger):
         self.close_lock = th.Lock() 
         # used for logging identification
         self.location = location
+        # passes commands to the nodes and their results back
+        self.control = Control_Channel(queue.Queue)
 
         # -- parent thread
         self.nodes = nodes
@@ -37,16 +41,24 @@ class Processor_threads(Logger):
 
     # parent thread
     def setup(self):
+        self.spawn()
+        self.wait_ready(timeout=10)
+
+    # parent thread
+    def spawn(self):
         self.info('Readying')
 
         self.subprocess = th.Thread(
                         target=self.start_subprocess,
                         args=(self.bridges,), name=str(self))
         self.subprocess.start()
-        
+
+    # parent thread
+    def wait_ready(self, timeout=10):
         self.info('Waiting for worker to be ready')
-        self.ready_event.wait(10)
-        self.info('Worker ready, resuming')
+        ready = self.ready_event.wait(timeout)
+        self.info('Worker ready, resuming' if ready else 'Worker not ready in time, resuming')
+        return ready
 
     # parent thread
     def start(self):
@@ -62,20 +74,33 @@ class Processor_threads(Logger):
     # parent thread
     def stop(self, timeout=0.1):
         """ used if the processing is nown to be endless"""
+        self.signal_stop()
+        self.subprocess.join(timeout)
+        self.info('Returning; thread finished: ', not self.subprocess.is_alive())
 
+    # parent thread
+    def signal_stop(self):
+        # non-blocking, so that all computers can be told to stop at once
         self.info('Stopping')
         self.stop_lock.release()
-        self.subprocess.join(timeout)
-        self.info('Returning; thread finished: ', not self.subprocess.is_alive())
 
     # parent thread
     def close(self, timeout=0.1):
+        self.signal_close()
+        self.subprocess.join(timeout)
+        self.terminate()
+        # self.subprocess = None
+
+    # parent thread
+    def signal_close(self):
         self.info('Closing')
         self.close_lock.release()
-        self.subprocess.join(timeout)
+
+    # parent thread
+    def terminate(self):
+        # threads cannot be killed, thus we can only report
         if self.subprocess.is_alive():
             self.info('Timout reached, but still alive')
-        # self.subprocess = None
     
     # parent thread
     def is_finished(self):
@@ -86,6 +111,18 @@ class Processor_threads(Logger):
         self.info('Starting Thread')
         self.ready_event.set()
 
+        self.setup_loop()
+        futures = self.ready_nodes(bridges)
+
+        self.start_lock.acquire()
+        for node in self.nodes:
+            node.start()
+
+        self.run_loop(futures)
+        self.info('Finished subprocess and returning')
+
+    # worker thread
+    def setup_loop(self):
         def custom_exception_handler(loop, context):
             nonlocal self
             self.error(context)
@@ -96,21 +133,25 @@ class Processor_threads(Logger):
         # TODO: this doesn't seem to do much?
         self.loop.set_exception_handler(custom_exception_handler)
 
+    # worker thread
+    def ready_nodes(self, bridges):
         futures = []
-
         for node, bridges in zip(self.nodes, bridges):
             self.info(f'Node {node} readying')
             input_bridges, output_bridges = bridges['recv'], bridges['emit']
             futures.append(node.ready(input_endpoints=input_bridges, output_endpoints=output_bridges))
+        return futures
 
-        self.start_lock.acquire()
-        for node in self.nodes:
-            node.start()
-
+    # worker thread
+    def run_loop(self, futures):
+        """
+        Runs the event loop until all nodes finished or close is called
+        """
         self.onprocess_task = asyncio.gather(*futures)
         self.onprocess_task.add_done_callback(self.handle_finished)
         self.onstop_task = asyncio.gather(self.handle_stop())
         self.onclose_task = asyncio.gather(self.handle_close())
+        self.oncommand_task = asyncio.gather(self.handle_commands())
 
         # async def combined_tasks():
         #     try:
@@ -121,20 +162,25 @@ class Processor_threads(Logger):
         #         self.error(traceback.format_exc())
 
         # with the return_exceptions, we don't care how the processe
-        self.loop.run_until_complete(asyncio.gather(self.onprocess_task, self.onstop_task, self.onclose_task, return_exceptions=True))
+        self.loop.run_until_complete(asyncio.gather(self.onprocess_task, self.onstop_task, self.onclose_task, self.oncommand_task, return_exceptions=True))
+
+        # closing without stopping leaves the bridge listeners of the nodes pending, which must not outlive the loop
+        remaining = asyncio.all_tasks(self.loop)
+        for task in remaining:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*remaining, return_exceptions=True))
 
         # wrap up the asyncio event loop
         self.loop.stop()
         self.loop.close()
 
-        self.info('Finished subprocess and returning')
-
     # worker thread
     def handle_finished(self, *args):
         self.info('All Tasks finished, aborting stop and close listeners')
 
         self.onstop_task.cancel()
         self.onclose_task.cancel()
+        self.oncommand_task.cancel()
 
     # worker thread
     async def handle_stop(self):
@@ -162,4 +208,37 @@ class Processor_threads(Logger):
 
         self.info('Closed called, stopping all remaining tasks')
         self.onprocess_task.cancel()
+        self.oncommand_task.cancel()
+
+    # worker thread
+    async def handle_commands(self):
+        node_lookup = {str(node): node for node in self.nodes}
+        # instead of polling the queue, the parent wakes us once it sent a command
+        self._commands_sent = asyncio.Event()
+        self.control.wakeup = self.wakeup_commands
+        while True:
+            self._commands_sent.clear()
+            # includes the commands sent before the wakeup was registered
+            for cmd_id, node_str, command, kwargs in self.control.pending():
+                self.execute_command(node_lookup, cmd_id, node_str, command, kwargs)
+            await self._commands_sent.wait()
+
+    # parent thread
+    def wakeup_commands(self):
+        try:
+            self.loop.call_soon_threadsafe(self._commands_sent.set)
+        except RuntimeError:
+            # the loop is closed already, thus the command will not be answered (see Control_Channel.result)
+            pass
+
+    # worker thread
+    def execute_command(self, node_lookup, cmd_id, node_str, command, kwargs):
+        self.info(f'Executing command {command} on {node_str}')
+        reply = lambda result, success=True: self.control.reply(cmd_id, result, success=success)
+        try:
+            node_lookup[node_str]._on_command(command, reply, **kwargs)
+        except Exception as err:
+            self.error(f'Failed to execute command {command} on {node_str}')
+            self.error(err)
+            reply(err, success=False)
 
@@ -0,0 +1,81 @@
+import queue
+import time
+import itertools
+
+
+class Control_Channel():
+    """
+    Passes commands from the parent (ie the graph) to nodes running inside a computer and their results back.
+
+    queue_cls must be a queue class suitable for the computer, ie queue.Queue for threads and multiprocessing.Queue for processes.
+    The parent side is expected to be used from a single thread.
+    """
+    def __init__(self, queue_cls):
+        # parent -> worker: (cmd_id, node_str, command, kwargs)
+        self.commands = queue_cls()
+        # worker -> parent: (cmd_id, success, result)
+        self.results = queue_cls()
+        # called after each command was put, e.g. to wake the event loop of a worker waiting for commands
+        self.wakeup = None
+
+        # -- parent
+        self._ids = itertools.count()
+        self._received = {}
+        # commands whose result timed out, their results are dropped once they arrive
+        self._abandoned = set()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # only the parent sends commands and pickling itertools.count is deprecated
+        state['_ids'] = None
+        state['wakeup'] = None
+        return state
+
+    # parent
+    def send(self, node_str, command, **kwargs):
+        cmd_id = next(self._ids)
+        self.put((cmd_id, node_str, command, kwargs))
+        return cmd_id
+
+    # parent (or a process forwarding commands to its threads)
+    def put(self, cmd):
+        self.commands.put(cmd)
+        if self.wakeup is not None:
+            self.wakeup()
+
+    # parent
+    def result(self, cmd_id, timeout=None):
+        """
+        Blocks until the result for cmd_id is returned, raises a TimeoutError if it does not arrive in time and re-raises errors the command raised in the worker.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while cmd_id not in self._received:
+            try:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                res_id, success, res = self.results.get(timeout=remaining)
+            except queue.Empty:
+                self._abandoned.add(cmd_id)
+                raise TimeoutError(f'No result for command {cmd_id} within {timeout}s')
+            if res_id in self._abandoned:
+                # nobody waits for this result anymore
+                self._abandoned.discard(res_id)
+                continue
+            self._received[res_id] = (success, res)
+
+        success, res = self._received.pop(cmd_id)
+        if not success:
+            raise res
+        return res
+
+    # worker
+    def pending(self):
+        cmds = []
+        while True:
+            try:
+                cmds.append(self.commands.get_nowait())
+            except queue.Empty:
+                return cmds
+
+    # worker
+    def reply(self, cmd_id, result, success=True):
+        self.results.put((cmd_id, success, result))
@@ -1,3 +1,4 @@
+from timeit import default_timer as timer
 
 
 def parse_location(location):
@@ -10,4 +11,14 @@ def parse_location(location):
     thread, process, port, host = comps        
     host = f"{host}:{port}"
 
-    return host, process, thread
\ No newline at end of file
+    return host, process, thread
+
+
+def join_computers(computers, timeout):
+    """
+    Joins all computers under a single deadline (instead of one timeout per computer) and returns those still running afterwards
+    """
+    deadline = timer() + timeout
+    for cmp in computers:
+        cmp.join(max(0, deadline - timer()))
+    return [cmp for cmp in computers if not cmp.is_finished()]
@@ -0,0 +1,42 @@
+import multiprocessing as mp
+from multiprocessing import forkserver
+
+DEFAULT_PRELOAD = ['numpy', 'livenodes']
+
+# the forkserver context of the pool, see start_worker_pool
+_context = None
+
+
+def start_worker_pool(preload=None):
+    """
+    Creates process computers from a persistent forkserver instead of the main process.
+
+    The forkserver imports the preload modules once and stays alive for the rest of the session, every process computer is then forked from it.
+    Thus heavy imports (numpy, node packages, models) stay warm between graph runs and a graph start only ships the pickled nodes and bridges to its workers.
+    Useful if graphs are restarted often or the spawn start method would otherwise be used (e.g. macOS).
+
+    Must be called once before any node or graph is created (e.g. right after `if __name__ == '__main__':`),
+    as the locks, events and queues of nodes and bridges are bound to the context they were created with (see mp_context).
+    The global start method is not changed, thus other multiprocessing code of the application is not affected.
+    Not available on Windows.
+    """
+    global _context
+    if 'forkserver' not in mp.get_all_start_methods():
+        raise ValueError('The forkserver start method is not supported on this platform')
+
+    _context = mp.get_context('forkserver')
+    _context.set_forkserver_preload(DEFAULT_PRELOAD if preload is None else list(preload))
+    # start the server now instead of on the first graph start
+    forkserver.ensure_running()
+
+
+def worker_pool_running():
+    return _context is not None
+
+
+def mp_context():
+    """
+    The multiprocessing context process computers are started with: the worker pool's if it was started, otherwise the default one.
+    Locks, events and queues shared with process computers must be created from it, this includes those of custom nodes.
+    """
+    return _context if _context is not None else mp.get_context()
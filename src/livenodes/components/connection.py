@@ -9,6 +9,8 @@ class Connection():
         self._recv_node = recv_node
         self._emit_port = emit_port
         self._recv_port = recv_port
+        # ((emit location, recv location), bridge class) chosen before (e.g. stored in a graph plan, see Serializer.from_plan), only used while the locations match
+        self._bridge_hint = None
 
     def __repr__(self):
         return f"{str(self._emit_node)}.{str(self._emit_port)} -> {str(self._recv_node)}.{str(self._recv_port)}"
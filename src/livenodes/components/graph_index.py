@@ -0,0 +1,174 @@
+import networkx as nx
+
+
+class Graph_Index():
+    """
+    The nodes of one connected graph, shared by all of them and kept up to date by add_input and remove_input_by_connection (see Connectionist).
+
+    Discovering the graph of a node thus does not require a traversal.
+    Results that depend on the structure (the topological order and the number of descendants of each node) are computed once per change and cached.
+    The names of the nodes (ie "name [class]") are counted as well, such that unique names are found without a pass over all nodes (see unique_name).
+    """
+    def __init__(self, nodes=()):
+        self.nodes = set(nodes)
+        self._cache = {}
+        # str(node): number of nodes with that str, kept up to date by Connectionist.name
+        self.names = {}
+        # str of a base name: the suffix to try next, see unique_name
+        self._suffix = {}
+        for node in self.nodes:
+            self._count(str(node), 1)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.nodes
+
+    def __getstate__(self):
+        # the caches are cheap to recompute and hold networkx graphs
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def invalidate(self):
+        self._cache = {}
+
+    def _count(self, name, n):
+        count = self.names.get(name, 0) + n
+        if count > 0:
+            self.names[name] = count
+        else:
+            self.names.pop(name, None)
+
+    def rename(self, old, new):
+        """
+        Called once the str of one of the nodes changed from old to new
+        """
+        self._count(old, -1)
+        self._count(new, 1)
+
+    def is_taken(self, node, name, taken=()):
+        """
+        Whether a node other than node is called name (with the class of node) in this graph, taken holds further names (ie node strs) to avoid
+        """
+        name = node.string(name)
+        own = 1 if node in self.nodes and str(node) == name else 0
+        return self.names.get(name, 0) > own or name in taken
+
+    def unique_name(self, node, base, taken=()):
+        """
+        base if no other node is called so, otherwise base_1, base_2 etc, whichever is free first.
+        The suffix to try next is counted per base name, thus repeatedly adding nodes of the same name does not probe all the taken suffixes again.
+        """
+        if not self.is_taken(node, base, taken):
+            return base
+        key = node.string(base)
+        i = self._suffix.get(key, 1)
+        while self.is_taken(node, f"{base}_{i}", taken):
+            i += 1
+        self._suffix[key] = i + 1
+        return f"{base}_{i}"
+
+    def merge(self, other):
+        """
+        Joins the graph of other into this one (or the other way around, whichever is cheaper) and returns the joined index
+        """
+        if other is self:
+            self.invalidate()
+            return self
+        big, small = (self, other) if len(self) >= len(other) else (other, self)
+        big.nodes |= small.nodes
+        for node in small.nodes:
+            node._graph_index = big
+        for name, n in small.names.items():
+            big._count(name, n)
+        big.invalidate()
+        return big
+
+    def split(self):
+        """
+        Re-discovers the connected graphs after a connection was removed and assigns each its own index
+        """
+        todo = set(self.nodes)
+        while len(todo) > 0:
+            start = todo.pop()
+            found, stack = {start}, [start]
+            while len(stack) > 0:
+                node = stack.pop()
+                for con in node.input_connections + node.output_connections:
+                    for n in (con._emit_node, con._recv_node):
+                        if n not in found:
+                            found.add(n)
+                            stack.append(n)
+            todo -= found
+            if len(todo) <= 0 and found == self.nodes:
+                # still connected, keep this index
+                self.invalidate()
+                return
+            index = Graph_Index(found)
+            for node in found:
+                node._graph_index = index
+
+    def replace(self, old, new):
+        if old in self.nodes:
+            self.nodes.discard(old)
+            self._count(str(old), -1)
+        self.nodes.add(new)
+        self._count(str(new), 1)
+        new._graph_index = self
+        self.invalidate()
+        return self
+
+    def _networkx(self):
+        if 'networkx' not in self._cache:
+            G = nx.DiGraph()
+            G.add_nodes_from(self.nodes)
+            for node in self.nodes:
+                for con in node.output_connections:
+                    G.add_edge(node, con._recv_node)
+            self._cache['networkx'] = G
+        return self._cache['networkx']
+
+    def _condensed(self):
+        # the graph of the strongly connected components (ie circles), which is acyclic
+        if 'condensed' not in self._cache:
+            self._cache['condensed'] = nx.condensation(self._networkx())
+        return self._cache['condensed']
+
+    def on_circle(self, node):
+        condensed = self._condensed()
+        members = condensed.nodes[condensed.graph['mapping'][node]]['members']
+        return len(members) > 1 or self._networkx().has_edge(node, node)
+
+    def has_circles(self):
+        return len(self._condensed()) < len(self.nodes) or nx.number_of_selfloops(self._networkx()) > 0
+
+    def topological_order(self):
+        """
+        The nodes such that each comes after the nodes it receives input from, nodes on a circle are ordered arbitrarily among each other
+        """
+        if 'order' not in self._cache:
+            condensed = self._condensed()
+            self._cache['order'] = [node for c in nx.topological_sort(condensed) for node in condensed.nodes[c]['members']]
+        return list(self._cache['order'])
+
+    def n_descendants(self, node):
+        """
+        The number of nodes depending on the output of node, including itself (ie len(Connectionist.discover_output_deps(node)))
+        """
+        if 'descendants' not in self._cache:
+            G = self._networkx()
+            condensed = self._condensed()
+            position = {n: i for i, n in enumerate(G.nodes)}
+            # the descendants of each strongly connected component as bitset over the node positions, accumulated from the sinks upwards
+            bits = {}
+            for c in reversed(list(nx.topological_sort(condensed))):
+                mask = 0
+                for member in condensed.nodes[c]['members']:
+                    mask |= 1 << position[member]
+                for child in condensed.successors(c):
+                    mask |= bits[child]
+                bits[c] = mask
+            self._cache['descendants'] = {n: bin(bits[condensed.graph['mapping'][n]]).count('1') for n in G.nodes}
+        return self._cache['descendants'][node]
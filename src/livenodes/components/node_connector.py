@@ -1,5 +1,3 @@
-import numpy as np
-import queue
 from enum import Enum
 
 import re
@@ -13,6 +11,7 @@ import deprecation
 from .connection import Connection
 from .port import Port, Ports_collection
 from .node_logger import Logger
+from .graph_index import Graph_Index
 
 class Attr(Enum):
     ctr_increase = 1
@@ -32,8 +31,9 @@ class Connectionist(Logger):
 
         self.input_connections = []
         self.output_connections = []
-
-        self.name = name
+        self._name = name
+        # shared by all nodes of the connected graph, see Graph_Index
+        self._graph_index = Graph_Index([self])
 
         assert isinstance(self.ports_in, Ports_collection), 'NamedTuples are deprecated, please use Ports_collection instead'
         assert isinstance(self.ports_out, Ports_collection), 'NamedTuples are deprecated, please use Ports_collection instead'
@@ -49,6 +49,19 @@ class Connectionist(Logger):
     #         getattr(self.ports_out, key).set_key(key)
     #         self.debug(f'[PortsOut], setting: {key}')
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        # keep the name count of the graph up to date (unless the name is set before Connectionist.__init__)
+        index = getattr(self, '_graph_index', None)
+        old = str(self) if index is not None else None
+        self._name = name
+        if index is not None:
+            index.rename(old, str(self))
+
     def string(self, name):
         return f"{name} [{self.__class__.__name__}]"
 
@@ -139,31 +152,23 @@ class Connectionist(Logger):
         """
         Add one input to self via attributes.
         Main function to connect two nodes together with connect_inputs_to
+        See add_inputs to add many inputs at once.
         """
-
-        # === Check if ports are available
-        if emit_port not in emit_node.ports_out:
-            raise ValueError(
-                f"Emitting Channel not present on given emitting node ({str(emit_node)}). Got",
-                str(emit_port), 'Available ports:', ', '.join(map(str, emit_node.ports_out)))
-
-        if recv_port not in self.ports_in:
-            raise ValueError(
-                f"Receiving Channel not present on node ({str(self)}). Got",
-                str(recv_port), 'Available ports:', ', '.join(map(str, self.ports_in)))
+        self._check_input(emit_node, emit_port, recv_port)
 
         # === Check if class + name are unique across connected graph
-        nodes_in_emit_graph = list(self.discover_graph(emit_node))
-        nodes_in_recv_graph = list(self.discover_graph(self))
-
-        # the subgraphs may already be connected -> thus remove duplicate nodes based on instance pointers (not names!)
-        combined_node_list = self.remove_discovered_duplicates(nodes_in_emit_graph + nodes_in_recv_graph)
         # if we connect two subraphs, we can always expect no duplicates in each sub-graph and thus it suffices to update the recv (ie "newly added") subgraph
-        for node in nodes_in_recv_graph:
-            if not node.is_unique_name(node.name, node_list=combined_node_list):
-                new_name = node.create_unique_name(node.name, node_list=combined_node_list)
-                self.warn(f"{str(node)} not unique in new graph. Renaming Node to: {new_name}")
-                node._set_attr(name=new_name)
+        emit_index, recv_index = emit_node._graph_index, self._graph_index
+        if emit_index is not recv_index:
+            # only the names present in both graphs need a new name, which we find by going over the smaller of the two
+            small, big = sorted([emit_index.names, recv_index.names], key=len)
+            clashes = set([name for name in small if name in big])
+            if len(clashes) > 0:
+                for node in list(recv_index.nodes):
+                    if str(node) in clashes:
+                        new_name = recv_index.unique_name(node, node.name, taken=emit_index.names)
+                        self.warn(f"{str(node)} not unique in new graph. Renaming Node to: {new_name}")
+                        node._set_attr(name=new_name)
 
         # === Create connection instance
         connection = Connection(emit_node,
@@ -174,40 +179,130 @@ class Connectionist(Logger):
         if len(list(filter(connection.__eq__, self.input_connections))) > 0:
             raise ValueError("Connection already exists.")
 
+        # === Check if the connection closes a circle and if all such circles are safe
+        # only circles through the new connection are new, ie paths from self back to the emitting node (which may only exist if both are part of the same graph)
+        if emit_node._graph_index is self._graph_index and self._reaches(emit_node):
+            # every circle must contain a circ_breaker and a ctr_increase node, thus the emitting node must not be reachable via nodes lacking either
+            missing = [attr for attr in [Attr.circ_breaker, Attr.ctr_increase] if self._reaches(emit_node, skip_attr=attr)]
+            if len(missing) > 0:
+                raise ValueError(f'Found unsafe circular dependency. Circles missing attributes: {missing}')
+            self.info('Found circular dependency, but should be safe.')
+
+        self._connect(connection)
+
+    def _check_input(self, emit_node, emit_port, recv_port):
+        # === Check if ports are available
+        if emit_port not in emit_node.ports_out:
+            raise ValueError(
+                f"Emitting Channel not present on given emitting node ({str(emit_node)}). Got",
+                str(emit_port), 'Available ports:', ', '.join(map(str, emit_node.ports_out)))
+
+        if recv_port not in self.ports_in:
+            raise ValueError(
+                f"Receiving Channel not present on node ({str(self)}). Got",
+                str(recv_port), 'Available ports:', ', '.join(map(str, self.ports_in)))
+
+    def _connect(self, connection):
         # Not sure if this'll actually work, otherwise we should name them _add_output
-        emit_node._add_output(connection)
+        connection._emit_node._add_output(connection)
         self.input_connections.append(connection)
+        connection._emit_node._graph_index.merge(self._graph_index)
 
-        # check if there is a circular dependency and if this is safe otherwise remove the connection again
-        for circ in self.discover_circles(self.discover_graph(self)):
-            if self in circ:
-                attrs = np.concatenate([n.attrs for n in circ])
-                if Attr.circ_breaker in attrs and Attr.ctr_increase in attrs:
-                    self.info(f'Found circular dependency, but should be safe. Found attributes: {attrs}')
-                    # no return here, as the connection might still be part of another unsafe circle
-                else:
-                    self.remove_input_by_connection(connection)
-                    # connection is unsafe, other safe circles do not matter, connection has to be removed
-                    raise ValueError(f'Found unsafe circular dependency. Found attributes: {attrs}')
+    @staticmethod
+    def add_inputs(connections):
+        """
+        Adds many inputs at once, e.g. when loading a graph. connections: [(emit_node, emit_port, recv_node, recv_port), ...]
+
+        Unlike add_input per connection, the joined graph is validated once: nodes whose name is taken by a node of a graph joined before are renamed and all circles are checked together.
+        If any connection is invalid, none is added.
+        """
+        # === Check ports and duplicates
+        new = []
+        # the new inputs of each node
+        pending = {}
+        for emit_node, emit_port, recv_node, recv_port in connections:
+            recv_node._check_input(emit_node, emit_port, recv_port)
+            connection = Connection(emit_node, recv_node, emit_port=emit_port, recv_port=recv_port)
+            if connection in recv_node.input_connections or connection in pending.get(recv_node, []):
+                raise ValueError("Connection already exists.", connection)
+            pending.setdefault(recv_node, []).append(connection)
+            new.append(connection)
+
+        # the graphs joined, in order of their first appearance
+        indices = []
+        for con in new:
+            for node in [con._emit_node, con._recv_node]:
+                if node._graph_index not in indices:
+                    indices.append(node._graph_index)
+
+        # === Check if all circles of the joined graph are safe
+        G = nx.DiGraph()
+        for index in indices:
+            G.add_nodes_from(index.nodes)
+            for node in index.nodes:
+                G.add_edges_from([(node, con._recv_node) for con in node.output_connections])
+        G.add_edges_from([(con._emit_node, con._recv_node) for con in new])
+        # every circle must contain a circ_breaker and a ctr_increase node, ie the graph without either must be acyclic
+        missing = []
+        if not nx.is_directed_acyclic_graph(G):
+            missing = [attr for attr in [Attr.circ_breaker, Attr.ctr_increase] if not nx.is_directed_acyclic_graph(G.subgraph([n for n in G.nodes if attr not in n.attrs]))]
+        if len(missing) > 0:
+            raise ValueError(f'Found unsafe circular dependency. Circles missing attributes: {missing}')
+
+        # === Check if class + name are unique across the joined graph
+        # the names of the graphs joined before
+        taken = set()
+        for index in indices:
+            for node in list(index.nodes):
+                if str(node) in taken:
+                    name = index.unique_name(node, node.name, taken=taken)
+                    node.warn(f"{str(node)} not unique in new graph. Renaming Node to: {name}")
+                    node._set_attr(name=name)
+            taken.update(index.names)
+
+        for con in new:
+            con._recv_node._connect(con)
+
+    def _reaches(self, node, skip_attr=None):
+        """
+        Whether node depends on the output of self, only considering paths through nodes without skip_attr
+        """
+        found = set([self])
+        stack = [self]
+        while len(stack) > 0:
+            cur = stack.pop()
+            if skip_attr in cur.attrs:
+                continue
+            if cur is node:
+                return True
+            for con in cur.output_connections:
+                if con._recv_node not in found:
+                    found.add(con._recv_node)
+                    stack.append(con._recv_node)
+        return False
 
 
     def is_unique_name(self, name, node_list=None):
         if node_list is None:
-            node_list = self.discover_graph(self)
+            return not self._graph_index.is_taken(self, name)
 
-        nodes_names = list(map(str, set(node_list) - set([self])))
+        nodes_names = set(map(str, set(node_list) - set([self])))
 
         return not self.string(name) in nodes_names
 
     def create_unique_name(self, base, node_list=None):
         if node_list is None:
-            node_list = self.discover_graph(self)
+            return self._graph_index.unique_name(self, base)
 
-        if self.is_unique_name(base, node_list=node_list):
+        nodes_names = set(map(str, set(node_list) - set([self])))
+        if self.string(base) not in nodes_names:
             return base
 
-        # basically adjust base by counting then recurse until we find a good name and return that
-        return self.create_unique_name(f"{base}_1", node_list=node_list)
+        # basically adjust base by counting until we find a free name
+        i = 1
+        while self.string(f"{base}_{i}") in nodes_names:
+            i += 1
+        return f"{base}_{i}"
 
 
 
@@ -248,6 +343,8 @@ class Connectionist(Logger):
         # -> in case something goes wrong on the parents side, the connection remains intact
         cons[0]._emit_node._remove_output(cons[0])
         self.input_connections.remove(cons[0])
+        # the graph may have fallen apart
+        self._graph_index.split()
 
 
     def _add_output(self, connection):
@@ -283,7 +380,7 @@ class Connectionist(Logger):
 
     @staticmethod
     def sort_discovered_nodes(nodes):
-        return list(sorted(nodes, key=lambda x: f"{len(x.discover_output_deps(x))}_{str(x)}"))
+        return list(sorted(nodes, key=lambda x: f"{x._graph_index.n_descendants(x)}_{str(x)}"))
 
     @staticmethod
     def discover_output_deps(node):
@@ -298,12 +395,10 @@ class Connectionist(Logger):
         return node.discover_graph(node, direction='parents', sort=False)
 
     def has_circles(self):
-        return len(list(self.discover_circles(self.discover_graph(self)))) > 0
+        return self._graph_index.has_circles()
 
     def is_on_circle(self):
-        for circ in self.discover_circles(self.discover_graph(self)):
-            return self in circ
-        return False
+        return self._graph_index.on_circle(self)
 
     @staticmethod
     def discover_circles(nodes):
@@ -334,19 +429,19 @@ class Connectionist(Logger):
         if direction not in mapper:
             raise ValueError(f'Unknown direction: {direction}. Known: {mapper.keys()}')
 
-        discovered_nodes = mapper[direction](node)
-        found_nodes = [node]
-        stack = queue.Queue()
-        for node in discovered_nodes:
-            if not node in found_nodes:
-                found_nodes.append(node)
-                for n in mapper[direction](node):
-                    if not n in discovered_nodes:
-                        discovered_nodes.append(n)
-                        stack.put(n)
-
+        if direction == 'both':
+            # the connected graph is kept up to date on every connection change, see Graph_Index
+            found = list(node._graph_index.nodes)
+        else:
+            found_nodes = {node}
+            stack = [node]
+            while len(stack) > 0:
+                for n in mapper[direction](stack.pop()):
+                    if n not in found_nodes:
+                        found_nodes.add(n)
+                        stack.append(n)
+            found = list(found_nodes)
 
-        found = node.remove_discovered_duplicates(found_nodes)
         if not sort:
             return found
 
@@ -374,7 +469,12 @@ class Connectionist(Logger):
                 G.add_edge(node, con._recv_node)
         return G
 
-    def dot_graph(self, nodes, name=False, transparent_bg=False, edge_labels=True, format='png', **kwargs):
+    def dot_graph(self, nodes, name=False, transparent_bg=False, edge_labels=True, format='png', annotations=None, node_attrs=None, edge_attrs=None, **kwargs):
+        # annotations: {str(node): text} appended to the node label
+        # node_attrs: {str(node): graphviz attributes}, edge_attrs: {(str(emit_node), str(recv_node)): graphviz attributes}
+        annotations = annotations or {}
+        node_attrs = node_attrs or {}
+        edge_attrs = edge_attrs or {}
         graph_attr = {"size": "10,10!", "ratio": "fill"}
         if transparent_bg: graph_attr["bgcolor"] = "#00000000"
         dot = Digraph(format=format, strict=not edge_labels, graph_attr=graph_attr)
@@ -386,7 +486,10 @@ class Connectionist(Logger):
             if len(node.ports_out) <= 0:
                 shape = 'trapezium'
             disp_name = node.name if name else self._sanitize_node_str(node)
-            dot.node(self._sanitize_node_str(node), disp_name, shape=shape, style='rounded')
+            if str(node) in annotations:
+                disp_name = f"{disp_name}\n{annotations[str(node)]}"
+            attrs = {'shape': shape, 'style': 'rounded', **node_attrs.get(str(node), {})}
+            dot.node(self._sanitize_node_str(node), disp_name, **attrs)
 
         # Second pass: add edges based on output links
         for node in nodes:
@@ -396,7 +499,8 @@ class Connectionist(Logger):
                     l = f"{con._emit_port.label}\n->\n{con._recv_port.label}"
                 dot.edge(self._sanitize_node_str(node),
                          self._sanitize_node_str(con._recv_node),
-                         label=l)
+                         label=l,
+                         **edge_attrs.get((str(node), str(con._recv_node)), {}))
         return dot
 
     def dot_graph_full(self, filename=None, file_type='png', **kwargs):
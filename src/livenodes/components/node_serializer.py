@@ -1,5 +1,8 @@
 import json
 import yaml
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import entry_points, version, PackageNotFoundError
 
 from .utils.utils import NumpyEncoder
 from livenodes.components.connection import Connection
@@ -9,7 +12,43 @@ from livenodes import get_registry
 import logging
 logger_ln = logging.getLogger('livenodes')
 
+# the c implementation is much faster, but only available if pyyaml was built against libyaml
+YAML_LOADER = getattr(yaml, 'CLoader', yaml.Loader)
+
+# increase if the format of to_plan changes, such that old plans are not used anymore
+PLAN_VERSION = 2
+
+def _installed_versions():
+    # the packages providing nodes or bridges, a plan is only valid if these did not change
+    versions = {}
+    try:
+        versions['livenodes'] = version('livenodes')
+    except PackageNotFoundError:
+        pass
+    for group in ['livenodes.nodes', 'livenodes.bridges']:
+        for entry in entry_points(group=group):
+            if entry.dist is not None:
+                versions[entry.dist.name] = entry.dist.version
+    return sorted(versions.items())
+
+def _instantiate(specs, workers=None, **kwargs):
+    """
+    Creates the nodes for [(class name, settings)], in order.
+    With workers > 1 the nodes are created concurrently in a thread pool, which pays off if their __init__ waits for files, devices or the network (or loads models in libraries releasing the GIL).
+    """
+    reg = get_registry()
+    # look up the classes here, so that only the nodes' __init__ run concurrently
+    classes = [reg.nodes.get_class(node_cls) for node_cls, _ in specs]
+    settings = [node_settings for _, node_settings in specs]
+    if workers is None or workers <= 1:
+        return [node_cls(**node_settings, **kwargs) for node_cls, node_settings in zip(classes, settings)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda args: args[0](**args[1], **kwargs), zip(classes, settings)))
+
 class Serializer():
+    # framework settings and their defaults, these are only serialized if they deviate from the default
+    framework_settings = {}
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
@@ -25,7 +64,8 @@ class Serializer():
         return self.from_compact_dict(dct)
 
     def _node_settings(self):
-        return {"name": self.name, "compute_on": self.compute_on, **self._settings()}
+        framework = {key: getattr(self, key) for key, default in self.framework_settings.items() if getattr(self, key) != default}
+        return {"name": self.name, "compute_on": self.compute_on, **framework, **self._settings()}
 
     def get_settings(self):
         return { \
@@ -45,24 +85,19 @@ class Serializer():
         return res
 
     @classmethod
-    def from_dict(cls, items, initial_node=None, ignore_connection_errors=False, **kwargs):
+    def from_dict(cls, items, initial_node=None, ignore_connection_errors=False, workers=None, **kwargs):
+        """
+        workers: create up to this many nodes concurrently (see _instantiate), nodes should rather move heavy setup work into prepare though
+        """
         # TODO: implement children=True, parents=True
         # format should be as in to_dict, ie a dictionary, where the name is unique and the values is a dictionary with three values (settings, ins, outs)
 
-        items_instc = {}
         initial = None
 
-        reg = get_registry()
-
         # first pass: create nodes
-        for name, itm in items.items():
-            # module_name = f"livenodes.nodes.{itm['class'].lower()}"
-            # if module_name in sys.modules:
-            # module = importlib.reload(sys.modules[module_name])
-            # tmp = (getattr(module, itm['class'])(**itm['settings']))
-
-            items_instc[name] = reg.nodes.get(itm['class'], **itm['settings'], **kwargs)
-
+        nodes = _instantiate([(itm['class'], itm['settings']) for itm in items.values()], workers=workers, **kwargs)
+        items_instc = dict(zip(items.keys(), nodes))
+        for name in items_instc:
             # assume that the first node without any inputs is the initial node...
             if initial_node is None and len(
                     items_instc[name].ports_in) <= 0:
@@ -76,21 +111,36 @@ class Serializer():
             initial = list(items_instc.values())[0]
 
         # second pass: create connections
+        connections = []
         for name, itm in items.items():
             # only add inputs, as, if we go through all nodes this automatically includes all outputs as well
             for con in itm['inputs']:
                 try:
-                    items_instc[name].add_input(
-                        emit_node = items_instc[con["emit_node"]],
-                        emit_port = items_instc[con["emit_node"]].get_port_out_by_key(con['emit_port']),
-                        recv_port = items_instc[name].get_port_in_by_key(con['recv_port'])
-                        )
+                    connections.append((
+                        items_instc[con["emit_node"]],
+                        items_instc[con["emit_node"]].get_port_out_by_key(con['emit_port']),
+                        items_instc[name],
+                        items_instc[name].get_port_in_by_key(con['recv_port'])
+                        ))
                 except Exception as err:
                     if ignore_connection_errors:
                         logger_ln.exception(err)
                     else:
                         raise err
 
+        # validating the whole graph once is much faster than validating it after each added connection
+        try:
+            Connectionist.add_inputs(connections)
+        except Exception as err:
+            if not ignore_connection_errors:
+                raise err
+            # add them one by one instead, so that only the invalid ones are skipped
+            for emit_node, emit_port, recv_node, recv_port in connections:
+                try:
+                    recv_node.add_input(emit_node=emit_node, emit_port=emit_port, recv_port=recv_port)
+                except Exception as err:
+                    logger_ln.exception(err)
+
         return initial
 
     def compact_settings(self):
@@ -153,8 +203,63 @@ class Serializer():
             raise ValueError('Unkown Extension', extension)
 
 
+    def to_plan(self):
+        """
+        The graph of this node in a form that can be re-created without any validation: nodes with their settings (including their placement), connections by port key and the bridge of each pair of locations
+        Only holds plain data, thus it can be stored as json
+        """
+        from .bridges.mp_data_storage import Multiprocessing_Data_Storage
+
+        nodes = self.discover_graph(self, direction='both', sort=True)
+        inputs = [(str(con._emit_node), con._emit_port.key, str(con._recv_node), con._recv_port.key) for node in nodes for con in node.input_connections]
+        bridges = {}
+        for node in nodes:
+            for con in node.input_connections:
+                locs = (con._emit_node.compute_on, con._recv_node.compute_on)
+                if locs not in bridges:
+                    try:
+                        bridges[locs] = Multiprocessing_Data_Storage.choose_bridge(*locs, connection=con).__name__
+                    except ValueError:
+                        # will fail again on start, we do not need to fail on load already
+                        pass
+        return {
+            'version': PLAN_VERSION,
+            'initial': str(self),
+            'nodes': [(str(node), node.__class__.__name__, node._node_settings()) for node in nodes],
+            'inputs': inputs,
+            'bridges': [[emit_loc, recv_loc, name] for (emit_loc, recv_loc), name in bridges.items()],
+        }
+
     @classmethod
-    def load(cls, path, **kwargs):
+    def from_plan(cls, plan, initial_node=None, workers=None, **kwargs):
+        """
+        Creates the graph of a plan (see to_plan) and returns its initial node
+        initial_node: name of the node to return instead of the plan's initial node
+        """
+        reg = get_registry()
+        nodes = _instantiate([(node_cls, settings) for _, node_cls, settings in plan['nodes']], workers=workers, **kwargs)
+        nodes = dict(zip([name for name, _, _ in plan['nodes']], nodes))
+        # the plan was validated when it was created, thus we connect directly
+        for emit_name, emit_key, recv_name, recv_key in plan['inputs']:
+            emit_node, recv_node = nodes[emit_name], nodes[recv_name]
+            recv_node._connect(Connection(emit_node, recv_node, emit_port=emit_node.get_port_out_by_key(emit_key), recv_port=recv_node.get_port_in_by_key(recv_key)))
+        initial = nodes[plan['initial'] if initial_node is None else initial_node]
+
+        # the hints belong to the connections of this graph, thus they do not affect other graphs with the same locations
+        bridges = {b.__name__: b for b in reg.bridges.values()}
+        planned = {(emit_loc, recv_loc): name for emit_loc, recv_loc, name in plan['bridges']}
+        for node in nodes.values():
+            for con in node.input_connections:
+                locs = (con._emit_node.compute_on, con._recv_node.compute_on)
+                if planned.get(locs) in bridges:
+                    con._bridge_hint = (locs, bridges[planned[locs]])
+        return initial
+
+    @classmethod
+    def load(cls, path, plan=False, **kwargs):
+        """
+        plan: keep a plan of the loaded graph next to the file (see to_plan) and use it instead of parsing and validating the file again, as long as neither the file nor the installed packages changed
+        """
         if path.endswith('.json'):
             logger_ln.warning('Loading from json is deprecated, please use yaml instead')
             with open(path, 'r') as f:
@@ -162,11 +267,52 @@ class Serializer():
             return cls.from_dict(json_str, **kwargs)
 
         elif path.endswith('.yml'):
+            if plan:
+                return cls._load_planned(path, **kwargs)
             with open(path, 'r') as f:
-                yaml_dict = yaml.load(f, Loader=yaml.Loader)
+                yaml_dict = yaml.load(f, Loader=YAML_LOADER)
             return cls.from_compact_dict(yaml_dict, **kwargs)
 
         else:
             raise ValueError('Unkown Extension', path)
 
+    @classmethod
+    def _load_planned(cls, path, initial_node=None, ignore_connection_errors=False, **kwargs):
+        # the plan file is a json header line with the key and version, followed by the plan as json
+        # the header is checked before the plan is parsed, thus plans of other files or package versions are never read
+        with open(path, 'rb') as f:
+            content = f.read()
+        key = hashlib.sha256(content + repr(_installed_versions()).encode()).hexdigest()
+        plan_path = f'{path}.plan'
+
+        cached = None
+        try:
+            with open(plan_path, 'r') as f:
+                header = json.loads(f.readline())
+                if header.get('key') != key or header.get('version') != PLAN_VERSION:
+                    logger_ln.info(f'Plan outdated: {plan_path}')
+                else:
+                    cached = json.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as err:
+            # only a broken plan falls back to the file, errors creating the graph are raised as on any other load
+            logger_ln.warning(f'Could not read plan {plan_path}, loading {path} instead: {err}')
+            cached = None
+
+        if cached is not None:
+            logger_ln.info(f'Loading graph from plan: {plan_path}')
+            # the connections of a plan were valid when it was created, thus there are no errors to ignore
+            return cls.from_plan(cached, initial_node=initial_node, **kwargs)
+
+        initial = cls.from_compact_dict(yaml.load(content, Loader=YAML_LOADER), initial_node=initial_node, ignore_connection_errors=ignore_connection_errors, **kwargs)
+        try:
+            plan = json.dumps(initial.to_plan(), cls=NumpyEncoder)
+            with open(plan_path, 'w') as f:
+                f.write(json.dumps({'key': key, 'version': PLAN_VERSION}) + '\n')
+                f.write(plan)
+        except (OSError, TypeError, ValueError) as err:
+            logger_ln.warning(f'Could not write plan {plan_path}: {err}')
+        return initial
+
 
@@ -0,0 +1,67 @@
+import os
+
+
+def _node_cost(snapshot):
+    # total seconds spent in process, ie the cpu share of the node
+    proc = snapshot.get('process', {})
+    return proc.get('mean', 0) * proc.get('count', 0)
+
+def _edge_bytes(snapshot, channel):
+    # total bytes emitted through the channel
+    size = snapshot.get('emit_size', {}).get(channel, {})
+    return size.get('mean_bytes', 0) * size.get('count', 0)
+
+def plan_placement(nodes, perf, n_processes=None, byte_cost=1e-9, pinned=None):
+    """
+    Proposes a compute_on value for each node based on measured costs.
+
+    nodes: the nodes of the graph
+    perf: {str(node): node.perf_snapshot()}, e.g. from Graph.perf_snapshot()
+    n_processes: number of processes to distribute the nodes on, defaults to the number of cpus
+    byte_cost: estimated seconds it takes to send one byte across processes, used to weigh communication against computation
+    pinned: {str(node): compute_on} for nodes that must not be moved
+
+    Greedy: the most expensive nodes are placed first, each on the process where its cost plus the cost of sending its
+    messages to and from nodes on other processes is lowest. Thus cpu load is balanced, while heavy edges stay within one process.
+
+    returns {str(node): compute_on}
+    """
+    if n_processes is None:
+        n_processes = os.cpu_count() or 1
+    pinned = pinned or {}
+
+    cost = {str(n): _node_cost(perf.get(str(n), {})) for n in nodes}
+
+    # undirected communication cost between each pair of connected nodes
+    comm = {str(n): {} for n in nodes}
+    for node in nodes:
+        for con in node.output_connections:
+            emit, recv = str(con._emit_node), str(con._recv_node)
+            if recv not in comm:
+                continue
+            seconds = _edge_bytes(perf.get(emit, {}), con._emit_port.key) * byte_cost
+            comm[emit][recv] = comm[emit].get(recv, 0) + seconds
+            comm[recv][emit] = comm[recv].get(emit, 0) + seconds
+
+    locations = [f"{i + 1}:1" for i in range(n_processes)]
+    load = {loc: 0 for loc in locations}
+    placement = {}
+
+    for node_str, loc in pinned.items():
+        placement[node_str] = loc
+        load[loc] = load.get(loc, 0) + cost.get(node_str, 0)
+
+    # place expensive nodes first, ties are broken by name for stable results
+    for node_str in sorted(cost, key=lambda n: (-cost[n], n)):
+        if node_str in placement:
+            continue
+
+        def total_cost(loc):
+            crossing = sum([seconds for other, seconds in comm[node_str].items() if other in placement and placement[other] != loc])
+            return load[loc] + cost[node_str] + crossing
+
+        best = min(locations, key=total_cost)
+        placement[node_str] = best
+        load[best] += cost[node_str]
+
+    return placement
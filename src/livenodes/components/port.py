@@ -14,6 +14,9 @@ ALL_VALUES = [
     {},
 ]
 
+# (emit port class, recv port class): (number of emit example values, compatible), see Port.can_input_to
+_COMPATIBILITY = {}
+
 class Ports_collection():
     # this is the problem we had with NamedTuple summed up: https://peps.python.org/pep-0557/#mutable-default-values
     def __init__(self):
@@ -86,6 +89,8 @@ class Port():
                 raise Exception(f'Example value does not pass check ({str(cls)}). Msg: {msg}. Value: {val}')
             if id(val) not in ids:
                 ALL_VALUES.append(val)
+        # ports accepting any value (ie using ALL_VALUES) may now accept ports they did not before
+        _COMPATIBILITY.clear()
         return super().__init_subclass__()
 
     @classmethod
@@ -99,6 +104,7 @@ class Port():
     @classmethod
     def add_examples(cls, *args):
         cls.example_values.extend(args)
+        _COMPATIBILITY.clear()
 
     @classmethod
     def check_value(cls, value):
@@ -110,12 +116,23 @@ class Port():
 
     @classmethod
     def can_input_to(emit_port_cls, recv_port_cls):
-        # # print(list(map(cls.check_value, recv_port_cls.example_values)))
-        return emit_port_cls == recv_port_cls \
-            or any([compatible for compatible, _ in recv_port_cls.accepts_inputs(emit_port_cls.example_values)])
-            # we use any here in order to allow for dynamic converters, e.g. adding or removing axes from a package
-            # we could consider using all() instead of any(), but this would require specfic converter nodes, which i'm not sure i want to go for right now
-            # but let's keep an eye on this
+        # works with port classes as well as instances, the result only depends on the classes and is cached per pair
+        if not isinstance(recv_port_cls, type):
+            recv_port_cls = type(recv_port_cls)
+        key = (emit_port_cls, recv_port_cls)
+        # the number of example values guards against changes that bypass add_examples
+        n_examples = len(emit_port_cls.example_values)
+        cached = _COMPATIBILITY.get(key)
+        if cached is None or cached[0] != n_examples:
+            # # print(list(map(cls.check_value, recv_port_cls.example_values)))
+            compatible = emit_port_cls == recv_port_cls \
+                or any([compatible for compatible, _ in recv_port_cls.accepts_inputs(emit_port_cls.example_values)])
+                # we use any here in order to allow for dynamic converters, e.g. adding or removing axes from a package
+                # we could consider using all() instead of any(), but this would require specfic converter nodes, which i'm not sure i want to go for right now
+                # but let's keep an eye on this
+            cached = (n_examples, compatible)
+            _COMPATIBILITY[key] = cached
+        return cached[1]
 
 
 # unfortunately a stable named tuple implementation with subclassing is not possible with python 3.6
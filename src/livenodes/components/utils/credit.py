@@ -0,0 +1,154 @@
+from ..computer import mp_context
+
+# done value of closed nodes, ie nodes that will not process any further ctr
+CLOSED = 2**62
+
+
+class Credit_Window():
+    """
+    Credit based flow control between the producers of a graph and the nodes they feed.
+
+    Each producer may only emit a ctr if it is at most max_in_flight ctrs ahead of the ctrs completed by the nodes it reaches (only these, thus independent chains do not limit each other).
+    Each node reports the last ctr it is done with (processed, dropped or discarded) and the last ctr it emitted.
+    A node only holds back credit for ctrs it passed on: once it caught up with everything its parent emitted (e.g. behind a filtering node), the ctrs its parent did not emit are considered completed as well.
+    Closed nodes (e.g. finished sinks) do not hold back any credit.
+    Once out of credit, producers either pause until the nodes caught up or skip (ie drop) what they produce in the meantime, e.g. live sensors that cannot be paused.
+    Paused producers sleep on an event, which the nodes they reach set once they made progress.
+    The progress of each node is kept in shared memory, so that producers and nodes may run on any computer.
+    Must be created before the computers are started.
+    """
+    policies = ['pause', 'skip']
+
+    def __init__(self, nodes, max_in_flight=100, first_ctr=0, policy='pause', replicas=None):
+        """
+        replicas: str(node): [str(node), str(copy_1), ...] for replicated nodes (see Graph._expand_replicas), the copies are tracked as part of the node
+        """
+        if policy not in self.policies:
+            raise ValueError(f'Unknown credit policy: {policy}. Known: {self.policies}')
+        self.max_in_flight = max_in_flight
+        self.policy = policy
+
+        # str(node): [str of the node and its replicas]
+        self._members = {str(n): [str(n)] for n in nodes}
+        for key, members in (replicas or {}).items():
+            self._members[key] = list(members)
+            for member in members[1:]:
+                self._members.pop(member, None)
+        # the copies are not connected, thus the outputs of the original are used
+        self._children = {str(n): list(dict.fromkeys([str(con._recv_node) for con in n.output_connections])) for n in nodes if str(n) in self._members}
+        self._producers = [str(n) for n in nodes if str(n) in self._members and len(n.input_connections) == 0]
+
+        ctx = mp_context()
+        self._done = {m: ctx.RawValue('q', first_ctr - 1) for members in self._members.values() for m in members}
+        self._emitted = {m: ctx.RawValue('q', first_ctr - 1) for members in self._members.values() for m in members}
+        self._n_processed = {key: ctx.RawValue('q', 0) for key, children in self._children.items() if len(children) == 0}
+
+        # member: producers reaching it, ie the producers to wake once it made progress
+        self._upstream = {m: [] for members in self._members.values() for m in members}
+        for producer in self._producers:
+            for key in self._reach(producer, set()):
+                for member in self._members[key]:
+                    self._upstream[member].append(producer)
+        # set by paused producers, so that nodes only touch the events if a producer actually waits
+        self._waiting = {key: ctx.RawValue('b', 0) for key in self._producers}
+        self._wakeup = {key: ctx.Event() for key in self._producers}
+
+        # local to each process: the level up to which each producer's ctrs are known to be completed
+        self._level = {}
+
+    def _reach(self, key, seen):
+        seen.add(key)
+        for child in self._children[key]:
+            if child not in seen:
+                self._reach(child, seen)
+        return seen
+
+    def _notify(self, key):
+        for producer in self._upstream[key]:
+            if self._waiting[producer].value:
+                self._wakeup[producer].set()
+
+    # any node
+    def emitted(self, key, ctr):
+        value = self._emitted[key]
+        if ctr > value.value:
+            value.value = ctr
+
+    # any node
+    def done(self, key, ctr, processed=True):
+        value = self._done[key]
+        if ctr > value.value:
+            value.value = ctr
+        if processed and key in self._n_processed:
+            self._n_processed[key].value += 1
+        self._notify(key)
+
+    # any node
+    def closed(self, key):
+        self._done[key].value = CLOSED
+        self._notify(key)
+
+    def _done_level(self, key):
+        members = self._members[key]
+        if key in self._producers:
+            # producers are done with what they emitted
+            return self._emitted[key].value
+        if len(members) == 1:
+            return self._done[key].value
+        # replica i processes the ctrs with ctr % len(members) == i (see Bridge_round_robin), all before the next of these are done
+        n, level = len(members), CLOSED
+        for i, member in enumerate(members):
+            done = self._done[member].value
+            if done < CLOSED:
+                level = min(level, done + ((i - done - 1) % n))
+        return level
+
+    def _completed(self, key, levels):
+        # the ctr up to which all ctrs key and the nodes it feeds received are completed
+        # the done level is read before the emitted ctrs, so that emits in between only make the result more conservative
+        level = self._done_level(key)
+        emitted = max([self._emitted[m].value for m in self._members[key]])
+        levels[key] = CLOSED
+        for child in self._children[key]:
+            child_level = levels[child] if child in levels else self._completed(child, levels)
+            # the child caught up with everything key emitted, thus it does not hold back the ctrs key did not emit
+            if child_level < emitted:
+                level = min(level, child_level)
+        levels[key] = level
+        return level
+
+    # producer
+    def has_credit(self, key, ctr):
+        limit = ctr - self.max_in_flight
+        # the completed level only increases, thus we only re-compute it once it does not suffice anymore
+        if limit <= self._level.get(key, -CLOSED):
+            return True
+        self._level[key] = max(self._level.get(key, -CLOSED), self._completed(key, {}))
+        return limit <= self._level[key]
+
+    # producer
+    def wait(self, key, ctr, timeout=0.01):
+        """
+        Blocks until the producer key has credit for ctr or the timeout passed, returns has_credit.
+        The timeout only bounds missed wakeups (the flags are not synchronized) and how long a stopped producer keeps waiting.
+        """
+        if self.has_credit(key, ctr):
+            return True
+        event = self._wakeup[key]
+        event.clear()
+        self._waiting[key].value = 1
+        try:
+            # nodes may have caught up before we set the flag
+            if self.has_credit(key, ctr):
+                return True
+            event.wait(timeout)
+        finally:
+            self._waiting[key].value = 0
+        return self.has_credit(key, ctr)
+
+    # parent
+    def n_processed(self):
+        """
+        The number of ctrs the sinks processed, ie the most any sink processed
+        """
+        return max([v.value for v in self._n_processed.values()], default=0)
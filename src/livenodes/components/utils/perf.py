@@ -1,36 +1,143 @@
+import math
+import time
+import pickle
 from timeit import default_timer as timer
 import numpy as np
 
 class Abstract_Perf():
-    def __init__(self):
-        self.calls = [0]
+    """
+    Collects durations in fixed memory, so that timing can stay enabled for long running graphs.
+    The last `window` durations are kept in a ring buffer, all durations are counted in a log-bucketed histogram (`buckets_per_decade` buckets per factor of ten between `min_value` and `max_value` seconds).
+    Percentiles are estimated from the histogram and thus accurate to about one bucket width (~12% with the defaults).
+    """
+    def __init__(self, window=1000, min_value=1e-7, max_value=1e3, buckets_per_decade=20):
+        self._ring = np.zeros(window)
+        self._ring_pos = 0
+
+        self._log_min = math.log10(min_value)
+        self._buckets_per_decade = buckets_per_decade
+        n_buckets = int(round((math.log10(max_value) - self._log_min) * buckets_per_decade))
+        # upper edge of each bucket, the first bucket collects everything below min_value, the last everything above max_value
+        self._edges = np.append(np.logspace(self._log_min, math.log10(max_value), n_buckets + 1), np.inf)
+        self._hist = np.zeros(len(self._edges), dtype=np.int64)
+
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
 
     def call_fn(self, fn, *args, **kwargs):
         pass
-    
+
+    def record(self, value):
+        self._ring[self._ring_pos] = value
+        self._ring_pos = (self._ring_pos + 1) % len(self._ring)
+
+        if value <= 0:
+            bucket = 0
+        else:
+            bucket = min(max(0, math.ceil((math.log10(value) - self._log_min) * self._buckets_per_decade)), len(self._hist) - 1)
+        self._hist[bucket] += 1
+
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def calls(self):
+        """
+        The most recent durations in order of their recording
+        """
+        if self.count < len(self._ring):
+            return self._ring[:self.count].copy()
+        return np.roll(self._ring, -self._ring_pos)
+
     def average(self):
-        return np.mean(self.calls[-1000:])
+        if self.count <= 0:
+            return 0
+        return np.mean(self._ring[:min(self.count, len(self._ring))])
 
     def average_total(self):
-        return np.mean(self.calls)
+        if self.count <= 0:
+            return 0
+        return self.total / self.count
+
+    def percentile(self, q):
+        """
+        Estimate the q-th percentile (0-100) of all recorded durations
+        """
+        if self.count <= 0:
+            return 0
+        rank = math.ceil(q / 100 * self.count)
+        bucket = int(np.searchsorted(np.cumsum(self._hist), max(rank, 1)))
+        # the upper bucket edge is an upper bound, but never exceeds the largest duration seen
+        return float(min(self._edges[bucket], self.max))
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.average_total(),
+            'mean_recent': float(self.average()),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
 
 
 class Time_Per_Call(Abstract_Perf):
     def call_fn(self, fn, *args, **kwargs):
         start = timer()
         res = fn(*args, **kwargs)
-        self.calls.append(timer() - start)
+        self.record(timer() - start)
         return res
 
 
 class Time_Between_Call(Abstract_Perf):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.last_time = None
 
     def call_fn(self, fn, *args, **kwargs):
         if self.last_time is not None:
-            self.calls.append(timer() - self.last_time)
+            self.record(timer() - self.last_time)
         self.last_time = timer()
         return fn(*args, **kwargs)
-        
\ No newline at end of file
+
+
+class Latency(Abstract_Perf):
+    """
+    Time passed since a time.monotonic() origin, e.g. since a producer emitted the ctr (monotonic clocks are shared by all processes of a host)
+    """
+    def record_since(self, origin):
+        self.record(time.monotonic() - origin)
+
+
+class Message_Size():
+    """
+    Estimates the mean size in bytes of emitted data when pickled, ie sent across processes.
+    Pickling is expensive, thus only every `sample_every`-th message is measured.
+    """
+    def __init__(self, sample_every=100):
+        self.sample_every = sample_every
+        self.count = 0
+        self.n_sampled = 0
+        self.total_bytes = 0
+
+    def record(self, data):
+        if self.count % self.sample_every == 0:
+            try:
+                self.total_bytes += len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+                self.n_sampled += 1
+            except Exception:
+                # not every value can be pickled (and thus not be sent across processes anyway)
+                pass
+        self.count += 1
+
+    def mean(self):
+        if self.n_sampled <= 0:
+            return 0
+        return self.total_bytes / self.n_sampled
+
+    def snapshot(self):
+        return {'count': self.count, 'mean_bytes': self.mean()}
@@ -0,0 +1,50 @@
+import cProfile
+import pstats
+from timeit import default_timer as timer
+
+
+class Call_Profiler():
+    """
+    Profiles the calls passed through call_fn with cProfile until `calls` calls were made or `duration` seconds passed.
+    """
+    def __init__(self, calls=None, duration=None):
+        self.profile = cProfile.Profile()
+        self.calls = calls
+        self.duration = duration
+        self.n_calls = 0
+        self._start = timer()
+
+    def call_fn(self, fn, *args, **kwargs):
+        self.profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.profile.disable()
+            self.n_calls += 1
+
+    def done(self):
+        return (self.calls is not None and self.n_calls >= self.calls) \
+            or (self.duration is not None and timer() - self._start >= self.duration)
+
+    def stats(self):
+        """
+        Raw profiling data, which, opposed to pstats.Stats, can be pickled and thus be sent across processes
+        """
+        self.profile.create_stats()
+        return self.profile.stats
+
+
+class _Raw_Stats():
+    # pstats.Stats accepts any object providing create_stats() and stats
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def to_pstats(stats):
+    """
+    Convert the raw profiling data returned by Call_Profiler.stats into pstats.Stats
+    """
+    return pstats.Stats(_Raw_Stats(stats))
@@ -0,0 +1,85 @@
+import os
+import time
+import queue
+import pickle
+import threading as th
+
+
+class Traffic_Recorder():
+    """
+    Writes the (ctr, data) traffic of one output channel to an append-only log file.
+
+    Items are pickled as they are recorded, thus data changed in place after emitting is recorded as emitted.
+    They are collected into chunks of chunk_size on the processing thread, writing the chunks happens on a background writer thread.
+    The log is a sequence of pickled chunks, each a list of (ctr, time.monotonic(), pickled data), see read_traffic.
+    Thus a log stays readable up to the last complete chunk, even if the recording process is killed.
+    """
+    def __init__(self, path, chunk_size=100):
+        self.path = path
+        self.chunk_size = chunk_size
+
+        self._chunk = []
+        # created on the first write, ie inside the computer that runs the node
+        self._queue = None
+        self._writer = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_queue'] = None
+        state['_writer'] = None
+        return state
+
+    # _computer thread
+    def record(self, ctr, data):
+        self._chunk.append((ctr, time.monotonic(), pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)))
+        if len(self._chunk) >= self.chunk_size:
+            self._write_chunk()
+
+    # _computer thread
+    def close(self):
+        """
+        Writes the remaining items and blocks until everything is on disk
+        """
+        if len(self._chunk) > 0:
+            self._write_chunk()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _write_chunk(self):
+        if self._writer is None:
+            self._queue = queue.Queue()
+            self._writer = th.Thread(target=self._write, args=(self._queue,), name='Traffic_Recorder', daemon=True)
+            self._writer.start()
+        self._queue.put(self._chunk)
+        self._chunk = []
+
+    # writer thread
+    def _write(self, chunks):
+        directory = os.path.dirname(self.path)
+        if directory != '':
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    return
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+
+
+def read_traffic(path):
+    """
+    Yields the recorded (ctr, time, data) in order of their recording
+
+    A truncated last chunk, e.g. if the recording process was killed while writing, ends the log
+    """
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                return
+            for ctr, timestamp, data in chunk:
+                yield ctr, timestamp, pickle.loads(data)
@@ -0,0 +1,66 @@
+import heapq
+from timeit import default_timer as timer
+
+
+class Reorder_Buffer():
+    """
+    Holds ctrs that are ready to be processed and releases them in ascending order.
+
+    A ctr is released once it is the next expected ctr, once more than depth ctrs are held or once one of the held ctrs waited longer than timeout seconds.
+    A depth of 0 releases every ctr immediately, ie no reordering takes place.
+    """
+
+    def __init__(self, depth=0, timeout=None):
+        self.depth = depth
+        self.timeout = timeout
+
+        self._heap = []
+        self._arrival = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, ctr):
+        return ctr in self._arrival
+
+    def push(self, ctr):
+        if ctr not in self._arrival:
+            self._arrival[ctr] = timer()
+            heapq.heappush(self._heap, ctr)
+
+    def time_to_timeout(self):
+        """
+        Seconds until the longest waiting ctr times out, None if there is no timeout or nothing is held
+        """
+        if self.timeout is None or len(self._heap) <= 0:
+            return None
+        return max(0, self.timeout - (timer() - min(self._arrival.values())))
+
+    def _expired(self, now):
+        return self.timeout is not None \
+            and len(self._arrival) > 0 \
+            and now - min(self._arrival.values()) >= self.timeout
+
+    def pop_ready(self, last_ctr, flush=False):
+        """
+        Returns the ctrs that may be processed now in ascending order.
+        last_ctr is the last ctr that was processed (or None if nothing was processed yet).
+        If flush is set, all held ctrs are returned.
+        """
+        now = timer()
+        released = []
+        while len(self._heap) > 0:
+            ctr = self._heap[0]
+            # producers start counting at 0, thus if nothing was processed yet we expect the 0
+            expected = 0 if last_ctr is None else last_ctr + 1
+            if flush \
+                or ctr <= expected \
+                or len(self._heap) > self.depth \
+                or self._expired(now):
+                heapq.heappop(self._heap)
+                del self._arrival[ctr]
+                released.append(ctr)
+                last_ctr = ctr
+            else:
+                break
+        return released
@@ -1,8 +1,17 @@
+import time
+from timeit import default_timer as timer
 from collections import defaultdict
 from itertools import groupby
 from .node import Node
-from .components.computer import parse_location, Processor_threads, Processor_process
+from .producer import Producer
+from .components.computer import parse_location, join_computers, Processor_threads, Processor_process, Processor_sync
+from .components.bridges import Bridge_sync, Bridge_round_robin, Bridge_merge, Multiprocessing_Data_Storage
+from .components.connection import Connection
 from .components.node_logger import Logger
+from .components.utils.profiler import to_pstats
+from .components.utils.credit import Credit_Window
+from .components.placement import plan_placement
+from .components.bottleneck import find_bottlenecks
 import asyncio
 
 class Graph(Logger):
@@ -13,6 +22,12 @@ class Graph(Logger):
         self.nodes = Node.discover_graph(start_node)
 
         self.computers = []
+        # seconds spent in each phase of the last start_all
+        self.startup_timings = {}
+        # flow control between producers and sinks of the current run, see start_all
+        self.credit = None
+        # replicated node: [node, *copies] of the current run, see _expand_replicas
+        self._replicas = {}
 
         self.info(f'Handling {len(self.nodes)} nodes.')
 
@@ -24,13 +39,20 @@ class Graph(Logger):
     #     for node in self.nodes:
     #         settings[str(node)] == node.
 
-    def lock_all(self):
+    def lock_all(self, bridge_cls=None):
         # Lock all nodes for processing (ie no input/output or setting changes allowed from here on)
         # also resolves bridges between nodes soon to be bridges across computers
+        # bridge_cls forces one bridge type for all connections instead of the cheapest one that can handle each
         bridges = {str(n): {'emit': defaultdict(list), 'recv': {}} for n in self.nodes}
 
+        start = timer()
         for node in self.nodes:
-            send_bridges, recv_bridges = node.lock()
+            node.lock(resolve_bridges=False)
+        self.startup_timings['lock'] = timer() - start
+
+        start = timer()
+        for node in self.nodes:
+            send_bridges, recv_bridges = node.resolve_bridges(bridge_cls=bridge_cls)
 
             # one node can output/emit to multiple other nodes!
             # these connections may be unique, but at this point we don't really care about where they go, just that the output differs
@@ -41,11 +63,93 @@ class Graph(Logger):
             # TODO: change this if we at some point allow multiple inputs per channel per node
             for con, bridge in recv_bridges:
                 bridges[str(con._recv_node)]['recv'][con._recv_port.key] = bridge
+        self._resolve_replica_bridges(bridges, bridge_cls=bridge_cls)
+        self.startup_timings['bridges'] = timer() - start
 
         return bridges
 
-    def start_all(self):
+    def _expand_replicas(self):
+        """
+        Creates the copies of each node with replicas > 1, which run in their own processes until stop_all.
+        The copies are not added to the connections of their neighbours, thus the graph (and its serialization) still shows one node per replicated node.
+        """
+        self._replicas = {}
+        replicated = [n for n in self.nodes if n.replicas > 1]
+        for node in replicated:
+            if isinstance(node, Producer) or len(node.input_connections) == 0 or len(node.output_connections) == 0:
+                raise ValueError(f'Only nodes with inputs and outputs can be replicated, got: {str(node)}')
+            if any([con._emit_node.replicas > 1 for con in node.input_connections]):
+                raise ValueError(f'Replicated nodes cannot be connected directly to each other, got: {str(node)}')
+
+        for node in replicated:
+            _, process, thread = parse_location(node.compute_on)
+            copies = []
+            for i in range(1, node.replicas):
+                settings = {**node._node_settings(), 'name': f"{node.name}_r{i}", 'compute_on': f"{process}_r{i}:{thread}", 'replicas': 1}
+                copy = type(node)(should_time=node.should_time, **settings)
+                # only the copy knows about its connections, the neighbours are connected through the bridges of the original (see _resolve_replica_bridges)
+                for con in node.input_connections:
+                    copy.input_connections.append(Connection(con._emit_node, copy, con._emit_port, copy.get_port_in_by_key(con._recv_port.key)))
+                for con in node.output_connections:
+                    copy.output_connections.append(Connection(copy, con._recv_node, copy.get_port_out_by_key(con._emit_port.key), con._recv_port))
+                copies.append(copy)
+
+            self.info(f'Replicating {str(node)} as:', list(map(str, copies)))
+            self._replicas[node] = [node] + copies
+            self.nodes.extend(copies)
+
+    def _drop_replicas(self):
+        copies = [copy for replicas in self._replicas.values() for copy in replicas[1:]]
+        self.nodes = [n for n in self.nodes if n not in copies]
+        self._replicas = {}
+
+    def _resolve_replica_bridges(self, bridges, bridge_cls=None):
+        for node, replicas in self._replicas.items():
+            # the emitting node sends each ctr to one replica
+            for con in node.input_connections:
+                subs = [bridges[str(r)]['recv'][con._recv_port.key] for r in replicas]
+                emit = bridges[str(con._emit_node)]['emit'][con._emit_port.key]
+                emit[:] = [b for b in emit if b not in subs]
+                emit.append(Bridge_round_robin(subs, _from=con._emit_node.compute_on, _to=node.compute_on))
+
+            # and the receiving node gets the outputs of all replicas back in ctr order
+            for i, con in enumerate(node.output_connections):
+                subs = [bridges[str(con._recv_node)]['recv'][con._recv_port.key]]
+                for r in replicas[1:]:
+                    r_con = r.output_connections[i]
+                    bridge, _ = Multiprocessing_Data_Storage.resolve_bridge(r_con, bridge_cls=bridge_cls)
+                    bridges[str(r)]['emit'][r_con._emit_port.key].append(bridge)
+                    subs.append(bridge)
+                bridges[str(con._recv_node)]['recv'][con._recv_port.key] = Bridge_merge(subs, _from=node.compute_on, _to=con._recv_node.compute_on)
+
+    def start_all(self, ready_timeout=10, sync=False, max_in_flight=None, on_no_credit='pause'):
+        """
+        Starts all nodes on the computers given by their compute_on.
+        If sync is set, the whole graph is instead executed by a single Processor_sync, which pushes each produced item directly through the process calls of an acyclic graph.
+        This requires all nodes to share one location and their producers to implement _run.
+
+        Nodes with replicas > 1 are run as that many copies (see _expand_replicas), each in its own process and processing every replicas-th ctr.
+
+        If max_in_flight is set, producers may be at most max_in_flight ctrs ahead of the slowest node they reach (see Credit_Window), which bounds the queues and memory of graphs with slow sinks.
+        on_no_credit: 'pause' producers until the nodes caught up or 'skip' (ie drop) the items produced in the meantime.
+        """
         self.info('Starting all')
+        self.startup_timings = {}
+        if sync:
+            if max_in_flight is not None:
+                self._setup_credit(max_in_flight, policy=on_no_credit)
+            return self._start_sync(ready_timeout=ready_timeout)
+        self._expand_replicas()
+        try:
+            self._start_computers(ready_timeout, max_in_flight, on_no_credit)
+        except Exception:
+            # the copies only exist while the graph runs, thus they must not stay in the nodes of a failed start
+            self._drop_replicas()
+            raise
+
+    def _start_computers(self, ready_timeout, max_in_flight, on_no_credit):
+        if max_in_flight is not None:
+            self._setup_credit(max_in_flight, policy=on_no_credit)
         hosts, processes, threads = list(zip(*[parse_location(n.compute_on) for n in self.nodes]))
 
         # required for asyncio to work for local nodes
@@ -64,6 +168,7 @@ class Graph(Logger):
         # for host in hosts:
 
         self.info('Resolving computers')
+        start = timer()
         process_groups = groupby(sorted(zip(processes, threads, self.nodes), key=lambda t: t[0]), key=lambda t: t[0])
         for process, process_group in process_groups:
             _, process_threads, process_nodes = list(zip(*list(process_group)))
@@ -81,13 +186,48 @@ class Graph(Logger):
                     self.computers.append(cmp)
 
         self.info('Created computers:', list(map(str, self.computers)))
+        self._setup_computers(ready_timeout, start)
+
+    def _start_sync(self, ready_timeout=10):
+        locations = set([n.compute_on for n in self.nodes])
+        if len(locations) > 1:
+            raise ValueError('Synchronous execution requires all nodes to share one location, got:', locations)
+        if any([n.replicas > 1 for n in self.nodes]):
+            raise ValueError('Synchronous execution does not support replicated nodes, got:', [str(n) for n in self.nodes if n.replicas > 1])
+        # fail before locking if the graph cannot be scheduled
+        Processor_sync.topological_order(self.nodes)
+
+        self.info('Locking all nodes and resolving bridges')
+        bridges = self.lock_all(bridge_cls=Bridge_sync)
+
+        start = timer()
+        cmp = Processor_sync(nodes=self.nodes, location=self.nodes[0].compute_on, bridges=[bridges[str(n)] for n in self.nodes])
+        self.computers.append(cmp)
+        self._setup_computers(ready_timeout, start)
+
+    def _setup_computers(self, ready_timeout, start, computers=None):
+        if computers is None:
+            computers = self.computers
         self.info('Setting up computers')
-        for cmp in self.computers:
-            cmp.setup()
+        # spawn all computers first and only then wait for them, so that their imports and readying run concurrently
+        for cmp in computers:
+            cmp.spawn()
+        self.startup_timings['spawn'] = timer() - start
+
+        start = timer()
+        deadline = start + ready_timeout
+        for cmp in computers:
+            if not cmp.wait_ready(timeout=max(0, deadline - timer())):
+                self.warn(f'{str(cmp)} was not ready within {ready_timeout}s')
+        self.startup_timings['ready'] = timer() - start
 
         self.info('Starting up computers')
-        for cmp in self.computers:
+        start = timer()
+        for cmp in computers:
             cmp.start()
+        self.startup_timings['start'] = timer() - start
+
+        self.info('Startup timings (s):', ', '.join([f'{phase}: {dur:.4f}' for phase, dur in self.startup_timings.items()]))
                 
     def is_finished(self):
         # # print([(str(cmp), cmp.is_finished()) for cmp in self.computers])
@@ -100,13 +240,341 @@ class Graph(Logger):
         for cmp in self.computers:
             cmp.join(timeout)
 
+    def _setup_credit(self, max_in_flight, policy='pause'):
+        # must happen before the computers are spawned, as the window is shared via memory inherited by their processes
+        producers = [n for n in self.nodes if isinstance(n, Producer)]
+        # producers in this process keep their clock between runs
+        first_ctr = min([p._ctr for p in producers], default=0)
+        replicas = {str(node): list(map(str, copies)) for node, copies in self._replicas.items()}
+        self.credit = Credit_Window(self.nodes, max_in_flight=max_in_flight, first_ctr=first_ctr, policy=policy, replicas=replicas)
+        for node in self.nodes:
+            node._credit = self.credit
+
+    def _reset_credit(self):
+        for node in self.nodes:
+            node._credit = None
+        self.credit = None
+
+    def run_offline(self, max_in_flight=100, timeout=None, **kwargs):
+        """
+        Runs the graph as fast as possible, e.g. to reprocess recorded data, and returns once all sinks drained.
+
+        Producers are not paced, but only limited by credit based flow control: they may be at most max_in_flight ctrs ahead of the slowest node they reach (see Credit_Window).
+        Nodes are placed on computers by their compute_on as usual, thus spread them over processes to use multiple cores.
+        Producers implementing _async_onstart themselves (e.g. Producer_blocking) are not limited.
+        kwargs are passed to start_all.
+
+        returns {'samples', 'duration', 'samples_per_s'}, where samples are the ctrs processed by the sinks
+        """
+        try:
+            self.start_all(max_in_flight=max_in_flight, **kwargs)
+            credit = self.credit
+            start = timer()
+            self.join_all(timeout=timeout)
+            duration = timer() - start
+            self.stop_all()
+        finally:
+            self._reset_credit()
+
+        samples = credit.n_processed()
+        res = {'samples': samples, 'duration': duration, 'samples_per_s': samples / duration if duration > 0 else 0}
+        self.info(f"Offline run: {samples} samples in {duration:.3f}s ({res['samples_per_s']:.0f} samples/s)")
+        return res
+
+    def apply(self, config, ready_timeout=10, close_timeout=1):
+        """
+        Applies a compact config (see Serializer.to_compact_dict) to the graph, e.g. after the saved yml was edited.
+
+        If only the settings of nodes with inputs changed, only the computers running these nodes are restarted, with new instances of the changed nodes.
+        Their bridges are reused, thus all other computers (e.g. producers, sinks and heavy nodes) keep running and data sent to the restarted nodes waits in the bridges in the meantime.
+        Data the replaced nodes received, but did not process yet is lost.
+        Otherwise (nodes, connections or compute_on changed or a restarted computer would include a producer) the whole graph is stopped and started from the config.
+        See update_settings to change settings without any restart.
+
+        returns the names of the restarted computers
+        """
+        current = self.start_node.to_compact_dict(graph=True)
+        if current == config:
+            self.info('Config unchanged')
+            return []
+
+        structural = set(current['Nodes']) != set(config['Nodes']) or sorted(current['Inputs']) != sorted(config['Inputs'])
+        changed = [name for name, cfg in config['Nodes'].items() if current['Nodes'].get(name) != cfg]
+        if not structural:
+            structural = any([current['Nodes'][name].get('compute_on', '') != config['Nodes'][name].get('compute_on', '') for name in changed])
+
+        affected = [cmp for cmp in self.computers if any([str(n) in changed for n in cmp.nodes])]
+        # restarted producers would start their clock anew and restarting single nodes within a synchronous schedule is not possible
+        if len(self.computers) == 0 or structural \
+                or any([isinstance(cmp, Processor_sync) for cmp in affected]) \
+                or any([str(n) in changed for n in self._replicas]) \
+                or any([len(n.input_connections) == 0 for cmp in affected for n in cmp.nodes]):
+            return self._apply_all(config, ready_timeout=ready_timeout)
+
+        self.info('Restarting', list(map(str, affected)))
+        # closing without stopping drops the nodes without closing their bridges, thus the connected nodes keep waiting for data
+        for cmp in affected:
+            cmp.signal_close()
+        for cmp in join_computers(affected, timeout=close_timeout):
+            self.warn(f'{str(cmp)} did not close within {close_timeout}s')
+        for cmp in affected:
+            cmp.terminate()
+
+        lookup = {str(n): n for n in self.nodes}
+        replaced = {}
+        for name in changed:
+            old = lookup[name]
+            new = type(old)(should_time=old.should_time, **config['Nodes'][name])
+            self._replace_node(old, new)
+            new.lock(resolve_bridges=False)
+            replaced[old] = new
+
+        start = timer()
+        restarted = []
+        for cmp in affected:
+            # the bridges are in the same order as the nodes
+            restarted.append(type(cmp)(nodes=[replaced.get(n, n) for n in cmp.nodes], location=cmp.location, bridges=cmp.bridges))
+        self.computers = [restarted[affected.index(cmp)] if cmp in affected else cmp for cmp in self.computers]
+        self._setup_computers(ready_timeout, start, computers=restarted)
+        return list(map(str, restarted))
+
+    def _apply_all(self, config, ready_timeout=10):
+        running = len(self.computers) > 0
+        if running:
+            self.stop_all()
+
+        # keep the start node if it still exists
+        initial_node = str(self.start_node) if str(self.start_node) in config['Nodes'] else None
+        self.start_node = Node.from_compact_dict(config, initial_node=initial_node)
+        self.nodes = Node.discover_graph(self.start_node)
+
+        if running:
+            self.start_all(ready_timeout=ready_timeout)
+            return list(map(str, self.computers))
+        return []
+
+    def _replace_node(self, old, new):
+        # moves all connections of old to new, the nodes on the other end are not notified, as their bridges stay the same
+        for con in old.input_connections:
+            new_con = Connection(con._emit_node, new, emit_port=con._emit_port, recv_port=new.get_port_in_by_key(con._recv_port.key))
+            outputs = con._emit_node.output_connections
+            outputs[outputs.index(con)] = new_con
+            new.input_connections.append(new_con)
+
+        for con in old.output_connections:
+            new_con = Connection(new, con._recv_node, emit_port=new.get_port_out_by_key(con._emit_port.key), recv_port=con._recv_port)
+            inputs = con._recv_node.input_connections
+            inputs[inputs.index(con)] = new_con
+            new.output_connections.append(new_con)
+
+        old._graph_index.replace(old, new)
+        self.nodes[self.nodes.index(old)] = new
+        if self.start_node is old:
+            self.start_node = new
+
+    def _computer_of(self, node):
+        # nodes may be passed by instance, by str (ie "name [class]") or by name
+        for cmp in self.computers:
+            for n in cmp.nodes:
+                if n is node or str(n) == node or n.name == node:
+                    return cmp, str(n)
+        raise ValueError(f'Node {node} is not running on any computer')
+
+    def send_command(self, node, command, timeout=None, **kwargs):
+        """
+        Sends a command to a running node via the control channel of its computer and blocks until the node replied.
+        """
+        cmp, node_str = self._computer_of(node)
+        cmd_id = cmp.control.send(node_str, command, **kwargs)
+        return cmp.control.result(cmd_id, timeout=timeout)
+
+    def update_settings(self, node, settings, timeout=1):
+        """
+        Changes settings of a running node without restarting the graph, see Node._update_settings.
+        Raises a ValueError if the node does not know a setting.
+
+        returns the changed settings
+        """
+        self.info(f'Updating settings of {node}', list(settings.keys()))
+        _, node_str = self._computer_of(node)
+        # the replicas of a node must process their ctrs alike, thus all of them are updated (the original first)
+        members = [str(n) for original, replicas in self._replicas.items() if str(original) == node_str for n in replicas]
+
+        results = []
+        for member in members or [node_str]:
+            cmp, member_str = self._computer_of(member)
+            res = self.send_command(member_str, 'settings', timeout=timeout, **settings)
+            results.append(res)
+
+            # nodes on process computers are copies, keep the one in this process in sync, e.g. for saving
+            if isinstance(cmp, Processor_process):
+                main_node = [n for n in cmp.nodes if str(n) == member_str][0]
+                for key, val in res.items():
+                    setattr(main_node, key, val)
+        return results[0]
+
+    def profile_node(self, node, calls=None, duration=None, timeout=None):
+        """
+        Profiles the process calls of a running node with cProfile, regardless of the computer it runs on.
+        Profiling stops after `calls` process calls or `duration` seconds, whichever comes first.
+        Blocks until the profile is returned and returns it as pstats.Stats.
+        """
+        self.info(f'Profiling {node}')
+        stats = self.send_command(node, 'profile', timeout=timeout, calls=calls, duration=duration)
+        return to_pstats(stats)
+
+    def perf_snapshot(self, timeout=1):
+        """
+        Collects the perf snapshots of all running nodes, see Node.perf_snapshot
+        """
+        res = {}
+        for cmp in self.computers:
+            for node in cmp.nodes:
+                if isinstance(cmp, Processor_threads):
+                    # same process, thus we can access the counters directly
+                    res[str(node)] = node.perf_snapshot()
+                elif cmp.is_finished():
+                    self.warn(f'{str(cmp)} already finished, cannot collect perf of {str(node)}')
+                else:
+                    res[str(node)] = self.send_command(node, 'perf', timeout=timeout)
+        return res
+
+    def latency_report(self, perf=None, timeout=1):
+        """
+        Breaks down the end-to-end latency, ie the time since a producer emitted a ctr until a node processes it.
+        Latencies are only recorded by nodes with should_time set.
+        perf defaults to the perf_snapshot of the running graph.
+
+        returns {
+            'nodes': {str(node): latency snapshot (see Abstract_Perf.snapshot)},
+            'sinks': the same for nodes without outputs, ie the end-to-end latency,
+            'hops': {"emit -> recv": mean seconds added, ie processing of emit plus transfer and waiting at recv},
+            'computers': {compute_on: mean seconds added by the hops into nodes on that location}
+        }
+        """
+        if perf is None:
+            perf = self.perf_snapshot(timeout=timeout)
+        nodes = {node_str: p['latency'] for node_str, p in perf.items() if p['latency']['count'] > 0}
+
+        def mean_latency(node):
+            if len(node.input_connections) == 0:
+                # producers are the origin
+                return 0
+            return nodes[str(node)]['mean'] if str(node) in nodes else None
+
+        hops, computers = {}, {}
+        for node in self.nodes:
+            for con in node.input_connections:
+                emit, recv = mean_latency(con._emit_node), mean_latency(node)
+                if emit is None or recv is None:
+                    continue
+                hop = f"{str(con._emit_node)} -> {str(node)}"
+                if hop not in hops:
+                    hops[hop] = recv - emit
+                    computers[node.compute_on] = computers.get(node.compute_on, 0) + hops[hop]
+
+        return {
+            'nodes': nodes,
+            'sinks': {str(n): nodes[str(n)] for n in self.nodes if len(n.output_connections) == 0 and str(n) in nodes},
+            'hops': hops,
+            'computers': computers,
+        }
+
+    def bottleneck_report(self, perf=None, timeout=1, **kwargs):
+        """
+        Finds the critical path and the saturated nodes of the graph, see components.bottleneck.find_bottlenecks.
+        Process times are only recorded by nodes with should_time set.
+        perf defaults to the perf_snapshot of the running graph.
+        """
+        if perf is None:
+            perf = self.perf_snapshot(timeout=timeout)
+        return find_bottlenecks(self.nodes, perf, **kwargs)
+
+    def dot_bottlenecks(self, report=None, timeout=1, **kwargs):
+        """
+        Renders the graph annotated with the bottleneck_report: process time and utilization per node, the critical path in bold and saturated nodes in red.
+        kwargs are passed to Node.dot_graph
+        """
+        if report is None:
+            report = self.bottleneck_report(timeout=timeout)
+
+        annotations, node_attrs, edge_attrs = {}, {}, {}
+        for node_str, stats in report['nodes'].items():
+            annotations[node_str] = f"{stats['service_time'] * 1000:.2f}ms ({stats['utilization']:.0%}), backlog: {sum(stats['backlog'].values())}"
+            if stats['saturated']:
+                node_attrs[node_str] = {'style': 'rounded,filled', 'fillcolor': '#f4a09c'}
+
+        path = report['critical_path']
+        for node_str in path:
+            node_attrs.setdefault(node_str, {})['penwidth'] = '3'
+        for emit, recv in zip(path[:-1], path[1:]):
+            edge_attrs[(emit, recv)] = {'penwidth': '3'}
+
+        return self.start_node.dot_graph(self.nodes, annotations=annotations, node_attrs=node_attrs, edge_attrs=edge_attrs, **kwargs)
+
+    def plan_placement(self, n_processes=None, duration=None, **kwargs):
+        """
+        Proposes compute_on values based on measured node costs and message sizes, see components.placement.plan_placement.
+        If the graph is running its current timings are used, otherwise it is run with timing enabled for duration seconds.
+        Use apply_placement to set the proposal and Serializer.save to persist it.
+
+        returns {str(node): compute_on}
+        """
+        if len(self.computers) > 0:
+            perf = self.perf_snapshot()
+        elif duration is not None:
+            should_time = {node: node.should_time for node in self.nodes}
+            for node in self.nodes:
+                node.should_time = True
+            try:
+                self.start_all()
+                try:
+                    time.sleep(duration)
+                    perf = self.perf_snapshot()
+                finally:
+                    self.stop_all()
+            finally:
+                # the measurement must not leave timing enabled, even if it failed
+                for node, val in should_time.items():
+                    node.should_time = val
+        else:
+            raise ValueError('Graph is not running, please pass a duration to measure the nodes')
+
+        return plan_placement(self.nodes, perf, n_processes=n_processes, **kwargs)
+
+    def apply_placement(self, placement):
+        """
+        Sets compute_on for each node in placement ({str(node): compute_on}), takes effect on the next start_all
+        """
+        for node in self.nodes:
+            if str(node) in placement:
+                node.compute_on = placement[str(node)]
+
     def stop_all(self, stop_timeout=0.1, close_timeout=0.1):
+        """
+        Stops and closes all computers.
+        Every computer is signaled at once and all are joined under one deadline per phase, thus shutdown takes at most stop_timeout + close_timeout regardless of the number of computers.
+        Computers still running after the close deadline are terminated.
+
+        returns the names of the computers that did not drain in time
+        """
         self.info('Stopping computers')
         for cmp in self.computers:
-            cmp.stop(timeout=stop_timeout)
+            cmp.signal_stop()
+        join_computers(self.computers, timeout=stop_timeout)
 
         self.info('Closing computers')
         for cmp in self.computers:
-            cmp.close(timeout=close_timeout)
+            cmp.signal_close()
+        stragglers = join_computers(self.computers, timeout=close_timeout)
+        # kills the stragglers and releases the resources of all others (e.g. log drains)
+        for cmp in self.computers:
+            cmp.terminate()
 
-        self.computers = []
\ No newline at end of file
+        if len(stragglers) > 0:
+            self.warn('Computers did not drain in time:', [str(cmp) for cmp in stragglers])
+
+        self.computers = []
+        self._reset_credit()
+        self._drop_replicas()
+        return [str(cmp) for cmp in stragglers]
\ No newline at end of file
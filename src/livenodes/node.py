@@ -1,17 +1,21 @@
 import sys
+import time
 import asyncio
 from functools import partial
-import multiprocessing as mp
 import pathlib
 import traceback
 
-from .components.utils.perf import Time_Per_Call, Time_Between_Call
+from .components.utils.perf import Time_Per_Call, Time_Between_Call, Latency, Message_Size
+from .components.utils.reorder import Reorder_Buffer
+from .components.utils.profiler import Call_Profiler
+from .components.utils.recorder import Traffic_Recorder
 from .components.port import Port
 
 from .components.node_connector import Connectionist
 from .components.node_logger import Logger
 from .components.node_serializer import Serializer
 from .components.bridges import Multiprocessing_Data_Storage
+from .components.computer import mp_context
 
 INSTALL_LOC = str(pathlib.Path(__file__).parent.resolve())
 
@@ -25,11 +29,18 @@ class Node(Connectionist, Logger, Serializer):
 
     example_init = {}
 
+    # see Serializer._node_settings
+    framework_settings = {'reorder_depth': 0, 'reorder_timeout': None, 'deadline': None, 'replicas': 1}
+
     # === Basic Stuff =================
     def __init__(self,
                  name="Name",
                  should_time=False,
                  compute_on="",
+                 reorder_depth=0,
+                 reorder_timeout=None,
+                 deadline=None,
+                 replicas=1,
                  **kwargs):
 
         super().__init__(name=name, **kwargs)
@@ -42,19 +53,58 @@ class Node(Connectionist, Logger, Serializer):
         self.compute_on = compute_on
         self.bridge_listeners = []
 
-        self.locked = mp.Event()
+        self.locked = mp_context().Event()
 
         self._ctr = None
 
         self._n_stop_calls = 0
 
+        # ctrs may arrive out of order (e.g. across process bridges), hold up to reorder_depth ready ctrs for at most reorder_timeout seconds and release them in order
+        self.reorder_depth = reorder_depth
+        self.reorder_timeout = reorder_timeout
+        self._reorder = Reorder_Buffer(depth=reorder_depth, timeout=reorder_timeout)
+        self._reorder_timer = None
+        # ctrs that arrived after a later ctr was already processed
+        self._n_dropped_ctrs = 0
+
+        # seconds after the first input of a ctr arrived, after which the ctr is processed with the inputs present so far (see _should_process_partial)
+        self.deadline = deadline
+        self._deadline_timers = {}
+        # ctrs that were processed once their deadline passed, further inputs for these are discarded
+        # the latest ones only, as the missing inputs may never arrive
+        self._partial_ctrs = set()
+        self._max_partial_ctrs = 100
+        # per input key: how often it was missing once the deadline passed
+        self._deadline_misses = {}
+
+        # number of copies Graph.start_all runs this node as, each processing every replicas-th ctr in its own process
+        if replicas < 1:
+            raise ValueError(f'Node must have at least one replica, got: {replicas}')
+        self.replicas = replicas
+
+        # set while the process calls are profiled on request of the graph (see _on_command)
+        self._profiler = None
+        self._profiler_reply = None
+        self._profiler_timer = None
+
         self._perf_user_fn = Time_Per_Call()
         self._perf_framework = Time_Between_Call()
+        # per output channel
+        self._perf_emit_size = {}
+        # time from the producers emitting a ctr until it is processed here
+        self._perf_latency = Latency()
+        # monotonic timestamp of when the ctr currently processed (or for producers: emitted) was first emitted by a producer
+        self._origin = None
+        self._origin_ctr = None
 
-        if should_time:
-            self._call_user_fn_process = partial(self._perf_framework.call_fn, partial(self._perf_user_fn.call_fn, self._call_user_fn))
-        else:
-            self._call_user_fn_process = self._call_user_fn
+        # set by Graph.start_all (see max_in_flight), nodes report their progress to it and producers wait for or skip without credit
+        self._credit = None
+
+        # per output channel, see record_traffic
+        self._recorders = {}
+
+        # whether prepare ran in this process already
+        self._prepared = False
 
         # Fix this on creation such that we can still identify a node if it was pickled into another (spawned) process
         self._id_ = id(self)
@@ -69,17 +119,30 @@ class Node(Connectionist, Logger, Serializer):
     def __hash__(self) -> int:
         return id(self)
 
+    def __getstate__(self):
+        # nodes are pickled if process computers are not forked from the main process (see components/computer/worker_pool.py)
+        # the event loop and everything bound to it only exist inside the computer running the node and are recreated in ready()
+        state = self.__dict__.copy()
+        for key in ['_loop', '_finished', '_bridges_closed', 'data_storage']:
+            state.pop(key, None)
+        state['bridge_listeners'] = []
+        state['_reorder_timer'] = None
+        state['_deadline_timers'] = {}
+        state['_profiler'] = None
+        state['_profiler_reply'] = None
+        state['_profiler_timer'] = None
+        return state
+
     # === Connection Stuff =================
-    def add_input(self, emit_node: 'Node', emit_port:Port, recv_port:Port):
+    def _check_input(self, emit_node: 'Node', emit_port:Port, recv_port:Port):
         if not isinstance(emit_node, Node):
             raise ValueError("Emitting Node must be of instance Node. Got:",
                              emit_node)
 
         if not emit_port.can_input_to(recv_port):
-            self.info(recv_port.accepts_inputs(emit_port.example_values))
-            raise ValueError(f'Port {str(emit_port)} cannot input into {str(recv_port)}')
+            raise ValueError(f'Port {str(emit_port)} cannot input into {str(recv_port)}, see {recv_port.__class__.__name__}.accepts_inputs({emit_port.__class__.__name__}.example_values)')
 
-        return super().add_input(emit_node, emit_port, recv_port)
+        return super()._check_input(emit_node, emit_port, recv_port)
 
     # # === Subclass Validation Stuff =================
     def __init_subclass__(self, abstract_class=False):
@@ -111,6 +174,12 @@ class Node(Connectionist, Logger, Serializer):
 
 
 
+    # decided per call, so that timing can be enabled after creation, e.g. by Graph.plan_placement
+    def _call_user_fn_process(self, _fn, _fn_name, *args, **kwargs):
+        if self.should_time:
+            return self._perf_framework.call_fn(self._perf_user_fn.call_fn, self._call_user_fn, _fn, _fn_name, *args, **kwargs)
+        return self._call_user_fn(_fn, _fn_name, *args, **kwargs)
+
     def _call_user_fn(self, _fn, _fn_name, *args, **kwargs):
         try:
             return _fn(*args, **kwargs)
@@ -125,16 +194,21 @@ class Node(Connectionist, Logger, Serializer):
     # no further inputs, outputs or settings changes are allowed and we will resolve connections
     # TODO: actually lock those ressources
     # _main thread
-    def lock(self):
+    def lock(self, resolve_bridges=True):
         self.info('Locking')
         self.locked.set()
 
+        if resolve_bridges:
+            return self.resolve_bridges()
+
+    # _main thread
+    def resolve_bridges(self, bridge_cls=None):
         self.info('Resolving Bridges')
         send_endpoint_pairs = []
         recv_endpoint_pairs = []
 
         for con in self.input_connections:
-            send_endpoint, recv_endpoint = Multiprocessing_Data_Storage.resolve_bridge(con)
+            send_endpoint, recv_endpoint = Multiprocessing_Data_Storage.resolve_bridge(con, bridge_cls=bridge_cls)
             send_endpoint_pairs.append((con, send_endpoint))
             recv_endpoint_pairs.append((con, recv_endpoint))
 
@@ -157,8 +231,21 @@ class Node(Connectionist, Logger, Serializer):
             self.error('Forgot to lock node')
             raise Exception('Node was not locked and no inputs where set')
 
+        if not self._prepared:
+            self.info('Preparing')
+            self.prepare()
+            self._prepared = True
+
         self._loop = asyncio.get_event_loop()
         self._finished = self._loop.create_future()
+        if len(self.ports_in) > 0:
+            # the ctrs of a new run start anew, thus the last processed ctr of a previous run must not cause them to be dropped
+            # (producers keep their clock)
+            self._ctr = None
+        self._reorder = Reorder_Buffer(depth=self.reorder_depth, timeout=self.reorder_timeout)
+        self._reorder_timer = None
+        self._deadline_timers = {}
+        self._partial_ctrs = set()
         if len(self.input_connections) > 0:
             self.info('Registering _finished callback')
             self._bridges_closed = self._loop.create_task(self.data_storage.on_all_closed())
@@ -194,20 +281,39 @@ class Node(Connectionist, Logger, Serializer):
             future.cancel()
         self.bridge_listeners = [] # in case this gets called multiple times
 
+        # process everything that is still held back for reordering, as no further ctrs will arrive
+        self._release_reordered(flush=True)
+
+        for timer in self._deadline_timers.values():
+            timer.cancel()
+        self._deadline_timers = {}
+
+        # return what we profiled so far, as there will be no further process calls
+        self._stop_profiling()
+
         # close bridges telling the following nodes they will not receive input from us anymore
         for con in self.output_connections:
             self.debug('Closing', str(con))
             self.data_storage.close_bridges()
 
+        for recorder in self._recorders.values():
+            recorder.close()
+
         self._onstop()
 
     # _computer thread
     def _finish(self, task=None):
+        # task=none is needed for the done_callback
+        if task is not None and task.cancelled():
+            # the computer closed without stopping us (eg Graph.apply), thus the bridges must stay open for a replacing node
+            return
         self.info('Finishing')
-        # task=none is needed for the done_callback but not used
 
         # indicate to the node, that it now should finish wrapping up
         self.stop()
+        # nothing further will be processed, thus the node must not hold back the producers' credit
+        if self._credit is not None:
+            self._credit.closed(str(self))
 
         # also indicate to parent, that we're finished
         # the node may have been finished before thus, we need to check the future before setting a result
@@ -301,8 +407,22 @@ class Node(Connectionist, Logger, Serializer):
             val_ok, msg = self.get_port_out_by_key(channel).check_value(data)
             assert val_ok, f"Error: {msg}; On channel: {str(self)}.{channel}"
 
+        if self.should_time:
+            if channel not in self._perf_emit_size:
+                self._perf_emit_size[channel] = Message_Size()
+            self._perf_emit_size[channel].record(data)
+
+        if len(self.input_connections) == 0 and self._origin_ctr != clock:
+            # producers stamp each ctr once its first item is emitted, following nodes carry this origin along (see _process_ctr)
+            self._origin_ctr, self._origin = clock, time.monotonic()
+
         self.debug('Emitting', channel, clock, ctr)
-        self.data_storage.put(channel, clock, data)
+        self.data_storage.put(channel, clock, data, self._origin)
+        if self._credit is not None:
+            self._credit.emitted(str(self), clock)
+
+        if channel in self._recorders:
+            self._recorders[channel].record(clock, data)
 
 
     def _process(self, ctr):
@@ -311,7 +431,18 @@ class Node(Connectionist, Logger, Serializer):
         called every time something is put into the queue / we received some data (ie if there are three inputs, we expect this to be called three times, before the clock should advance)
         """
         self.debug('_Process triggered')
-        assert (self._ctr is None) or (self._ctr <= ctr), "Ctr already processed"
+
+        # the deadline of this ctr passed and it was processed without this input
+        # checked first, as later ctrs may have been processed since, but this is no dropped ctr
+        if ctr in self._partial_ctrs and ctr not in self._reorder:
+            self.debug('Discarding input arriving after the deadline', ctr)
+            self.data_storage.discard_before(ctr)
+            return
+
+        # a later ctr was already processed, we cannot go back in time, thus drop this one
+        if self._ctr is not None and ctr < self._ctr:
+            self._drop_ctr(ctr)
+            return
 
         # update current state, based on own clock
         _current_data = self.data_storage.get(ctr=ctr)
@@ -326,24 +457,159 @@ class Node(Connectionist, Logger, Serializer):
         # then cleanup aggregated data and advance our own clock
         if self._should_process(**_current_data):
             self.debug('Decided to process', ctr, _current_data.keys())
-            self._ctr = ctr
-            emit_data = self._call_user_fn_process(self.process, 'process', **_current_data, _ctr=ctr)
-            if emit_data is not None:
-                emit_ctr = None
-                if type(emit_data) == tuple:
-                    emit_data, emit_ctr = emit_data
-                for key, val in emit_data.items():
-                    self._emit_data(data=val, channel=key, ctr=emit_ctr)
-            self.debug('process fn finished')
-            self._report(node = self) # for latency and calc reasons
-            self.data_storage.discard_before(ctr)
+            self._schedule_ctr(ctr)
         else:
             self.debug('Decided not to process', ctr, _current_data.keys())
+            if self.deadline is not None and ctr not in self._deadline_timers:
+                self._deadline_timers[ctr] = self._loop.call_later(self.deadline, self._deadline_passed, ctr)
         self.debug('_Process finished')
 
+    def _schedule_ctr(self, ctr):
+        if self.reorder_depth <= 0:
+            self._process_ctr(ctr)
+        else:
+            self._reorder.push(ctr)
+            self._release_reordered()
+
+    def _process_ctr(self, ctr):
+        # re-fetch the data, as further inputs may have arrived while the ctr was held back
+        _current_data = self.data_storage.get(ctr=ctr)
+        self._ctr = ctr
+        self._origin = self.data_storage.origin(ctr)
+        if self.should_time and self._origin is not None:
+            self._perf_latency.record_since(self._origin)
+
+        for timer_ctr in [c for c in self._deadline_timers if c <= ctr]:
+            self._deadline_timers.pop(timer_ctr).cancel()
+
+        if self._profiler is None:
+            emit_data = self._call_user_fn_process(self.process, 'process', **_current_data, _ctr=ctr)
+        else:
+            emit_data = self._profiler.call_fn(self._call_user_fn_process, self.process, 'process', **_current_data, _ctr=ctr)
+            if self._profiler.done():
+                self._stop_profiling()
+
+        if emit_data is not None:
+            emit_ctr = None
+            if type(emit_data) == tuple:
+                emit_data, emit_ctr = emit_data
+            for key, val in emit_data.items():
+                self._emit_data(data=val, channel=key, ctr=emit_ctr)
+        self.debug('process fn finished')
+        self._report(node = self) # for latency and calc reasons
+        self.data_storage.discard_before(ctr)
+        if self._credit is not None:
+            self._credit.done(str(self), ctr)
+
+    def _drop_ctr(self, ctr):
+        self._n_dropped_ctrs += 1
+        self.warn(f'Dropping ctr {ctr}, as it arrived after ctr {self._ctr} was processed. Dropped so far: {self._n_dropped_ctrs}')
+        # only discards values up to and including the late ctr, which are all outdated anyway
+        self.data_storage.discard_before(ctr)
+        if self._credit is not None:
+            self._credit.done(str(self), ctr, processed=False)
+
+    # _computer thread
+    def _deadline_passed(self, ctr):
+        self._deadline_timers.pop(ctr, None)
+        if (self._ctr is not None and ctr <= self._ctr) or ctr in self._reorder:
+            # processed or about to be processed in the meantime
+            return
+
+        _current_data = self.data_storage.get(ctr=ctr)
+        if self._should_process_partial(**_current_data):
+            missing = [key for key in self.data_storage.in_bridges if key not in _current_data]
+            for key in missing:
+                self._deadline_misses[key] = self._deadline_misses.get(key, 0) + 1
+            self.debug('Deadline passed, processing without', ctr, missing)
+            self._partial_ctrs.add(ctr)
+            if len(self._partial_ctrs) > self._max_partial_ctrs:
+                self._partial_ctrs.remove(min(self._partial_ctrs))
+            self._schedule_ctr(ctr)
+
+    # _computer thread
+    def _release_reordered(self, flush=False):
+        if self._reorder_timer is not None:
+            self._reorder_timer.cancel()
+            self._reorder_timer = None
+
+        for ctr in self._reorder.pop_ready(self._ctr, flush=flush):
+            self._process_ctr(ctr)
+
+        # make sure held ctrs are released once they time out, even if no further data arrives
+        wait = self._reorder.time_to_timeout()
+        if wait is not None:
+            self._reorder_timer = self._loop.call_later(wait, self._release_reordered)
+
     # === Performance Stuff =================
-    # def timeit(self):
-    #     pass
+    def perf_snapshot(self):
+        """
+        Exportable (ie picklable and json serializable) summary of this nodes performance counters.
+        Timings, latencies and message sizes are only collected while should_time is set.
+        """
+        return {
+            'node': str(self),
+            'process': self._perf_user_fn.snapshot(),
+            'between_process': self._perf_framework.snapshot(),
+            'emit_size': {channel: size.snapshot() for channel, size in self._perf_emit_size.items()},
+            'latency': self._perf_latency.snapshot(),
+            'backlog': self.data_storage.backlog() if getattr(self, 'data_storage', None) is not None else {},
+            'dropped_ctrs': self._n_dropped_ctrs,
+            'deadline_misses': dict(self._deadline_misses),
+        }
+
+    # _computer thread
+    def _on_command(self, command, reply, **kwargs):
+        """
+        Executes a command the graph sent through the control channel of our computer.
+        reply(result) must be called exactly once, but may be called later, e.g. once enough calls are profiled.
+        """
+        if command == 'profile':
+            self._start_profiling(reply, **kwargs)
+        elif command == 'perf':
+            reply(self.perf_snapshot())
+        elif command == 'settings':
+            reply(self._update_settings(**kwargs))
+        else:
+            raise ValueError(f'Unknown command: {command}')
+
+    # _computer thread
+    def _start_profiling(self, reply, calls=None, duration=None):
+        if calls is None and duration is None:
+            raise ValueError('Profiling requires a number of calls or a duration')
+        if self._profiler is not None:
+            raise ValueError(f'{str(self)} is already being profiled')
+
+        self.info(f'Profiling process calls. Calls: {calls}, Duration: {duration}')
+        self._profiler = Call_Profiler(calls=calls, duration=duration)
+        self._profiler_reply = reply
+        if duration is not None:
+            # stop after the duration, even if process was not called in the meantime
+            self._profiler_timer = self._loop.call_later(duration, self._stop_profiling)
+
+    # _computer thread
+    def _stop_profiling(self):
+        if self._profiler is None:
+            return
+
+        if self._profiler_timer is not None:
+            self._profiler_timer.cancel()
+        self.info(f'Finished profiling after {self._profiler.n_calls} process calls')
+        self._profiler_reply(self._profiler.stats())
+
+        self._profiler = None
+        self._profiler_reply = None
+        self._profiler_timer = None
+
+    # _main thread
+    def record_traffic(self, channel, path, chunk_size=100):
+        """
+        Records everything emitted on channel into an append-only log at path, which the Replay producer can feed back into a graph.
+        Must be called before the graph is started, the log is complete once the node stopped.
+        """
+        if channel not in [p.key for p in self.ports_out]:
+            raise ValueError(f'Unknown Port {str(self)}.{channel}')
+        self._recorders[channel] = Traffic_Recorder(path, chunk_size=chunk_size)
 
     # TODO: Look at the original timing code, ideas and plots
 
@@ -361,6 +627,41 @@ class Node(Connectionist, Logger, Serializer):
         # return the finally set values (TODO: should this be explizit? or would it be better to expect that params might not by finally set as passed?)
         return kwargs
 
+    # _computer thread
+    def _update_settings(self, **kwargs):
+        """
+        Changes settings of the running node. Called via the control channel of its computer and thus between two ctrs (see Graph.update_settings).
+        Only keys of _settings may be changed, except the name, as it identifies the node across computers.
+        If _on_settings_changed fails, the previous values are restored.
+
+        returns the changed settings
+        """
+        settings = self._settings()
+        invalid = [key for key in kwargs if key not in settings or key == 'name']
+        if len(invalid) > 0:
+            raise ValueError(f'Cannot change {invalid} of {str(self)}, known settings: {[key for key in settings if key != "name"]}')
+
+        previous = {key: settings[key] for key in kwargs}
+        for key, val in kwargs.items():
+            setattr(self, key, val)
+
+        try:
+            self._on_settings_changed(previous)
+        except Exception:
+            for key, val in previous.items():
+                setattr(self, key, val)
+            raise
+
+        self.info('Changed settings', list(kwargs.keys()))
+        return {key: getattr(self, key) for key in kwargs}
+
+    def _on_settings_changed(self, previous):
+        """
+        Called once settings changed while running, previous contains the replaced values.
+        Override to reload state derived from settings, e.g. a model loaded from a path.
+        """
+        pass
+
     # === Node Specific Stuff =================
     # (Computation, Render)
     # TODO: consider changing this to follow the pickle conventions
@@ -395,6 +696,22 @@ class Node(Connectionist, Logger, Serializer):
         # then the given would move from {1} to {1, 2} and the required would have moved from {1, 2} to {2} => given >= required
         return given_keys >= required_keys
 
+    def _should_process_partial(self, **kwargs):
+        """
+        Called once the deadline of a ctr passed, but _should_process did not agree to process it yet.
+        Given the inputs that arrived so far, this determines if process should be called anyway.
+        params: **ports_in
+        returns bool
+
+        Default: all non-optional inputs must be present unless their bridge is closed, ie only missing optional inputs are tolerated.
+        """
+        given_keys = set(kwargs.keys())
+        required_keys = set([key for key, key_not_in_bridge in self._required_keys if
+            not self.get_port_in_by_key(key).optional and \
+            (key_not_in_bridge or not self.data_storage.in_bridges[key].closed_and_empty())
+        ])
+        return given_keys >= required_keys
+
     def process_time_series(self, ts):
         return ts
 
@@ -415,6 +732,13 @@ class Node(Connectionist, Logger, Serializer):
         self.ret_accu(list(map(self.process_time_series, data)), port=self.ports_out[0])
         return self.ret_accumulated()
 
+    def prepare(self):
+        """
+        executed once inside the computer running the node, before it is started for the first time (counts towards the ready_timeout of Graph.start_all)
+        heavy setup (e.g. loading models or calibration files) belongs here rather than into __init__, so that loading a graph stays fast and the work is done in the process that needs the result
+        """
+        pass
+
     def _onstart(self):
         """
         executed on start
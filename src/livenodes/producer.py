@@ -1,5 +1,4 @@
 import asyncio
-from functools import partial
 from .node import Node
 import threading as th
 from .components.utils.clock import Clock
@@ -23,6 +22,19 @@ class Producer(Node, abstract_class=True):
         self._emit_ctr_fallback = 0
 
         self._running = False
+        self._runner = None
+        self.finished_event = th.Event()
+        # items dropped while out of credit, see Credit_Window
+        self._n_skipped = 0
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['finished_event'] = None
+        state['_runner'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
         self.finished_event = th.Event()
 
     def __init_subclass__(cls, abstract_class=False):
@@ -51,26 +63,12 @@ class Producer(Node, abstract_class=True):
         # Todo: change this to just register a recursive sender task as well
 
         # create generator
-        runner = self._run()
-
-        def handle_next_data():
-            try:
-                emit_data = next(runner)
-            
-                for key, val in emit_data.items():
-                    self._emit_data(data=val, channel=key)
-                    
-                self._ctr = self._clock.tick()
-            except StopIteration:
-                return False
-            return True
-
-        # wrap in call user fn
-        fn = partial(self._call_user_fn_process, handle_next_data, "handle_next_data")
+        self._runner = self._run()
 
         # finish either if no data is present anymore or parent told us to stop (via stop() -> _onstop())
         while self._running:
-            if not fn():
+            skip = not await self._wait_for_credit()
+            if not self._produce_next(skip=skip):
                 # generator empty, thus stopping the production :-)
                 self._onstop()
 
@@ -81,6 +79,63 @@ class Producer(Node, abstract_class=True):
         self._finish()
         self.finished_event.set()
 
+    # _computer thread
+    async def _wait_for_credit(self):
+        """
+        Flow control (see Graph.start_all and Graph.run_offline): do not run further ahead of the sinks than allowed.
+        Returns False if the next item should be skipped instead of waiting for credit.
+        """
+        if self._credit is not None and self._credit.policy == 'skip':
+            return self._credit.has_credit(str(self), self._ctr)
+        if self._credit is None or self._credit.has_credit(str(self), self._ctr):
+            return True
+        # block in an executor thread, so that other nodes on this computer keep running until the nodes we feed wake us
+        loop = asyncio.get_running_loop()
+        while self._running and not await loop.run_in_executor(None, self._credit.wait, str(self), self._ctr):
+            pass
+        return True
+
+    # _computer thread
+    def _produce_next(self, skip=False):
+        """
+        Emits the next item of the _run generator, returns False once it is exhausted (or failed)
+        If skip is set the item is dropped instead
+        """
+        # wrap in call user fn
+        return self._call_user_fn_process(self._handle_next_data, "handle_next_data", skip)
+
+    def _handle_next_data(self, skip=False):
+        try:
+            emit_data = next(self._runner)
+        except StopIteration:
+            return False
+
+        if skip:
+            # the ctr is not advanced, as the sinks only return credit for ctrs they received
+            self._n_skipped += 1
+            return True
+
+        for key, val in emit_data.items():
+            self._emit_data(data=val, channel=key)
+        self._ctr = self._clock.tick()
+        return True
+
+    def perf_snapshot(self):
+        return {**super().perf_snapshot(), 'skipped': self._n_skipped}
+
+    # _computer thread
+    # used by Processor_sync instead of _onstart, which pulls from the generator itself via _produce_next
+    def _start_sync(self):
+        self._running = True
+        self._runner = self._run()
+
+    # _computer thread
+    def _finish_sync(self):
+        self._running = False
+        # set first, as otherwise _onstop would wait for it
+        self.finished_event.set()
+        self._finish()
+
     def _onstop(self):
         self._running = False
         if not self.finished_event.is_set():
@@ -40,9 +40,12 @@ class Producer_async(Producer, abstract_class=True):
             
         # finish either if no data is present anymore or parent told us to stop (via stop() -> _onstop())
         while self._running:
+            skip = not await self._wait_for_credit()
             emit_data, empty = await _anext(runner)
              
-            if empty:
+            if empty and skip:
+                self._n_skipped += 1
+            elif empty:
                 for key, val in emit_data.items():
                     self._emit_data(data=val, channel=key)
                 self._ctr = self._clock.tick()
@@ -2,6 +2,7 @@ import asyncio
 import queue
 import traceback
 from .producer import Producer
+from .components.computer import mp_context
 import threading as th
 # import multiprocessing as mp
 import aioprocessing
@@ -21,11 +22,21 @@ class Producer_Blocking(Producer, abstract_class=True):
         # both threads
         self.stop_event = th.Event()
         self.finished_event = th.Event()
-        self.msgs = aioprocessing.AioQueue()
+        self.msgs = aioprocessing.AioQueue(context=mp_context())
 
         # self.stop_event = mp.Event()
         # self.msgs = mp.Queue()
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['subprocess'] = None
+        state['stop_event'] = None
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.stop_event = th.Event()
+
     # sub_thread
     def _blocking_onstart(self):
         """
@@ -0,0 +1,68 @@
+import time
+import importlib
+from .producer import Producer, Ports_empty
+from .components.port import Ports_collection
+from .components.utils.recorder import read_traffic
+
+
+class Ports_replay(Ports_collection):
+    def __init__(self, port):
+        setattr(self, port.key, port)
+        super().__init__()
+
+
+def _port_to_dict(port):
+    return {"class": f"{port.__class__.__module__}:{port.__class__.__qualname__}", "key": port.key, "label": port.label}
+
+def _port_from_dict(dct):
+    module, qualname = dct['class'].split(':')
+    port_cls = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        port_cls = getattr(port_cls, attr)
+    return port_cls(dct['label']).contextualize(dct['key'])
+
+
+class Replay(Producer):
+    """
+    Feeds traffic recorded with Node.record_traffic back into a graph, e.g. to benchmark or regression test a subgraph against captured load.
+
+    port: the output port the traffic was recorded from (e.g. node.ports_out.data), the replay emits on a port of the same type and key
+        serialized by its class (module:name), key and label (see _port_to_dict), thus the port class must be importable where the graph is loaded
+    speed: 1 replays with the original timing, 2 twice as fast etc. None emits as fast as the graph allows
+
+    The recorded ctrs are kept, thus replays of several channels of the same recording line up in the nodes they feed.
+    """
+    # set per instance, as the port depends on the recorded channel
+    ports_out = Ports_empty()
+
+    category = "Data Source"
+    description = "Replays recorded traffic"
+
+    def __init__(self, path, port, speed=1.0, name="Replay", **kwargs):
+        if isinstance(port, dict):
+            port = _port_from_dict(port)
+        if port.key is None:
+            raise ValueError(f'Port must be part of a ports collection, got: {port}')
+        self.ports_out = Ports_replay(port)
+        super().__init__(name=name, **kwargs)
+
+        self.path = path
+        self.port = port
+        self.speed = speed
+
+    def _settings(self):
+        return {"name": self.name, "path": self.path, "port": _port_to_dict(self.port), "speed": self.speed}
+
+    def _run(self):
+        start, first = time.monotonic(), None
+        for ctr, timestamp, data in read_traffic(self.path):
+            if first is None:
+                first = timestamp
+            if self.speed is not None:
+                delay = start + (timestamp - first) / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            while self._ctr < ctr:
+                self._ctr = self._clock.tick()
+            yield self.ret(**{self.port.key: data})
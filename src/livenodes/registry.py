@@ -1,40 +1,11 @@
-from functools import partial
 from class_registry import ClassRegistry
-from class_registry.entry_points import EntryPointClassRegistry
+from importlib.metadata import entry_points
 
 import importlib, sys
 import logging
 logger = logging.getLogger('livenodes')
 
 
-## Monkey patch registry so that we can report progress
-import typing
-from importlib.metadata import entry_points
-T = typing.TypeVar("T")
-def _get_cache(self) -> dict[typing.Hashable, typing.Type[T]]:
-        """
-        Populates the cache (if necessary) and returns it.
-        """
-        if self._cache is None:
-            self._cache = {}
-            entries = entry_points(group=self.group)
-            for i, e in enumerate(entries):
-                if hasattr(self, 'report_progress'):
-                    self.report_progress(e.name, i, len(entries))
-                cls = e.load()
-
-                # Try to apply branding, but only for compatible types (i.e., functions
-                # and methods can't be branded this way).
-                if self.attr_name and isinstance(cls, type):
-                    setattr(cls, self.attr_name, e.name)
-
-                self._cache[e.name] = cls
-
-        return self._cache
-
-EntryPointClassRegistry._get_cache = _get_cache
-## End monkey patch
-
 class Register():
     def __init__(self):
         self.nodes = Entrypoint_Register(entrypoints='livenodes.nodes')
@@ -52,9 +23,8 @@ class Register():
             self.bridges.collect_installed()
             self.collected_installed = True
 
-        # TODO: check if there is a more elegant way to access the number of installed classes
-        logger.info(f'Collected installed Nodes ({len(list(self.nodes.values()))})') 
-        logger.info(f'Collected installed Bridges ({len(list(self.bridges.values()))})')
+        logger.info(f'Collected installed Nodes ({len(self.nodes)})') 
+        logger.info(f'Collected installed Bridges ({len(self.bridges)})')
     
     def installed_packages(self):
         packages = []
@@ -100,6 +70,12 @@ class Register():
 
         logger.debug('Reloading complete')
 
+    def compatible(self, emit_port):
+        """
+        All inputs of the registered nodes emit_port can be connected to, as [(node class, recv port)], e.g. to hint possible connections in a ui
+        """
+        return [(node_cls, recv_port) for node_cls in self.nodes.values() for recv_port in node_cls.ports_in if emit_port.can_input_to(recv_port)]
+
     def package_enable(self, package_name):
         raise NotImplementedError()
 
@@ -123,12 +99,35 @@ class Entrypoint_Register():
         self.reg = ClassRegistry()
         self.entrypoints = entrypoints
         self.callbacks = []
-        
+        # key: entry point of the installed classes, which are only imported once they are requested (see get_class and values)
+        self._pending = {}
+        # all keys in order of their registration (used as ordered set), such that values() does not depend on which classes were imported already
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._keys)
+
     def collect_installed(self):
-        # load all findable packages
-        self.installed_packages = EntryPointClassRegistry(self.entrypoints)
-        self.installed_packages.report_progress = partial(self.trigger_callback, 'Discovering Entrypoints')
-        self.add_register(self.installed_packages)
+        # index all findable packages by name, importing them (and their dependencies) may take long, thus we only do so on demand
+        for entry in entry_points(group=self.entrypoints):
+            key = entry.name.lower()
+            # installed classes replace the ones registered before under the same name
+            if key in self.reg.keys():
+                self.reg.unregister(key)
+            self._pending[key] = entry
+            self._keys[key] = None
+
+    def _load(self, key, i=None, total=None):
+        entry = self._pending[key]
+        self.trigger_callback('Discovering Entrypoints', entry.name, i, total)
+        try:
+            class_ = entry.load()
+        except Exception:
+            # the class is not available, thus values() must not list its key
+            self._pending.pop(key, None)
+            self._keys.pop(key, None)
+            raise
+        self.register(key, class_)
 
     def add_register(self, register):
         for key in register.keys():
@@ -140,13 +139,27 @@ class Entrypoint_Register():
 
     def register(self, key, class_):
         self.trigger_callback('Registering Class', key, None, None)
-        return self.reg.register(key.lower())(class_)
+        key = key.lower()
+        # classes registered later replace installed ones not imported yet
+        self._pending.pop(key, None)
+        self._keys[key] = None
+        return self.reg.register(key)(class_)
 
     def get(self, key, *args, **kwargs):
-        return self.reg.get(key.lower(), *args, **kwargs)
+        return self.get_class(key)(*args, **kwargs)
+
+    def get_class(self, key):
+        key = key.lower()
+        if key in self._pending:
+            self._load(key)
+        return self.reg.get_class(key)
 
     def values(self):
-        return self.reg.classes()
+        # requires all classes, thus imports all installed ones not imported yet
+        pending = list(self._pending)
+        for i, key in enumerate(pending):
+            self._load(key, i, len(pending))
+        return [self.reg.get_class(key) for key in self._keys]
     
     def trigger_callback(self, context, name, i, total):
         for fn in self.callbacks:
@@ -1,8 +1,8 @@
-import multiprocessing as mp
 import queue
 import time
 
 from .node import Node
+from .components.computer import mp_context
 from .components.utils.reportable import Reportable
 
 
@@ -16,7 +16,7 @@ class View(Node, abstract_class=True):
         # TODO: evaluate if one or two is better as maxsize (the difference should be barely noticable, but not entirely sure)
         # -> one: most up to date, but might just miss each other? probably only applicable if sensor sampling rate is vastly different from render fps?
         # -> two: always one frame behind, but might not jump then
-        self._draw_state = mp.Queue(maxsize=2)
+        self._draw_state = mp_context().Queue(maxsize=2)
 
     def register_reporter(self, reporter_fn):
         if hasattr(self, 'fps'):
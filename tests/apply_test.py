@@ -0,0 +1,103 @@
+import time
+import asyncio
+import multiprocessing as mp
+import pytest
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.components.computer import Processor_threads
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(100000):
+            yield self.ret(data=ctr)
+            time.sleep(0.001)
+
+class Scale(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def __init__(self, factor=1, name="Scale", **kwargs):
+        super().__init__(name, **kwargs)
+        self.factor = factor
+
+    def _settings(self):
+        return {"factor": self.factor}
+
+    def process(self, data, **kwargs):
+        return self.ret(data=data * self.factor)
+
+class Save(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def __init__(self, name='Save', **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+
+    def process(self, data, **kwargs):
+        self.out.put(data)
+
+
+def create_graph(compute_on, save_on="3"):
+    data = Data(name="A", compute_on="1")
+    scale = Scale(name="B", compute_on=compute_on)
+    save = Save(name="C", compute_on=save_on)
+    scale.add_input(data, emit_port=data.ports_out.data, recv_port=scale.ports_in.data)
+    save.add_input(scale, emit_port=scale.ports_out.data, recv_port=save.ports_in.data)
+    return Graph(start_node=data), save
+
+
+def received(save):
+    res = []
+    while not save.out.empty():
+        res.append(save.out.get())
+    return res
+
+
+class TestApply():
+
+    def test_unchanged(self):
+        g, _ = create_graph("2")
+        assert g.apply(g.start_node.to_compact_dict(graph=True)) == []
+
+    # the sink shares the computer of the changed node in the last two cases, thus is restarted as well
+    @pytest.mark.parametrize("compute_on,save_on", [("2", "3"), ("2:1", "3"), ("2", "2"), ("2:1", "2:1")])
+    def test_restart_changed(self, compute_on, save_on):
+        g, save = create_graph(compute_on, save_on)
+        g.start_all()
+        time.sleep(0.2)
+
+        config = g.start_node.to_compact_dict(graph=True)
+        config['Nodes']['B [Scale]']['factor'] = -1
+        untouched = [cmp for cmp in g.computers if 'B [Scale]' not in map(str, [n for n in cmp.nodes])]
+        replaced = [cmp for cmp in g.computers if cmp not in untouched]
+        restarted = g.apply(config)
+        computers = list(g.computers)
+        time.sleep(0.3)
+        g.stop_all()
+
+        assert len(restarted) == 1
+        # the tasks of the replaced nodes were cancelled before their loop was closed (process computers cannot be inspected from here)
+        for cmp in replaced:
+            if isinstance(cmp, Processor_threads):
+                assert len(asyncio.all_tasks(cmp.loop)) == 0
+        # the producer and the sink kept running
+        assert all([cmp in computers for cmp in untouched])
+        assert g.start_node.to_compact_dict(graph=True) == config
+
+        res = received(save)
+        assert res[0] >= 0 and res[-1] < 0
+        # once the new node runs, the sink only receives scaled values
+        switch = [i for i, val in enumerate(res) if val < 0][0]
+        assert all([val < 0 for val in res[switch:]])
@@ -0,0 +1,75 @@
+"""
+Measures how long building, discovering and serializing large graphs takes.
+
+Run with: python tests/bench_graph.py [n_nodes]
+"""
+import sys
+import logging
+from timeit import default_timer as timer
+
+from livenodes import Node, Producer, Graph, Ports_collection, get_registry
+from utils import Port_Ints
+
+
+registry = get_registry()
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    alternate_data: Port_Ints = Port_Ints("Alternate Data")
+
+@registry.nodes.decorator
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        yield self.ret(alternate_data=0)
+
+@registry.nodes.decorator
+class Quadratic(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, alternate_data, **kwargs):
+        return self.ret(alternate_data=alternate_data**2)
+
+
+def build(n):
+    nodes = [Data(name="A")]
+    # a binary tree, so that both long paths and wide fan outs are present
+    for i in range(1, n):
+        node = Quadratic(name=f"Q{i}")
+        parent = nodes[(i - 1) // 2]
+        node.add_input(parent, emit_port=parent.ports_out.alternate_data, recv_port=node.ports_in.alternate_data)
+        nodes.append(node)
+    return nodes[0]
+
+
+def run(n):
+    start = timer()
+    data = build(n)
+    timings = {'build': timer() - start}
+
+    start = timer()
+    g = Graph(start_node=data)
+    timings['graph'] = timer() - start
+    assert len(g.nodes) == n
+
+    start = timer()
+    cfg = data.to_compact_dict(graph=True)
+    timings['serialize'] = timer() - start
+
+    start = timer()
+    Node.from_compact_dict(cfg)
+    timings['load'] = timer() - start
+    return timings
+
+
+if __name__ == '__main__':
+    logging.getLogger('livenodes').setLevel(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    for phase, duration in run(n).items():
+        print(f'{phase:10s} {duration:8.3f}s')
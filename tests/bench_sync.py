@@ -0,0 +1,74 @@
+"""
+Compares the throughput (samples/s) of the synchronous executor against the default thread computer.
+
+Run with: python tests/bench_sync.py [n_samples]
+"""
+import sys
+import logging
+from timeit import default_timer as timer
+
+from livenodes import Node, Producer, Graph, Ports_collection, get_registry
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    alternate_data: Port_Ints = Port_Ints("Alternate Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def __init__(self, name, n=10000, **kwargs):
+        super().__init__(name, **kwargs)
+        self.n = n
+
+    def _run(self):
+        for ctr in range(self.n):
+            yield self.ret(alternate_data=ctr)
+
+class Quadratic(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, alternate_data, **kwargs):
+        return self.ret(alternate_data=alternate_data**2)
+
+class Count(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def process(self, alternate_data, **kwargs):
+        pass
+
+
+def run(n, sync):
+    data = Data(name="A", n=n)
+    last = data
+    # a chain of nodes, so that the per edge overhead dominates
+    for i in range(5):
+        node = Quadratic(name=f"Q{i}")
+        node.add_input(last, emit_port=last.ports_out.alternate_data, recv_port=node.ports_in.alternate_data)
+        last = node
+    out = Count(name="C")
+    out.add_input(last, emit_port=last.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+    g = Graph(start_node=data)
+    g.start_all(sync=sync)
+    start = timer()
+    g.join_all()
+    duration = timer() - start
+    g.stop_all()
+    return n / duration
+
+
+if __name__ == '__main__':
+    logging.getLogger('livenodes').setLevel(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    # collect the registry once, so that it is not part of the first measurement
+    get_registry()
+
+    print(f'Processor_threads: {run(n, sync=False):10.0f} samples/s')
+    print(f'Processor_sync:    {run(n, sync=True):10.0f} samples/s')
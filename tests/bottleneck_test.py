@@ -0,0 +1,99 @@
+import time
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.components.bottleneck import find_bottlenecks
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Ports_two(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+    other: Port_Ints = Port_Ints("Other")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(200):
+            yield self.ret(data=ctr)
+            time.sleep(0.001)
+
+class Slow(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, data, **kwargs):
+        time.sleep(0.005)
+        return self.ret(data=data)
+
+class Join(Node):
+    ports_in = Ports_two()
+    ports_out = Ports_none()
+
+    def process(self, data, other, **kwargs):
+        pass
+
+
+def perf(service_time, interval=1, backlog=0):
+    return {'process': {'mean': service_time, 'count': 10},
+            'between_process': {'mean': interval, 'count': 10},
+            'backlog': {'data': backlog}}
+
+
+class TestBottleneck():
+
+    def test_critical_path(self):
+        # A -> B -> D and A -> C -> D
+        a, b, c = Data(name="A"), Slow(name="B"), Slow(name="C")
+        d = Join(name="D")
+        b.add_input(a, emit_port=a.ports_out.data, recv_port=b.ports_in.data)
+        c.add_input(a, emit_port=a.ports_out.data, recv_port=c.ports_in.data)
+        d.add_input(b, emit_port=b.ports_out.data, recv_port=d.ports_in.data)
+        d.add_input(c, emit_port=c.ports_out.data, recv_port=d.ports_in.other)
+
+        nodes = [a, b, c, d]
+        report = find_bottlenecks(nodes, {str(b): perf(0.1), str(c): perf(0.3), str(d): perf(0.05)})
+        assert report['critical_path'] == [str(a), str(c), str(d)]
+        assert abs(report['critical_path_time'] - 0.35) < 1e-9
+        assert report['saturated'] == []
+
+        report = find_bottlenecks(nodes, {str(b): perf(0.1, interval=0.1), str(c): perf(0.3, backlog=20)})
+        assert sorted(report['saturated']) == sorted([str(b), str(c)])
+        assert report['nodes'][str(b)]['utilization'] == 1
+
+    def test_arrival_rate(self):
+        a, b = Data(name="A"), Slow(name="B")
+        b.add_input(a, emit_port=a.ports_out.data, recv_port=b.ports_in.data)
+
+        # B processes back to back, but A emits five times as fast
+        report = find_bottlenecks([a, b], {str(a): perf(0.001, interval=0.01), str(b): perf(0.05, interval=0.05)})
+        assert abs(report['nodes'][str(b)]['arrival_rate'] - 100) < 1e-9
+        assert abs(report['nodes'][str(b)]['utilization'] - 5) < 1e-9
+        assert report['saturated'] == [str(b)]
+
+    def test_running_graph(self):
+        data = Data(name="A", compute_on="1")
+        slow = Slow(name="B", compute_on="2", should_time=True)
+        sink = Join(name="C", compute_on="1", should_time=True)
+        slow.add_input(data, emit_port=data.ports_out.data, recv_port=slow.ports_in.data)
+        sink.add_input(slow, emit_port=slow.ports_out.data, recv_port=sink.ports_in.data)
+        sink.add_input(data, emit_port=data.ports_out.data, recv_port=sink.ports_in.other)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        time.sleep(0.3)
+        report = g.bottleneck_report()
+        dot = g.dot_bottlenecks(report=report)
+        g.stop_all()
+
+        # the producer emits faster than B processes
+        assert report['saturated'] == [str(slow)]
+        assert report['critical_path'] == [str(data), str(slow), str(sink)]
+        assert 'fillcolor' in dot.source
+        assert 'penwidth' in dot.source
@@ -0,0 +1,99 @@
+import time
+import multiprocessing as mp
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_data_meta(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+    meta: Port_Ints = Port_Ints("Meta", optional=True)
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_data_meta()
+
+    def _run(self):
+        for ctr in range(5):
+            # the meta stream is slow and only delivers every second sample
+            if ctr % 2 == 0:
+                yield self.ret(data=ctr, meta=ctr)
+            else:
+                yield self.ret(data=ctr)
+            time.sleep(0.05)
+
+class Late(Data):
+    def _run(self):
+        # two ctrs are in flight when their deadlines pass, their meta only arrives afterwards
+        yield self.ret(data=0)
+        yield self.ret(data=1)
+        time.sleep(0.2)
+        self._emit_data(0, channel='meta', ctr=0)
+        self._emit_data(1, channel='meta', ctr=1)
+
+class Save(Node):
+    ports_in = Ports_data_meta()
+    ports_out = Ports_none()
+
+    def __init__(self, name='Save', **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+
+    def process(self, data, meta=None, **kwargs):
+        self.out.put((data, meta))
+
+    def get_state(self):
+        res = []
+        while not self.out.empty():
+            res.append(self.out.get())
+        return res
+
+
+class TestDeadline():
+
+    def test_partial_processing(self):
+        data = Data(name="A", compute_on="1")
+        save = Save(name="B", compute_on="2", deadline=0.01)
+        save.add_input(data, emit_port=data.ports_out.data, recv_port=save.ports_in.data)
+        save.add_input(data, emit_port=data.ports_out.meta, recv_port=save.ports_in.meta)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        g.stop_all()
+
+        assert save.get_state() == [(0, 0), (1, None), (2, 2), (3, None), (4, 4)]
+        assert save._deadline_misses == {'meta': 2}
+
+    def test_no_deadline(self):
+        data = Data(name="A", compute_on="1")
+        save = Save(name="B", compute_on="2")
+        save.add_input(data, emit_port=data.ports_out.data, recv_port=save.ports_in.data)
+        save.add_input(data, emit_port=data.ports_out.meta, recv_port=save.ports_in.meta)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        g.stop_all()
+
+        # without a deadline the node waits for the optional input, which never arrives for the odd ctrs
+        assert save.get_state() == [(0, 0), (2, 2), (4, 4)]
+
+    def test_late_input(self):
+        data = Late(name="A", compute_on="1")
+        save = Save(name="B", compute_on="2", deadline=0.01)
+        save.add_input(data, emit_port=data.ports_out.data, recv_port=save.ports_in.data)
+        save.add_input(data, emit_port=data.ports_out.meta, recv_port=save.ports_in.meta)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        g.stop_all()
+
+        assert save.get_state() == [(0, None), (1, None)]
+        assert save._deadline_misses == {'meta': 2}
+        # the late meta of the first ctr is discarded quietly, even though the second ctr was processed since
+        assert save._n_dropped_ctrs == 0
@@ -145,6 +145,29 @@ class TestGraphOperations():
         node_a.add_input(breaker, emit_port=breaker.ports_out.data, recv_port=node_a.ports_in.data)
         breaker.add_input(node_e, emit_port=node_e.ports_out.data, recv_port=breaker.ports_in.data)
       
+    def test_circ_attributes(self, create_simple_graph):
+        node_a, node_b, node_c, node_d, node_e = create_simple_graph
+        breaker = CircBreakerNode()
+        incr = CtrIncrease()
+
+        # the circle lacks a ctr_increase node
+        with pytest.raises(ValueError):
+            breaker.add_input(node_d, emit_port=node_d.ports_out.data, recv_port=breaker.ports_in.data)
+            node_a.add_input(breaker, emit_port=breaker.ports_out.data, recv_port=node_a.ports_in.data)
+        assert not node_a.has_circles()
+
+        incr.add_input(node_e, emit_port=node_e.ports_out.data, recv_port=incr.ports_in.data)
+        breaker.add_input(incr, emit_port=incr.ports_out.data, recv_port=breaker.ports_in.delayed)
+        # the circle through incr is safe, but the one through node_d still lacks the ctr_increase
+        with pytest.raises(ValueError):
+            node_a.add_input(breaker, emit_port=breaker.ports_out.data, recv_port=node_a.ports_in.data)
+
+        breaker.remove_input(node_d, emit_port=node_d.ports_out.data, recv_port=breaker.ports_in.data)
+        node_a.add_input(breaker, emit_port=breaker.ports_out.data, recv_port=node_a.ports_in.data)
+        assert node_a.has_circles()
+        assert node_a.is_on_circle() and incr.is_on_circle()
+        assert not node_b.is_on_circle() and not node_d.is_on_circle()
+
     def test_circ_processing(self):
         prod = Data()
         breaker = CircBreakerNode()
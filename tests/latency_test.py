@@ -0,0 +1,78 @@
+import time
+import pytest
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(100):
+            yield self.ret(data=ctr)
+            time.sleep(0.005)
+
+class Slow(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, data, **kwargs):
+        time.sleep(0.003)
+        return self.ret(data=data)
+
+class Sink(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def process(self, data, **kwargs):
+        pass
+
+
+def create_graph(compute_on):
+    data = Data(name="A", compute_on="1")
+    slow = Slow(name="B", compute_on=compute_on, should_time=True)
+    sink = Sink(name="C", compute_on="1", should_time=True)
+    slow.add_input(data, emit_port=data.ports_out.data, recv_port=slow.ports_in.data)
+    sink.add_input(slow, emit_port=slow.ports_out.data, recv_port=sink.ports_in.data)
+    return Graph(start_node=data)
+
+
+class TestLatency():
+
+    @pytest.mark.parametrize("compute_on", ["2", "2:1"])
+    def test_report(self, compute_on):
+        g = create_graph(compute_on)
+        g.start_all()
+        time.sleep(0.3)
+        report = g.latency_report(timeout=10)
+        g.stop_all()
+
+        assert list(report['sinks'].keys()) == ['C [Sink]']
+        assert report['sinks']['C [Sink]']['count'] > 0
+        # the sink sees at least the processing time of the slow node
+        assert report['sinks']['C [Sink]']['mean'] >= 0.003
+        assert report['hops']['B [Slow] -> C [Sink]'] >= 0.003
+        assert set(report['hops'].keys()) == {'A [Data] -> B [Slow]', 'B [Slow] -> C [Sink]'}
+        assert set(report['computers'].keys()) == {compute_on, '1'}
+
+    def test_not_timed(self):
+        data = Data(name="A", compute_on="1")
+        sink = Sink(name="C", compute_on="1")
+        sink.add_input(data, emit_port=data.ports_out.data, recv_port=sink.ports_in.data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        report = g.latency_report()
+        g.stop_all()
+
+        assert report['sinks'] == {}
+        assert report['hops'] == {}
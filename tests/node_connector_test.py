@@ -94,6 +94,67 @@ class TestGraphOperations():
         # Now they shouldn't be related anymore
         assert not node_b.requires_input_of(node_a)
 
+    def test_graph_index(self, create_simple_graph):
+        node_a, node_b, node_c, node_d, node_e = create_simple_graph
+
+        # all nodes share one index
+        assert set(node_a.discover_graph(node_a)) == set([node_a, node_b, node_c, node_d, node_e])
+        assert node_a._graph_index is node_e._graph_index
+        assert node_a._graph_index.n_descendants(node_a) == len(node_a.discover_output_deps(node_a)) == 4
+        order = node_a._graph_index.topological_order()
+        assert order.index(node_a) < order.index(node_c) < order.index(node_d)
+
+        # removing a connection splits the graph
+        node_e.remove_input(node_c, emit_port=SimpleNode.ports_out.data, recv_port=SimpleNode.ports_in.data)
+        assert node_e.discover_graph(node_e) == [node_e]
+        assert set(node_a.discover_graph(node_a)) == set([node_a, node_b, node_c, node_d])
+        assert node_a._graph_index.n_descendants(node_a) == 3
+
+    def test_unique_names(self):
+        node_a = SimpleNode(name='A')
+        for _ in range(3):
+            node = SimpleNode(name='B')
+            node.add_input(node_a, emit_port=node_a.ports_out.data, recv_port=node.ports_in.data)
+        assert sorted([n.name for n in node_a.discover_graph(node_a)]) == ['A', 'B', 'B_1', 'B_2']
+        assert node_a.create_unique_name('B') == 'B_3'
+        assert node.is_unique_name('B_2') and not node.is_unique_name('B')
+
+        # renaming keeps the names of the graph up to date
+        node._set_attr(name='C')
+        assert node.name == 'C' and node.is_unique_name('B_2')
+        assert node_a._graph_index.names['C [SimpleNode]'] == 1
+
+    def test_add_inputs(self):
+        node_a = SimpleNode(name='A')
+        node_b = SimpleNode(name='B')
+        node_c = SimpleNode(name='C')
+        other_a = SimpleNode(name='A')
+
+        Node.add_inputs([
+            (node_a, node_a.ports_out.data, node_b, node_b.ports_in.data),
+            (node_b, node_b.ports_out.data, node_c, node_c.ports_in.data),
+            (other_a, other_a.ports_out.data, node_c, node_c.ports_in.data),
+        ])
+        assert node_c.requires_input_of(node_a) and node_c.requires_input_of(other_a)
+        assert node_a._graph_index is other_a._graph_index
+        # the node of the graph joined later is renamed
+        assert sorted([n.name for n in node_a.discover_graph(node_a)]) == ['A', 'A_1', 'B', 'C']
+
+        # invalid connections fail without adding any connection
+        node_d = SimpleNode(name='D')
+        with pytest.raises(ValueError):
+            Node.add_inputs([
+                (node_c, node_c.ports_out.data, node_d, node_d.ports_in.data),
+                (node_d, node_d.ports_out.data, node_a, node_a.ports_in.data),
+            ])
+        with pytest.raises(ValueError):
+            Node.add_inputs([
+                (node_c, node_c.ports_out.data, node_d, node_d.ports_in.data),
+                (node_a, node_a.ports_out.data, node_b, node_b.ports_in.data),
+            ])
+        assert len(node_d.input_connections) == 0
+        assert node_d.discover_graph(node_d) == [node_d]
+
     def test_incompatible_nodes(self):
         a = ComplexNode()
         b = ComplexNode()
@@ -1,5 +1,8 @@
 import pytest
 import json
+import pickle
+import time
+import threading
 
 from livenodes import get_registry, Ports_collection, Node
 from .utils import Port_Ints
@@ -16,6 +19,23 @@ class SimpleNode(Node):
     ports_out = Ports_simple()
 
 
+@registry.nodes.decorator
+class SlowNode(SimpleNode):
+    # the number of nodes in __init__ at the same time
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, name="Slow", **kwargs):
+        super().__init__(name, **kwargs)
+        with SlowNode.lock:
+            SlowNode.active += 1
+            SlowNode.max_active = max(SlowNode.active, SlowNode.max_active)
+        time.sleep(0.2)
+        with SlowNode.lock:
+            SlowNode.active -= 1
+
+
 @pytest.fixture
 def node_a():
     return SimpleNode(name="A")
@@ -119,4 +139,84 @@ class TestNodeOperations():
         assert str(graph) == "A [SimpleNode]"
         assert str(graph.output_connections[0]._recv_node) == "B [SimpleNode]"
 
-        
\ No newline at end of file
+        
+    def test_load_plan(self, create_connection, tmp_path):
+        path = str(tmp_path / 'graph')
+        create_connection.save(path)
+        dct = create_connection.to_compact_dict(graph=True)
+
+        # the first load creates the plan, the second uses it
+        graph = Node.load(f'{path}.yml', plan=True)
+        assert (tmp_path / 'graph.yml.plan').exists()
+        assert graph.to_compact_dict(graph=True) == dct
+        graph = Node.load(f'{path}.yml', plan=True)
+        assert graph.to_compact_dict(graph=True) == dct
+        assert graph.to_plan()['bridges'] == Node.to_plan(create_connection)['bridges']
+        # the plan's bridges are kept on the connections of the loaded graph only
+        assert graph.output_connections[0]._bridge_hint is not None
+        assert create_connection.output_connections[0]._bridge_hint is None
+
+        # changing the file invalidates the plan
+        node_c = SimpleNode(name="C")
+        node_c.add_input(graph, emit_port=graph.ports_out.data, recv_port=node_c.ports_in.data)
+        graph.save(path)
+        graph = Node.load(f'{path}.yml', plan=True)
+        assert len(graph.to_compact_dict(graph=True)['Nodes']) == 3
+
+    def test_load_plan_options(self, create_connection, tmp_path):
+        path = str(tmp_path / 'graph')
+        create_connection.save(path)
+
+        # the load options must not reach the nodes, whether the plan is created or used
+        for _ in range(2):
+            graph = Node.load(f'{path}.yml', plan=True, initial_node="B [SimpleNode]", ignore_connection_errors=True)
+            assert str(graph) == "B [SimpleNode]"
+
+    def test_load_plan_errors(self, create_connection, tmp_path, monkeypatch):
+        path = str(tmp_path / 'graph')
+        create_connection.save(path)
+        Node.load(f'{path}.yml', plan=True)
+
+        # a broken plan falls back to the file
+        (tmp_path / 'graph.yml.plan').write_bytes(b'broken')
+        assert str(Node.load(f'{path}.yml', plan=True)) == "A [SimpleNode]"
+
+        # errors creating the graph are not hidden by the fallback
+        def fail(cls, plan, **kwargs):
+            raise ValueError('from_plan failed')
+        monkeypatch.setattr(Node, 'from_plan', classmethod(fail))
+        with pytest.raises(ValueError, match='from_plan failed'):
+            Node.load(f'{path}.yml', plan=True)
+
+    def test_load_plan_foreign(self, create_connection, tmp_path):
+        path = str(tmp_path / 'graph')
+        create_connection.save(path)
+        marker = tmp_path / 'executed'
+
+        # a pickled plan is never unpickled
+        class Payload():
+            def __reduce__(self):
+                return (open, (str(marker), 'w'))
+        (tmp_path / 'graph.yml.plan').write_bytes(pickle.dumps({'key': None, 'payload': Payload()}))
+        assert str(Node.load(f'{path}.yml', plan=True)) == "A [SimpleNode]"
+        assert not marker.exists()
+
+        # neither is the plan of another file
+        other = SimpleNode(name="X")
+        (tmp_path / 'graph.yml.plan').write_text(json.dumps({'key': 'foreign', 'version': 2}) + '\n' + json.dumps(other.to_plan()))
+        assert str(Node.load(f'{path}.yml', plan=True)) == "A [SimpleNode]"
+        # the rejected plan was replaced by the plan of this file
+        assert str(Node.load(f'{path}.yml', plan=True)) == "A [SimpleNode]"
+
+    def test_load_workers(self):
+        nodes = [SlowNode(name=f"S{i}") for i in range(4)]
+        for emit, recv in zip(nodes[:-1], nodes[1:]):
+            recv.add_input(emit, emit_port=emit.ports_out.data, recv_port=recv.ports_in.data)
+        dct = nodes[0].to_compact_dict(graph=True)
+
+        # the registered class may differ from SlowNode, if the registry reloaded this module
+        node_cls = registry.nodes.get_class('SlowNode')
+        node_cls.max_active = 0
+        graph = Node.from_compact_dict(dct, workers=4)
+        assert node_cls.max_active > 1
+        assert graph.to_compact_dict(graph=True) == dct
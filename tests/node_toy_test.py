@@ -1,8 +1,9 @@
+import os
 import time
 import pytest
-import multiprocessing as mp
 
 from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.components.computer import mp_context
 from .utils import Port_Ints
 
 class Ports_none(Ports_collection): 
@@ -23,6 +24,24 @@ class Data(Producer):
             yield self.ret(alternate_data=ctr)
 
 
+class Endless(Data):
+    def _run(self):
+        ctr = 0
+        while True:
+            yield self.ret(alternate_data=ctr)
+            ctr += 1
+            time.sleep(0.01)
+
+
+class Blocking(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def process(self, alternate_data, **kwargs):
+        # blocks the computer, thus neither stop nor close is handled in time
+        time.sleep(10)
+
+
 class Quadratic(Node):
     ports_in = Ports_simple()
     ports_out = Ports_simple()
@@ -31,13 +50,27 @@ class Quadratic(Node):
         return self.ret(alternate_data=alternate_data**2)
 
 
+class Prepared(Quadratic):
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)
+        self.prepared_in = mp_context().SimpleQueue()
+
+    def prepare(self):
+        self.prepared_in.put(os.getpid())
+        self.offset = 1
+
+    def process(self, alternate_data, **kwargs):
+        return self.ret(alternate_data=alternate_data**2 + self.offset)
+
+
 class Save(Node):
     ports_in = Ports_simple()
     ports_out = Ports_none()
 
     def __init__(self, name, **kwargs):
         super().__init__(name, **kwargs)
-        self.out = mp.SimpleQueue()
+        # shared with process computers, thus created from their context (see start_worker_pool)
+        self.out = mp_context().SimpleQueue()
 
     def process(self, alternate_data, **kwargs):
         self.debug('re data', alternate_data)
@@ -185,6 +218,23 @@ class TestProcessing():
         assert out2.get_state() == list(map(lambda x: x**2, range(10)))
         assert g.is_finished()
 
+    def test_prepare(self):
+        data = Data(name="A", compute_on="1:2")
+        prepared = Prepared(name="B", compute_on="2:1")
+        out = Save(name="C", compute_on="1:2")
+        prepared.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=prepared.ports_in.alternate_data)
+        out.add_input(prepared, emit_port=prepared.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        g.stop_all()
+
+        assert out.get_state() == list(map(lambda x: x**2 + 1, range(10)))
+        # prepare ran once, inside the process of the node and not on creation
+        assert prepared.prepared_in.get() != os.getpid()
+        assert prepared.prepared_in.empty()
+
     def test_calc_mixed(self, create_simple_graph_mixed):
         data, quadratic, out1, out2 = create_simple_graph_mixed
 
@@ -197,3 +247,33 @@ class TestProcessing():
         assert out1.get_state() == list(range(10))
         assert out2.get_state() == list(map(lambda x: x**2, range(10)))
         assert g.is_finished()
+
+    def test_startup_timings(self, create_simple_graph_mixed):
+        data, quadratic, out1, out2 = create_simple_graph_mixed
+
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        g.stop_all()
+
+        assert list(g.startup_timings.keys()) == ['lock', 'bridges', 'spawn', 'ready', 'start']
+        assert all([dur >= 0 for dur in g.startup_timings.values()])
+
+    def test_stop_all_bounded(self):
+        data = Endless(name="A", compute_on="1:1")
+        blocking = [Blocking(name=f"B{i}", compute_on=f"{i}:1") for i in range(2, 5)]
+        for node in blocking:
+            node.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=node.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        time.sleep(0.5)
+
+        start = time.time()
+        stragglers = g.stop_all(stop_timeout=1, close_timeout=2)
+        elapsed = time.time() - start
+        # all computers share one deadline per phase instead of one per computer (which would take 12s here)
+        assert 2.9 < elapsed < 5
+        # the blocked computers are reported, the producer drained (stopping it blocks its computer for up to 2s, see Producer._onstop)
+        assert sorted(stragglers) == [f"CMP-PR:{i}" for i in range(2, 5)]
+        assert g.computers == []
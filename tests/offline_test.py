@@ -0,0 +1,183 @@
+import time
+import multiprocessing as mp
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    alternate_data: Port_Ints = Port_Ints("Alternate Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def __init__(self, name, events=None, n=20, **kwargs):
+        super().__init__(name, **kwargs)
+        self.events = events
+        self.n = n
+
+    def _run(self):
+        for ctr in range(self.n):
+            if self.events is not None:
+                self.events.put(('produced', ctr))
+            yield self.ret(alternate_data=ctr)
+
+class Quadratic(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, alternate_data, **kwargs):
+        return self.ret(alternate_data=alternate_data**2)
+
+class Gate(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, alternate_data, **kwargs):
+        # only lets the first few items pass
+        if alternate_data < 5:
+            return self.ret(alternate_data=alternate_data)
+
+class Save(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def __init__(self, name, events=None, delay=0, **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+        self.events = events
+        self.delay = delay
+
+    def process(self, alternate_data, **kwargs):
+        time.sleep(self.delay)
+        if self.events is not None:
+            self.events.put(('processed', alternate_data))
+        self.out.put(alternate_data)
+
+    def get_state(self):
+        res = []
+        while not self.out.empty():
+            res.append(self.out.get())
+        return res
+
+
+class TestOffline():
+
+    def test_drains_all_sinks(self):
+        data = Data(name="A", compute_on="1:1")
+        quadratic = Quadratic(name="B", compute_on="2:1")
+        out1 = Save(name="C", compute_on="1:1")
+        out2 = Save(name="D", compute_on="1")
+        out1.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out1.ports_in.alternate_data)
+        quadratic.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=quadratic.ports_in.alternate_data)
+        out2.add_input(quadratic, emit_port=quadratic.ports_out.alternate_data, recv_port=out2.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        res = g.run_offline(max_in_flight=4)
+
+        assert out1.get_state() == list(range(20))
+        assert out2.get_state() == list(map(lambda x: x**2, range(20)))
+        assert res['samples'] == 20
+        assert res['samples_per_s'] > 0
+        assert data._credit is None
+
+    def test_bounded_in_flight(self):
+        events = mp.SimpleQueue()
+        data = Data(name="A", events=events, compute_on="1")
+        out = Save(name="B", events=events, delay=0.005, compute_on="1")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        Graph(start_node=data).run_offline(max_in_flight=2)
+
+        in_flight, max_seen = 0, 0
+        while not events.empty():
+            kind, _ = events.get()
+            in_flight += 1 if kind == 'produced' else -1
+            max_seen = max(max_seen, in_flight)
+        assert in_flight == 0
+        assert max_seen <= 3
+
+
+class TestBackpressure():
+
+    def test_pause_bounds_in_flight(self):
+        events = mp.SimpleQueue()
+        data = Data(name="A", events=events, compute_on="1")
+        out = Save(name="B", events=events, delay=0.005, compute_on="2")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all(max_in_flight=2)
+        g.join_all()
+        g.stop_all()
+
+        in_flight, max_seen = 0, 0
+        while not events.empty():
+            kind, _ = events.get()
+            in_flight += 1 if kind == 'produced' else -1
+            max_seen = max(max_seen, in_flight)
+        assert in_flight == 0
+        assert max_seen <= 3
+        assert out.get_state() == list(range(20))
+        assert data._credit is None and g.credit is None
+
+    def test_skip_drops_while_out_of_credit(self):
+        data = Data(name="A", compute_on="1")
+        out = Save(name="B", delay=0.01, compute_on="2")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all(max_in_flight=2, on_no_credit='skip')
+        g.join_all()
+        g.stop_all()
+
+        res = out.get_state()
+        assert 0 < len(res) < 20
+        assert res == sorted(set(res))
+        assert data._n_skipped == 20 - len(res)
+        assert data.perf_snapshot()['skipped'] == data._n_skipped
+
+    def test_filtering_node(self):
+        data = Data(name="A", n=200, compute_on="1")
+        out1 = Save(name="S1", compute_on="1")
+        gate = Gate(name="G", compute_on="1")
+        out2 = Save(name="S2", compute_on="1")
+        out1.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out1.ports_in.alternate_data)
+        gate.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=gate.ports_in.alternate_data)
+        out2.add_input(gate, emit_port=gate.ports_out.alternate_data, recv_port=out2.ports_in.alternate_data)
+
+        # ctrs the gate does not emit must not hold back the producer
+        res = Graph(start_node=data).run_offline(max_in_flight=10, timeout=30)
+        assert res['samples'] == 200
+        assert out1.get_state() == list(range(200))
+        assert out2.get_state() == list(range(5))
+
+    def test_independent_producers(self):
+        data1 = Data(name="A", n=10, compute_on="1")
+        data2 = Data(name="B", n=200, compute_on="1")
+        out1 = Save(name="C", compute_on="1")
+        out2 = Save(name="D", compute_on="2")
+        out1.add_input(data1, emit_port=data1.ports_out.alternate_data, recv_port=out1.ports_in.alternate_data)
+        out2.add_input(data2, emit_port=data2.ports_out.alternate_data, recv_port=out2.ports_in.alternate_data)
+
+        g = Graph(start_node=data1)
+        g.nodes.extend([data2, out2])
+        # the shorter chain finishing must not stop the longer one
+        g.run_offline(max_in_flight=10, timeout=30)
+        assert out1.get_state() == list(range(10))
+        assert out2.get_state() == list(range(200))
+
+    def test_unknown_policy(self):
+        data = Data(name="A", compute_on="1")
+        out = Save(name="B", compute_on="1")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        try:
+            Graph(start_node=data).start_all(max_in_flight=2, on_no_credit='drop')
+            assert False
+        except ValueError:
+            pass
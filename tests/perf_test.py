@@ -0,0 +1,58 @@
+import json
+import numpy as np
+
+from livenodes.components.utils.perf import Time_Per_Call, Time_Between_Call
+
+
+class TestPerf():
+
+    def test_empty(self):
+        perf = Time_Per_Call()
+        assert perf.count == 0
+        assert perf.average() == 0
+        assert perf.average_total() == 0
+        assert perf.percentile(99) == 0
+        assert len(perf.calls) == 0
+
+    def test_ring_buffer(self):
+        perf = Time_Per_Call(window=10)
+        for i in range(25):
+            perf.record(i)
+
+        assert perf.count == 25
+        # only the last window values are kept, in order of recording
+        assert list(perf.calls) == list(range(15, 25))
+        assert perf.average() == np.mean(range(15, 25))
+        assert perf.average_total() == np.mean(range(25))
+        assert perf.max == 24
+
+    def test_percentiles(self):
+        perf = Time_Per_Call()
+        values = np.linspace(0.001, 0.1, 1000)
+        for val in values:
+            perf.record(val)
+
+        for q in [50, 95, 99]:
+            exact = np.percentile(values, q)
+            # estimated from the histogram, ie accurate to about one bucket width
+            assert exact <= perf.percentile(q) <= exact * 1.15
+        assert perf.percentile(100) == values[-1]
+
+    def test_call_fn(self):
+        per_call = Time_Per_Call()
+        between_call = Time_Between_Call()
+        for _ in range(3):
+            assert between_call.call_fn(per_call.call_fn, lambda x: x + 1, 1) == 2
+
+        assert per_call.count == 3
+        # the first call has no predecessor
+        assert between_call.count == 2
+
+    def test_snapshot(self):
+        perf = Time_Per_Call()
+        perf.record(0.5)
+        snapshot = perf.snapshot()
+        assert set(snapshot.keys()) == set(['count', 'mean', 'mean_recent', 'p50', 'p95', 'p99', 'max'])
+        assert snapshot['count'] == 1
+        assert snapshot['max'] == 0.5
+        json.dumps(snapshot)
@@ -0,0 +1,102 @@
+import time
+import multiprocessing as mp
+import pytest
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.components.placement import plan_placement
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(50):
+            yield self.ret(data=ctr)
+            time.sleep(0.001)
+
+class Slow(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, data, **kwargs):
+        time.sleep(0.002)
+        return self.ret(data=data)
+
+class Save(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def __init__(self, name='Save', **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+
+    def process(self, data, **kwargs):
+        self.out.put(data)
+
+
+def perf(cost, emit_bytes=0, count=100):
+    return {'process': {'mean': cost / count, 'count': count},
+            'emit_size': {'data': {'mean_bytes': emit_bytes / count, 'count': count}}}
+
+
+class TestPlacement():
+
+    def test_balance(self):
+        nodes = [Save(name=f"{i}") for i in range(4)]
+        placement = plan_placement(nodes, {str(n): perf(1) for n in nodes}, n_processes=2)
+        assert sorted(placement.values()) == ["1:1", "1:1", "2:1", "2:1"]
+
+    def test_heavy_edge_stays_local(self):
+        a, b, c = Slow(name="A"), Slow(name="B"), Slow(name="C")
+        b.add_input(a, emit_port=a.ports_out.data, recv_port=b.ports_in.data)
+        c.add_input(a, emit_port=a.ports_out.data, recv_port=c.ports_in.data)
+
+        stats = {str(a): perf(1, emit_bytes=1e10), str(b): perf(1), str(c): perf(1)}
+        placement = plan_placement([a, b, c], stats, n_processes=3)
+        # sending the data is more expensive than computing it in the same process
+        assert len(set(placement.values())) == 1
+
+        stats = {str(a): perf(1, emit_bytes=1), str(b): perf(1), str(c): perf(1)}
+        placement = plan_placement([a, b, c], stats, n_processes=3)
+        assert len(set(placement.values())) == 3
+
+    def test_pinned(self):
+        nodes = [Save(name=f"{i}") for i in range(3)]
+        placement = plan_placement(nodes, {str(n): perf(1) for n in nodes}, n_processes=2, pinned={str(nodes[0]): ""})
+        assert placement[str(nodes[0])] == ""
+
+    def test_graph_measure(self):
+        data = Data(name="A", compute_on="1")
+        slow = Slow(name="B", compute_on="1")
+        save = Save(name="C", compute_on="1")
+        slow.add_input(data, emit_port=data.ports_out.data, recv_port=slow.ports_in.data)
+        save.add_input(slow, emit_port=slow.ports_out.data, recv_port=save.ports_in.data)
+
+        g = Graph(start_node=data)
+        placement = g.plan_placement(n_processes=2, duration=0.5)
+        assert set(placement.keys()) == set(map(str, g.nodes))
+        assert not slow.should_time
+
+        g.apply_placement(placement)
+        assert slow.compute_on == placement[str(slow)]
+        assert data.to_compact_dict(graph=True)['Nodes'][str(slow)]['compute_on'] == placement[str(slow)]
+
+    def test_graph_measure_failed(self):
+        data = Data(name="A", compute_on="1")
+        slow = Slow(name="B", compute_on="1", replicas=2)
+        slow.add_input(data, emit_port=data.ports_out.data, recv_port=slow.ports_in.data)
+
+        # sinks cannot be replicated, thus the start fails
+        g = Graph(start_node=data)
+        with pytest.raises(ValueError):
+            g.plan_placement(n_processes=2, duration=0.5)
+        assert not slow.should_time
+        assert not data.should_time
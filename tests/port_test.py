@@ -207,6 +207,23 @@ class TestPorts():
         a = Port_List_Str()
         assert a.example_values[-1] == np.array([a.compound_type.example_values[-1]])
         assert a.example_values[-2] == [a.compound_type.example_values[-1]]
+    def test_compatibility_cached(self):
+        class Port_Float(Port):
+            example_values = [0.5]
+
+            @classmethod
+            def check_value(cls, value):
+                if not isinstance(value, float):
+                    return False, f"Should be float; got {type(value)}, val: {value}."
+                return True, None
+
+        assert Port_Int.can_input_to(Port_Int)
+        assert not Port_Float.can_input_to(Port_Int)
+        assert not Port_Float.can_input_to(Port_Int("Int"))
+        # after adding an example the result has to change
+        Port_Float.add_examples(1)
+        assert Port_Float.can_input_to(Port_Int)
+        assert Port_Any.can_input_to(Port_Float) == Port_Float.can_input_to(Port_Any)
 
 if __name__ == "__main__":
     a = Port_List_Int("")
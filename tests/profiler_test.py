@@ -0,0 +1,81 @@
+import time
+import queue
+import pytest
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.components.computer.control import Control_Channel
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(1000):
+            yield self.ret(data=ctr)
+            time.sleep(0.002)
+
+class Quadratic(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def process(self, data, **kwargs):
+        return self.ret()
+
+
+class TestProfiler():
+
+    @pytest.mark.parametrize("compute_on", ["2", "2:1"])
+    def test_profile_calls(self, compute_on):
+        data = Data(name="A", compute_on="1")
+        quadratic = Quadratic(name="B", compute_on=compute_on)
+        quadratic.add_input(data, emit_port=data.ports_out.data, recv_port=quadratic.ports_in.data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        stats = g.profile_node("B", calls=5, timeout=10)
+        g.stop_all()
+
+        process_calls = [calls for (_, _, fn), (calls, *_) in stats.stats.items() if fn == 'process']
+        assert process_calls == [5]
+
+    def test_profile_duration(self):
+        data = Data(name="A", compute_on="1")
+        quadratic = Quadratic(name="B", compute_on="2")
+        quadratic.add_input(data, emit_port=data.ports_out.data, recv_port=quadratic.ports_in.data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        stats = g.profile_node(quadratic, duration=0.2, timeout=10)
+        g.stop_all()
+
+        assert stats.total_calls > 0
+
+    def test_unknown_node(self):
+        data = Data(name="A", compute_on="1")
+        g = Graph(start_node=data)
+        g.start_all()
+        with pytest.raises(ValueError):
+            g.profile_node("B", calls=5, timeout=10)
+        g.stop_all()
+
+    def test_late_result(self):
+        control = Control_Channel(queue.Queue)
+        cmd_late = control.send("A", "profile")
+        with pytest.raises(TimeoutError):
+            control.result(cmd_late, timeout=0.01)
+
+        # the late result is dropped instead of being kept forever
+        cmd = control.send("A", "profile")
+        for cmd_id, _, _, _ in control.pending():
+            control.reply(cmd_id, cmd_id)
+        assert control.result(cmd, timeout=1) == cmd
+        assert len(control._received) == 0
+        assert len(control._abandoned) == 0
@@ -1,5 +1,8 @@
 from livenodes import get_registry
+from livenodes.registry import Register
+from importlib.metadata import entry_points
 import importlib
+import pytest
 
 DEPRECATION_MODULES = []
 
@@ -27,6 +30,51 @@ class TestProcessing:
         assert str(node_class) == "<class 'ln_io_python.in_function.In_function'>", "Update the test, some env/params changed and we have an unexpected class"
         assert type(module.np) != bool, "Now the class was reloaded, so the attribute should not be set anymore"
 
+    def test_compatible(self):
+        r = get_registry()
+        node_class = list(r.nodes.values())[0]
+        emit_port = list(node_class.ports_out)[0]
+
+        compatible = r.compatible(emit_port)
+        assert len(compatible) > 0
+        for node_cls, recv_port in compatible:
+            assert recv_port in list(node_cls.ports_in)
+            assert emit_port.can_input_to(recv_port)
+
+    def test_lazy(self):
+        r = Register()
+        r.collect_installed()
+        installed = [e.name.lower() for e in entry_points(group='livenodes.nodes')]
+        assert len(r.nodes) == len(installed)
+        # nothing is imported until requested
+        assert sorted(r.nodes._pending) == sorted(installed)
+
+        node_class = r.nodes.get_class('In_function')
+        assert str(node_class) == "<class 'ln_io_python.in_function.In_function'>"
+        assert 'in_function' not in r.nodes._pending
+
+        assert len(r.nodes.values()) == len(installed)
+        assert len(r.nodes._pending) == 0
+        assert r.nodes.values()[0] is node_class
+
+    def test_lazy_import_error(self):
+        class Broken_entry():
+            name = 'Broken'
+
+            def load(self):
+                raise ImportError('broken package')
+
+        r = Register()
+        r.collect_installed()
+        n_installed = len(r.nodes)
+        r.nodes._pending['broken'] = Broken_entry()
+        r.nodes._keys['broken'] = None
+
+        with pytest.raises(ImportError):
+            r.nodes.get_class('Broken')
+        # the broken class is dropped, all others are still available
+        assert 'broken' not in r.nodes._pending
+        assert len(r.nodes.values()) == n_installed
 
 if __name__ == "__main__":
     r = get_registry()
@@ -0,0 +1,72 @@
+import time
+
+from livenodes.components.utils.reorder import Reorder_Buffer
+from livenodes import Node, Ports_collection
+from utils import Port_Ints
+
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class SimpleNode(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+
+class TestReorder():
+
+    def test_disabled(self):
+        buffer = Reorder_Buffer(depth=0)
+        buffer.push(3)
+        assert buffer.pop_ready(last_ctr=None) == [3]
+
+    def test_in_order(self):
+        buffer = Reorder_Buffer(depth=3)
+        buffer.push(0)
+        assert buffer.pop_ready(last_ctr=None) == [0]
+        buffer.push(1)
+        assert buffer.pop_ready(last_ctr=0) == [1]
+
+    def test_out_of_order(self):
+        buffer = Reorder_Buffer(depth=3)
+        buffer.push(2)
+        buffer.push(1)
+        assert buffer.pop_ready(last_ctr=0) == [1, 2]
+
+        buffer.push(5)
+        buffer.push(4)
+        assert buffer.pop_ready(last_ctr=2) == []
+        buffer.push(3)
+        assert buffer.pop_ready(last_ctr=2) == [3, 4, 5]
+
+    def test_depth(self):
+        buffer = Reorder_Buffer(depth=2)
+        for ctr in [2, 4, 3]:
+            buffer.push(ctr)
+        # 1 never arrives, thus the depth forces the release of the smallest ctr
+        assert buffer.pop_ready(last_ctr=0) == [2, 3, 4]
+
+    def test_timeout(self):
+        buffer = Reorder_Buffer(depth=5, timeout=0.01)
+        buffer.push(2)
+        assert buffer.pop_ready(last_ctr=0) == []
+        time.sleep(0.02)
+        assert buffer.time_to_timeout() == 0
+        assert buffer.pop_ready(last_ctr=0) == [2]
+        assert buffer.time_to_timeout() is None
+
+    def test_flush(self):
+        buffer = Reorder_Buffer(depth=5)
+        buffer.push(4)
+        buffer.push(2)
+        assert buffer.pop_ready(last_ctr=0, flush=True) == [2, 4]
+        assert len(buffer) == 0
+
+    def test_settings(self):
+        node = SimpleNode(name="A")
+        assert 'reorder_depth' not in node._node_settings()
+
+        node = SimpleNode(name="A", reorder_depth=4, reorder_timeout=0.5)
+        settings = node._node_settings()
+        assert settings['reorder_depth'] == 4
+        assert settings['reorder_timeout'] == 0.5
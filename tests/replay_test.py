@@ -0,0 +1,139 @@
+import time
+import multiprocessing as mp
+import pytest
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.producer_replay import Replay
+from livenodes.components.utils.recorder import Traffic_Recorder, read_traffic
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(20):
+            yield self.ret(data=ctr)
+            time.sleep(0.005)
+
+class Even(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, data, **kwargs):
+        if data % 2 == 0:
+            return self.ret(data=data * 10)
+
+class Save(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def __init__(self, name='Save', **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+
+    def process(self, data, _ctr, **kwargs):
+        self.out.put((_ctr, data))
+
+    def get_state(self):
+        res = []
+        while not self.out.empty():
+            res.append(self.out.get())
+        return res
+
+
+def record(path, compute_on):
+    data = Data(name="A", compute_on=compute_on)
+    even = Even(name="B", compute_on=compute_on)
+    save = Save(name="C", compute_on=compute_on)
+    even.add_input(data, emit_port=data.ports_out.data, recv_port=even.ports_in.data)
+    save.add_input(even, emit_port=even.ports_out.data, recv_port=save.ports_in.data)
+    even.record_traffic('data', path, chunk_size=3)
+
+    g = Graph(start_node=data)
+    g.start_all()
+    g.join_all()
+    g.stop_all()
+    return even, save.get_state()
+
+def replay(path, port, speed):
+    rep = Replay(path, port, speed=speed, name="A")
+    save = Save(name="C")
+    save.add_input(rep, emit_port=rep.ports_out.data, recv_port=save.ports_in.data)
+
+    g = Graph(start_node=rep)
+    start = time.time()
+    g.start_all()
+    g.join_all()
+    g.stop_all()
+    return time.time() - start, save.get_state()
+
+
+class TestReplay():
+
+    @pytest.mark.parametrize("compute_on", ["1", "1:1"])
+    def test_record(self, tmp_path, compute_on):
+        path = str(tmp_path / 'even.pkl')
+        _, received = record(path, compute_on)
+
+        recorded = list(read_traffic(path))
+        assert [(ctr, data) for ctr, _, data in recorded] == received
+        assert [ctr for ctr, _, _ in recorded] == list(range(0, 20, 2))
+
+    def test_replay(self, tmp_path):
+        path = str(tmp_path / 'even.pkl')
+        even, received = record(path, "1")
+        recorded = list(read_traffic(path))
+        span = recorded[-1][1] - recorded[0][1]
+
+        duration, replayed = replay(path, even.ports_out.data, speed=0.5)
+        # the recorded ctrs and data are replayed in order
+        assert replayed == received
+        assert duration >= span / 0.5
+
+        duration_fast, replayed = replay(path, even.ports_out.data, speed=None)
+        assert replayed == received
+        assert duration_fast < duration
+
+    def test_serialize(self, tmp_path):
+        rep = Replay(str(tmp_path / 'even.pkl'), Even.ports_out.data, speed=None, name="A")
+        # the port is rebuilt from its class and key
+        rep_copy = Replay(**rep.get_settings()['settings'])
+        assert rep_copy.port == rep.port
+        assert rep_copy.port.label == rep.port.label
+        assert rep_copy.get_settings() == rep.get_settings()
+
+    def test_recorder(self, tmp_path):
+        path = str(tmp_path / 'mutated.pkl')
+        rec = Traffic_Recorder(path, chunk_size=2)
+        data = [0]
+        for ctr in range(4):
+            data[0] = ctr
+            rec.record(ctr, data)
+        rec.close()
+        # the data is recorded as emitted, even though it was changed in place afterwards
+        assert [(ctr, data) for ctr, _, data in read_traffic(path)] == [(ctr, [ctr]) for ctr in range(4)]
+
+    def test_truncated(self, tmp_path):
+        path = str(tmp_path / 'truncated.pkl')
+        rec = Traffic_Recorder(path, chunk_size=2)
+        for ctr in range(4):
+            rec.record(ctr, ctr * 10)
+        rec.close()
+
+        # a log cut off while writing is read and replayed up to its last complete chunk
+        with open(path, 'rb') as f:
+            content = f.read()
+        with open(path, 'wb') as f:
+            f.write(content[:-20])
+        assert [ctr for ctr, _, _ in read_traffic(path)] == [0, 1]
+
+        _, replayed = replay(path, Even.ports_out.data, speed=None)
+        assert replayed == [(0, 0), (1, 10)]
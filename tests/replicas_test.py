@@ -0,0 +1,144 @@
+import os
+import time
+import multiprocessing as mp
+import pytest
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from livenodes.components.computer import mp_context
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Ports_worker(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+    worker: Port_Ints = Port_Ints("Worker")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(30):
+            yield self.ret(data=ctr)
+
+class Gated(Data):
+    def __init__(self, name="Gated", **kwargs):
+        super().__init__(name, **kwargs)
+        self.go = mp_context().Event()
+
+    def _run(self):
+        self.go.wait(10)
+        yield from super()._run()
+
+class Square(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_worker()
+
+    def __init__(self, delay=0, offset=0, name="Square", **kwargs):
+        super().__init__(name, **kwargs)
+        self.delay = delay
+        self.offset = offset
+
+    def _settings(self):
+        return {"delay": self.delay, "offset": self.offset}
+
+    def process(self, data, **kwargs):
+        # uneven durations, so that the replicas finish out of order
+        time.sleep(self.delay * (data % 3))
+        return self.ret(data=data**2 + self.offset, worker=os.getpid())
+
+class Save(Node):
+    ports_in = Ports_worker()
+    ports_out = Ports_none()
+
+    def __init__(self, name='Save', **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+
+    def process(self, data, worker, **kwargs):
+        self.out.put((data, worker))
+
+    def get_state(self):
+        res = []
+        while not self.out.empty():
+            res.append(self.out.get())
+        return res
+
+
+def create_graph(replicas=3, delay=0.005):
+    data = Data(name="A", compute_on="1:1")
+    square = Square(name="B", delay=delay, replicas=replicas, compute_on="2:1")
+    save = Save(name="C", compute_on="1:1")
+    square.add_input(data, emit_port=data.ports_out.data, recv_port=square.ports_in.data)
+    save.add_input(square, emit_port=square.ports_out.data, recv_port=save.ports_in.data)
+    save.add_input(square, emit_port=square.ports_out.worker, recv_port=save.ports_in.worker)
+    return Graph(start_node=data), data, square, save
+
+
+class TestReplicas():
+
+    def test_merged_in_order(self):
+        g, data, square, save = create_graph()
+        g.start_all()
+        assert len(g.nodes) == 5
+        g.join_all()
+        g.stop_all()
+
+        res = save.get_state()
+        assert [d for d, _ in res] == [x**2 for x in range(30)]
+        # every replica ran in its own process
+        assert len(set([w for _, w in res])) == 3
+        assert len(g.nodes) == 3
+
+    def test_serialized_as_one_node(self):
+        g, data, square, save = create_graph()
+        cfg = data.to_compact_dict(graph=True)
+        assert sorted(cfg['Nodes'].keys()) == ['A [Data]', 'B [Square]', 'C [Save]']
+        assert cfg['Nodes']['B [Square]']['replicas'] == 3
+
+        g.start_all()
+        assert data.to_compact_dict(graph=True) == cfg
+        g.join_all()
+        g.stop_all()
+
+    def test_invalid(self):
+        g, data, square, save = create_graph()
+        save.replicas = 2
+        with pytest.raises(ValueError):
+            g.start_all()
+        assert len(g.nodes) == 3
+
+        with pytest.raises(ValueError):
+            Square(name="D", replicas=0)
+
+    def test_failed_start(self):
+        g, data, square, save = create_graph()
+        # fails after the copies were created
+        with pytest.raises(ValueError):
+            g.start_all(max_in_flight=10, on_no_credit='unknown')
+        assert len(g.nodes) == 3
+        assert g._replicas == {}
+
+    def test_update_settings(self):
+        data = Gated(name="A", compute_on="1:1")
+        square = Square(name="B", replicas=3, compute_on="2:1")
+        save = Save(name="C", compute_on="1:1")
+        square.add_input(data, emit_port=data.ports_out.data, recv_port=square.ports_in.data)
+        save.add_input(square, emit_port=square.ports_out.data, recv_port=save.ports_in.data)
+        save.add_input(square, emit_port=square.ports_out.worker, recv_port=save.ports_in.worker)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        assert g.update_settings(square, {'offset': 1000}, timeout=10) == {'offset': 1000}
+        data.go.set()
+        g.join_all()
+        g.stop_all()
+
+        # every replica uses the new setting, not only the original
+        assert [d for d, _ in save.get_state()] == [x**2 + 1000 for x in range(30)]
+        assert square.offset == 1000
@@ -0,0 +1,94 @@
+import time
+import pytest
+import multiprocessing as mp
+
+from livenodes import Node, Producer, Graph, Ports_collection
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    data: Port_Ints = Port_Ints("Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(1000):
+            yield self.ret(data=1)
+            time.sleep(0.002)
+
+class Scale(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def __init__(self, name, factor=1, **kwargs):
+        super().__init__(name, **kwargs)
+        self.factor = factor
+        self.out = mp.SimpleQueue()
+        self.reloads = 0
+
+    def _settings(self):
+        return {"name": self.name, "factor": self.factor}
+
+    def _on_settings_changed(self, previous):
+        if self.factor < 0:
+            raise ValueError('Factor must be positive')
+        self.reloads += 1
+        self.out.put(('reloads', self.reloads))
+
+    def process(self, data, **kwargs):
+        self.out.put(('data', data * self.factor))
+
+    def get_state(self):
+        res = []
+        while not self.out.empty():
+            res.append(self.out.get())
+        return res
+
+
+class TestSettings():
+
+    @pytest.mark.parametrize("compute_on", ["2", "2:1"])
+    def test_update(self, compute_on):
+        data = Data(name="A", compute_on="1")
+        scale = Scale(name="B", compute_on=compute_on)
+        scale.add_input(data, emit_port=data.ports_out.data, recv_port=scale.ports_in.data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        time.sleep(0.1)
+        assert g.update_settings("B", {"factor": 3}, timeout=10) == {"factor": 3}
+        time.sleep(0.1)
+        g.stop_all()
+
+        state = scale.get_state()
+        values = [val for kind, val in state if kind == 'data']
+        # the change is applied between two ctrs, thus values switch once and are never mixed afterwards
+        switch = values.index(3)
+        assert set(values[:switch]) == {1} and set(values[switch:]) == {3}
+        assert ('reloads', 1) in state
+        # the node in the main process reflects the change as well, e.g. for saving
+        assert scale.factor == 3
+
+    def test_invalid(self):
+        data = Data(name="A", compute_on="1")
+        scale = Scale(name="B", compute_on="2:1")
+        scale.add_input(data, emit_port=data.ports_out.data, recv_port=scale.ports_in.data)
+
+        g = Graph(start_node=data)
+        g.start_all()
+        with pytest.raises(ValueError):
+            g.update_settings("B", {"unknown": 3}, timeout=10)
+        with pytest.raises(ValueError):
+            g.update_settings("B", {"name": "C"}, timeout=10)
+        # failing hooks restore the previous value
+        with pytest.raises(ValueError):
+            g.update_settings("B", {"factor": -1}, timeout=10)
+        g.stop_all()
+
+        assert scale.factor == 1
+        assert all([val == 1 for kind, val in scale.get_state() if kind == 'data'])
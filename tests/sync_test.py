@@ -0,0 +1,135 @@
+import time
+import pytest
+import multiprocessing as mp
+
+from livenodes import Node, Producer, Producer_async, Graph, Ports_collection
+from utils import Port_Ints
+
+
+class Ports_none(Ports_collection):
+    pass
+
+class Ports_simple(Ports_collection):
+    alternate_data: Port_Ints = Port_Ints("Alternate Data")
+
+class Ports_two(Ports_collection):
+    alternate_data: Port_Ints = Port_Ints("Alternate Data")
+    other_data: Port_Ints = Port_Ints("Other Data")
+
+class Data(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        for ctr in range(10):
+            yield self.ret(alternate_data=ctr)
+
+class Data_endless(Producer):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    def _run(self):
+        while True:
+            yield self.ret(alternate_data=0)
+
+class Data_async(Producer_async):
+    ports_in = Ports_none()
+    ports_out = Ports_simple()
+
+    async def _async_run(self):
+        for ctr in range(10):
+            yield self.ret(alternate_data=ctr)
+
+class Quadratic(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_simple()
+
+    def process(self, alternate_data, **kwargs):
+        return self.ret(alternate_data=alternate_data**2)
+
+class Add(Node):
+    ports_in = Ports_two()
+    ports_out = Ports_simple()
+
+    def process(self, alternate_data, other_data, **kwargs):
+        return self.ret(alternate_data=alternate_data + other_data)
+
+class Save(Node):
+    ports_in = Ports_simple()
+    ports_out = Ports_none()
+
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)
+        self.out = mp.SimpleQueue()
+
+    def process(self, alternate_data, **kwargs):
+        self.out.put(alternate_data)
+
+    def get_state(self):
+        res = []
+        while not self.out.empty():
+            res.append(self.out.get())
+        return res
+
+
+class TestSync():
+
+    def test_calc(self):
+        data = Data(name="A")
+        quadratic = Quadratic(name="B")
+        out = Save(name="C")
+        quadratic.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=quadratic.ports_in.alternate_data)
+        out.add_input(quadratic, emit_port=quadratic.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all(sync=True)
+        g.join_all()
+        g.stop_all()
+
+        assert out.get_state() == list(map(lambda x: x**2, range(10)))
+        assert g.is_finished()
+
+    def test_two_inputs(self):
+        # the schedule must process the quadratic before the addition, which waits for both inputs of each ctr
+        data = Data(name="A")
+        quadratic = Quadratic(name="B")
+        add = Add(name="C")
+        out = Save(name="D")
+        add.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=add.ports_in.other_data)
+        quadratic.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=quadratic.ports_in.alternate_data)
+        add.add_input(quadratic, emit_port=quadratic.ports_out.alternate_data, recv_port=add.ports_in.alternate_data)
+        out.add_input(add, emit_port=add.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all(sync=True)
+        g.join_all()
+        g.stop_all()
+
+        assert out.get_state() == [x**2 + x for x in range(10)]
+
+    def test_stop_endless(self):
+        data = Data_endless(name="A")
+        out = Save(name="B")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        g = Graph(start_node=data)
+        g.start_all(sync=True)
+        time.sleep(0.1)
+        assert g.stop_all(stop_timeout=1, close_timeout=1) == []
+        assert len(out.get_state()) > 0
+
+    def test_requires_single_location(self):
+        data = Data(name="A", compute_on="1")
+        out = Save(name="B", compute_on="2")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        with pytest.raises(ValueError):
+            Graph(start_node=data).start_all(sync=True)
+
+    def test_requires_run(self):
+        data = Data_async(name="A")
+        out = Save(name="B")
+        out.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+        with pytest.raises(ValueError):
+            Graph(start_node=data).start_all(sync=True)
@@ -0,0 +1,51 @@
+import os
+import sys
+import pickle
+import subprocess
+
+# the pool and its context are global, thus the pool is tested in a fresh interpreter to not affect the other tests
+SCRIPT = """
+import multiprocessing as mp
+from livenodes.components.computer import start_worker_pool
+from livenodes import Graph
+from tests.node_toy_test import Data, Quadratic, Save
+
+if __name__ == '__main__':
+    before = mp.get_start_method()
+    start_worker_pool()
+    # only the computers use the forkserver
+    assert mp.get_start_method() == before
+
+    data = Data(name="A", compute_on="1:1")
+    quadratic = Quadratic(name="B", compute_on="2:1")
+    out = Save(name="C", compute_on="1")
+    quadratic.add_input(data, emit_port=data.ports_out.alternate_data, recv_port=quadratic.ports_in.alternate_data)
+    out.add_input(quadratic, emit_port=quadratic.ports_out.alternate_data, recv_port=out.ports_in.alternate_data)
+
+    for _ in range(2):
+        g = Graph(start_node=data)
+        g.start_all()
+        g.join_all()
+        g.stop_all()
+        print(out.get_state())
+"""
+
+class TestWorkerPool():
+
+    def test_bridge_thread_pickle(self):
+        # imported here, as other tests may reload the bridge modules
+        from livenodes.components.bridges.bridge_thread import Bridge_thread
+        bridge = Bridge_thread()
+        bridge.queue.put((0, 'a'))
+
+        restored = pickle.loads(pickle.dumps(bridge))
+        # both ends live in the process the bridge was pickled into, thus it starts empty
+        assert restored.queue.empty()
+        assert not restored.closed()
+
+    def test_graph_reruns(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        res = subprocess.run([sys.executable, '-c', SCRIPT], cwd=root, capture_output=True, text=True, timeout=300)
+
+        expected = str(list(map(lambda x: x**2, range(10))))
+        assert res.stdout.strip().splitlines()[-2:] == [expected, expected], res.stderr[-2000:]